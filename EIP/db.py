@@ -0,0 +1,48 @@
+"""
+Database tuning helpers used by EIP.settings.
+
+Kept free of Django imports so the settings module can use them before
+the app registry exists.
+"""
+import os
+
+
+def sqlite_init_pragmas():
+    """PRAGMAs run on every new SQLite connection (WAL profile)"""
+    mmap_size = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    cache_kib = int(os.getenv('SQLITE_CACHE_SIZE_KIB', 64 * 1024))
+    busy_timeout_ms = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    return [
+        # Readers no longer block the writer and vice versa
+        'PRAGMA journal_mode=WAL',
+        # Durable across application crashes; fsync only at checkpoints
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA mmap_size={mmap_size}',
+        # Negative value means KiB rather than pages
+        f'PRAGMA cache_size=-{cache_kib}',
+        f'PRAGMA busy_timeout={busy_timeout_ms}',
+        'PRAGMA temp_store=MEMORY',
+    ]
+
+
+def sqlite_options():
+    """OPTIONS for a production SQLite database"""
+    return {
+        'init_command': '; '.join(sqlite_init_pragmas()),
+        # Take the write lock at BEGIN so atomic blocks wait on busy_timeout
+        # instead of failing with "database is locked" when they upgrade
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)) / 1000,
+    }
+
+
+def postgres_pool_options():
+    """OPTIONS['pool'] for Django's psycopg 3 connection pool"""
+    return {
+        'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', 10)),
+        # Seconds a request waits for a free connection before erroring
+        'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', 10)),
+        'max_idle': float(os.getenv('DATABASE_POOL_MAX_IDLE', 300)),
+        'max_lifetime': float(os.getenv('DATABASE_POOL_MAX_LIFETIME', 3600)),
+    }
@@ -1,275 +0,0 @@
-"""
-Django settings for EIP project.
-
-Generated by 'django-admin startproject' using Django 5.2.1.
-"""
-
-import warnings
-from pathlib import Path
-import os
-import dj_database_url
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-# ========== SECURITY SETTINGS ==========
-SECRET_KEY = os.getenv(
-    'SECRET_KEY',
-    'django-insecure-development-key-change-for-production'
-)
-
-# DEBUG from environment, default to True for safety during development
-DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
-
-# ALLOWED_HOSTS from environment
-allowed_hosts = os.getenv('ALLOWED_HOSTS', '')
-ALLOWED_HOSTS = [host.strip()
-                 for host in allowed_hosts.split(',') if host.strip()]
-
-# Always allow localhost in development
-if DEBUG:
-    ALLOWED_HOSTS.extend(['localhost', '127.0.0.1', '[::1]'])
-
-# Remove duplicates while preserving order
-ALLOWED_HOSTS = list(dict.fromkeys(ALLOWED_HOSTS))
-
-# ========== APPLICATION DEFINITION ==========
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-
-    # Third-party apps
-    'ckeditor',
-    'ckeditor_uploader',
-    'django_resized',
-    'compressor',
-    'django_cleanup',
-
-    # Local apps
-    'core',
-    'blog',
-    'publications',
-    'vacancies',
-    'contacts',
-]
-
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
-
-ROOT_URLCONF = 'EIP.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-                'core.context_processors.site_metadata',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'EIP.wsgi.application'
-
-# ========== DATABASE CONFIGURATION ==========
-DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3')
-DATABASES = {
-    'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
-}
-
-# ========== PASSWORD VALIDATION ==========
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-        'OPTIONS': {
-            'min_length': 8,
-        }
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
-
-# ========== INTERNATIONALIZATION ==========
-LANGUAGE_CODE = 'en-us'
-TIME_ZONE = 'UTC'
-USE_I18N = True
-USE_TZ = True
-
-# ========== STATIC & MEDIA FILES ==========
-STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_DIRS = [
-    os.path.join(BASE_DIR, 'static'),
-]
-
-# WhiteNoise configuration
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
-
-MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
-
-# ========== DEFAULT PRIMARY KEY ==========
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-
-# ========== CACHE CONFIGURATION ==========
-# ========== CACHE CONFIGURATION ==========
-# Redis cache for production, fallback to local memory for development
-if os.getenv('REDIS_URL'):
-    CACHES = {
-        'default': {
-            'BACKEND': 'django_redis.cache.RedisCache',
-            'LOCATION': os.getenv('REDIS_URL'),
-            'OPTIONS': {
-                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-                'CONNECTION_POOL_KWARGS': {
-                    'max_connections': 100,
-                    'retry_on_timeout': True,
-                },
-                'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor',
-                'IGNORE_EXCEPTIONS': True,  # Prevents cache failures from crashing app
-            },
-            'KEY_PREFIX': 'eip_',
-            'TIMEOUT': 300,  # 5 minutes default
-            'VERSION': 1,
-        }
-    }
-
-    # Use Redis for session storage in production
-    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
-    SESSION_CACHE_ALIAS = 'default'
-
-    print("✅ Redis cache configured")
-else:
-    CACHES = {
-        'default': {
-            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-            'LOCATION': 'unique-snowflake',
-            'TIMEOUT': 60,  # 1 minute for development
-        }
-    }
-    print("⚠️ Using local memory cache (Redis not configured)")
-
-# ========== SECURITY SETTINGS ==========
-# Only enable security settings in production
-if not DEBUG:
-    SECURE_BROWSER_XSS_FILTER = True
-    SECURE_CONTENT_TYPE_NOSNIFF = True
-    X_FRAME_OPTIONS = 'DENY'
-    CSRF_COOKIE_SECURE = True
-    SESSION_COOKIE_SECURE = True
-    SECURE_HSTS_SECONDS = 31536000
-    SECURE_HSTS_INCLUDE_SUBDOMAINS = True
-    SECURE_HSTS_PRELOAD = True
-    SECURE_SSL_REDIRECT = True
-
-    # CSRF trusted origins must include scheme
-    csrf_origins = os.getenv('CSRF_TRUSTED_ORIGINS', '')
-    CSRF_TRUSTED_ORIGINS = [
-        origin.strip() for origin in csrf_origins.split(',')
-        if origin.strip() and (origin.strip().startswith('http://') or origin.strip().startswith('https://'))
-    ]
-else:
-    # Development settings
-    CSRF_COOKIE_SECURE = False
-    SESSION_COOKIE_SECURE = False
-    CSRF_TRUSTED_ORIGINS = ['http://localhost:8000', 'http://127.0.0.1:8000']
-
-# ========== EMAIL CONFIGURATION ==========
-# Console for development
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
-EMAIL_HOST = os.getenv('EMAIL_HOST', '')
-EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
-EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
-EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
-EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
-DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@eipethiopia.org')
-ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@eipethiopia.org')
-
-# Only use SMTP if explicitly configured
-if EMAIL_HOST_USER and EMAIL_HOST_PASSWORD:
-    EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-
-# Site URL for email links
-SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
-
-# ========== CKEDITOR CONFIGURATION ==========
-# Suppress the CKEditor warning for now
-warnings.filterwarnings('ignore', message='django-ckeditor')
-
-CKEDITOR_UPLOAD_PATH = "uploads/"
-CKEDITOR_IMAGE_BACKEND = "pillow"
-# In settings.py, update CKEDITOR_CONFIGS
-CKEDITOR_CONFIGS = {
-    'default': {
-        'toolbar': 'Custom',
-        'toolbar_Custom': [
-            ['Bold', 'Italic', 'Underline', 'Strike'],
-            ['NumberedList', 'BulletedList'],
-            ['Link', 'Unlink', 'Image', 'Table'],
-            ['RemoveFormat', 'Source'],
-            ['Format', 'Font', 'FontSize'],
-            ['TextColor', 'BGColor'],
-        ],
-        'height': 400,
-        'width': '100%',
-        'extraPlugins': 'uploadimage',
-        'uploadUrl': '/ckeditor/upload/',
-    },
-}
-
-# ========== COMPRESSION SETTINGS ==========
-STATICFILES_FINDERS = [
-    'django.contrib.staticfiles.finders.FileSystemFinder',
-    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
-    'compressor.finders.CompressorFinder',
-]
-
-COMPRESS_ENABLED = False  # Disable during development for faster reloads
-COMPRESS_OFFLINE = False
-
-# ========== LOGGING ==========
-LOGGING = {
-    'version': 1,
-    'disable_existing_loggers': False,
-    'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
-        },
-    },
-    'root': {
-        'handlers': ['console'],
-        'level': 'INFO',
-    },
-}
-
-print(f"✅ DEBUG MODE: {DEBUG}")
-print(f"✅ ALLOWED_HOSTS: {ALLOWED_HOSTS}")
-print(f"✅ SITE_URL: {SITE_URL}")
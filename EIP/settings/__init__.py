@@ -0,0 +1,20 @@
+"""
+Django settings for EIP project, in layers that each read the environment:
+
+    base.py          paths, apps, middleware, templates, files, feature defaults
+    services.py      database, cache and email
+    security.py      production hardening when DEBUG is off
+    integrations.py  CKEditor and the optional django-compressor
+
+Later layers may import from earlier ones, never the other way round.
+"""
+
+from dotenv import load_dotenv
+
+# Values already in the environment win over .env
+load_dotenv()
+
+from .base import *  # noqa: E402,F401,F403
+from .services import *  # noqa: E402,F401,F403
+from .security import *  # noqa: E402,F401,F403
+from .integrations import *  # noqa: E402,F401,F403
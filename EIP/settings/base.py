@@ -0,0 +1,246 @@
+"""
+Base layer: paths, core security, apps, middleware, templates, static and
+media files and the defaults of the project's own features.
+
+Nothing here imports third-party code; services.py, security.py and
+integrations.py build on these values.
+"""
+
+import os
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# ========== SECURITY SETTINGS ==========
+SECRET_KEY = os.getenv(
+    'SECRET_KEY',
+    'django-insecure-development-key-change-for-production'
+)
+
+# DEBUG from environment, default to True for safety during development
+DEBUG = os.getenv('DEBUG', 'True').lower() == 'true'
+
+# ALLOWED_HOSTS from environment
+allowed_hosts = os.getenv('ALLOWED_HOSTS', '')
+ALLOWED_HOSTS = [host.strip()
+                 for host in allowed_hosts.split(',') if host.strip()]
+
+# Always allow localhost in development
+if DEBUG:
+    ALLOWED_HOSTS.extend(['localhost', '127.0.0.1', '[::1]'])
+
+# Remove duplicates while preserving order
+ALLOWED_HOSTS = list(dict.fromkeys(ALLOWED_HOSTS))
+
+# ========== APPLICATION DEFINITION ==========
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+
+    # Third-party apps
+    'ckeditor',
+    'ckeditor_uploader',
+    'django_resized',
+    'django_cleanup',
+
+    # Local apps
+    'core',
+    'blog',
+    'publications',
+    'vacancies',
+    'contacts',
+    'taskqueue',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.HtmlMinifyMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'EIP.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [os.path.join(BASE_DIR, 'templates')],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.site_metadata',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'EIP.wsgi.application'
+ASGI_APPLICATION = 'EIP.asgi.application'
+# Async variants of the home, blog and publication list/detail views; EIP/asgi.py turns this on
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+# ========== HTML RESPONSES ==========
+# Comment and whitespace stripping of HTML pages (core.utils.htmlmin)
+HTML_MINIFY = os.getenv('HTML_MINIFY', str(not DEBUG)) == 'True'
+HTML_MINIFY_CACHE_SIZE = int(os.getenv('HTML_MINIFY_CACHE_SIZE', 256))  # minified pages kept per process
+# Stream the blog and publication lists, <head> first (core.utils.streaming)
+HTML_STREAMING = os.getenv('HTML_STREAMING', 'False') == 'True'
+HTML_STREAM_CHUNK_SIZE = int(os.getenv('HTML_STREAM_CHUNK_SIZE', 16 * 1024))  # characters
+
+# ========== PASSWORD VALIDATION ==========
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+        'OPTIONS': {
+            'min_length': 8,
+        }
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+# ========== INTERNATIONALIZATION ==========
+LANGUAGE_CODE = 'en-us'
+TIME_ZONE = 'UTC'
+USE_I18N = True
+USE_TZ = True
+
+# ========== STATIC & MEDIA FILES ==========
+STATIC_URL = '/static/'
+STATIC_ROOT = os.getenv('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+STATICFILES_DIRS = [
+    os.path.join(BASE_DIR, 'static'),
+]
+
+# Production assets: `collectstatic` writes content-hashed names plus .gz/.br
+# copies, and WhiteNoise serves them with far-future immutable headers.
+# Development and tests serve the sources without a build step.
+STATIC_BUILD = os.getenv('STATIC_BUILD', str(not DEBUG)) == 'True'
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': ('whitenoise.storage.CompressedManifestStaticFilesStorage' if STATIC_BUILD
+                    else 'django.contrib.staticfiles.storage.StaticFilesStorage'),
+    },
+}
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Streamed uploads are staged here, on MEDIA_ROOT's filesystem, so saving
+# them is a rename rather than a copy
+UPLOAD_STAGING_DIR = os.getenv('UPLOAD_STAGING_DIR', os.path.join(MEDIA_ROOT, '.incoming'))
+# Vacancy application limits, enforced while the upload streams in
+APPLICATION_RESUME_MAX_SIZE = int(os.getenv('APPLICATION_RESUME_MAX_SIZE', 5 * 1024 * 1024))
+APPLICATION_DOCUMENT_MAX_SIZE = int(os.getenv('APPLICATION_DOCUMENT_MAX_SIZE', 10 * 1024 * 1024))
+
+# How protected downloads are delivered: 'python' streams from Django with
+# Range support, 'x-accel' hands off to nginx, 'x-sendfile' to Apache/lighttpd
+FILE_DOWNLOAD_MODE = os.getenv('FILE_DOWNLOAD_MODE', 'python')
+# nginx `internal` location aliased to MEDIA_ROOT, used with 'x-accel'
+X_ACCEL_REDIRECT_PREFIX = os.getenv('X_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+
+# Publication PDF ingestion (text, cover, thumbnail): 'background', 'sync' or 'off'
+PUBLICATION_INGEST_MODE = os.getenv('PUBLICATION_INGEST_MODE', 'background')
+PUBLICATION_INGEST_WORKERS = int(os.getenv('PUBLICATION_INGEST_WORKERS', 2))
+
+# Content-addressed images (core.storage): blobs live below CKEDITOR_UPLOAD_PATH
+# so the editor's image browser lists them
+MEDIA_BLOB_DIR = os.getenv('MEDIA_BLOB_DIR', 'uploads/blobs')
+# Unreferenced blobs are kept this long before gc_media_blobs removes them
+MEDIA_BLOB_GC_GRACE_HOURS = int(os.getenv('MEDIA_BLOB_GC_GRACE_HOURS', 24))
+
+# Responsive image derivatives: named widths per "app.model.field"
+IMAGE_DERIVATIVES = {
+    'blog.post.featured_image': {'thumb': 160, 'card': 480, 'full': 960, 'wide': 1600},
+    'core.sliderimage.image': {'mobile': 768, 'tablet': 1280, 'hero': 1920},
+    'core.partner.logo': {'logo': 160, 'retina': 320},
+    'core.boardmember.photo': {'card': 400},
+    'publications.publication.cover_image': {'card': 480, 'full': 960},
+}
+# Modern formats generated next to the JPEG/PNG fallback
+IMAGE_DERIVATIVE_FORMATS = [fmt.strip() for fmt in os.getenv(
+    'IMAGE_DERIVATIVE_FORMATS', 'avif,webp').split(',') if fmt.strip()]
+# 'background' (thread pool after commit), 'sync' or 'off'
+IMAGE_DERIVATIVES_MODE = os.getenv('IMAGE_DERIVATIVES_MODE', 'background')
+IMAGE_DERIVATIVE_WORKERS = int(os.getenv('IMAGE_DERIVATIVE_WORKERS', 2))
+
+# On-demand resizing (/img/<w>x<h>/<path>): allowed sizes, 0 height keeps the aspect ratio
+IMAGE_RESIZE_SIZES = ['320x0', '640x0', '960x0', '1280x0', '160x160', '400x300']
+# Rendered variants are cached below MEDIA_ROOT in this directory
+IMAGE_RESIZE_CACHE_DIR = 'resized'
+
+# ========== DEFAULT PRIMARY KEY ==========
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# ========== BACKGROUND TASKS ==========
+# @task functions are queued as taskqueue.Task rows and run by `manage.py run_worker`
+TASK_WORKER_THREADS = int(os.getenv('TASK_WORKER_THREADS', 4))
+TASK_MAX_ATTEMPTS = int(os.getenv('TASK_MAX_ATTEMPTS', 5))  # then the task is marked dead
+TASK_RETRY_DELAY = int(os.getenv('TASK_RETRY_DELAY', 30))  # seconds, doubled per attempt
+TASK_LEASE = int(os.getenv('TASK_LEASE', 600))  # seconds before a running task counts as abandoned
+TASK_RETENTION_HOURS = int(os.getenv('TASK_RETENTION_HOURS', 72))  # finished tasks kept this long
+
+# ========== COUNTERS ==========
+# View/download counters are buffered per process and written in batches
+COUNTER_FLUSH_INTERVAL = int(os.getenv('COUNTER_FLUSH_INTERVAL', 10))  # seconds
+COUNTER_FLUSH_THRESHOLD = int(os.getenv('COUNTER_FLUSH_THRESHOLD', 100))  # increments
+
+# ========== METRICS ==========
+# Bearer token that lets scrapers read /metrics/ without a staff session
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# ========== RATE LIMITING ==========
+# Per-IP limits on public POST endpoints (core.utils.ratelimit), counted in the default cache
+RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'True') == 'True'
+RATELIMITS = {
+    'contact': os.getenv('RATELIMIT_CONTACT', '5/10m'),
+    'newsletter': os.getenv('RATELIMIT_NEWSLETTER', '5/m'),
+    'application': os.getenv('RATELIMIT_APPLICATION', '10/h'),
+}
+# Proxies in front of Django that append to X-Forwarded-For (nginx: 1). With 0
+# the header is ignored, since without a proxy clients could forge it
+RATELIMIT_PROXY_COUNT = int(os.getenv('RATELIMIT_PROXY_COUNT', 0))
+
+# ========== DEDUPE ==========
+# Duplicate submissions (core.utils.dedupe): seconds a content fingerprint and an idempotency key are remembered
+DEDUPE_TTL = int(os.getenv('DEDUPE_TTL', 600))
+DEDUPE_KEY_TTL = int(os.getenv('DEDUPE_KEY_TTL', 86400))
+
+# ========== LOGGING ==========
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.getenv('LOG_LEVEL', 'INFO'),
+    },
+}
@@ -0,0 +1,55 @@
+"""
+Integrations layer: settings of optional third-party apps.
+"""
+
+import os
+import warnings
+
+from .base import DEBUG, INSTALLED_APPS, STATIC_BUILD
+
+# ========== CKEDITOR CONFIGURATION ==========
+# Suppress the CKEditor warning for now
+warnings.filterwarnings('ignore', message='django-ckeditor')
+
+CKEDITOR_UPLOAD_PATH = "uploads/"
+# Deduplicate editor uploads (see core.storage)
+CKEDITOR_STORAGE_BACKEND = 'core.storage.ContentAddressedStorage'
+CKEDITOR_IMAGE_BACKEND = "pillow"
+# In settings.py, update CKEDITOR_CONFIGS
+CKEDITOR_CONFIGS = {
+    'default': {
+        'toolbar': 'Custom',
+        'toolbar_Custom': [
+            ['Bold', 'Italic', 'Underline', 'Strike'],
+            ['NumberedList', 'BulletedList'],
+            ['Link', 'Unlink', 'Image', 'Table'],
+            ['RemoveFormat', 'Source'],
+            ['Format', 'Font', 'FontSize'],
+            ['TextColor', 'BGColor'],
+        ],
+        'height': 400,
+        'width': '100%',
+        'extraPlugins': 'uploadimage',
+        'uploadUrl': '/ckeditor/upload/',
+    },
+}
+
+# ========== COMPRESSION SETTINGS ==========
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+]
+
+# django-compressor is only installed when enabled, so other processes skip loading it.
+# {% compress %} (core.templatetags.assets) leaves the tags alone when it is off.
+COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'False') == 'True'
+# With a static build the bundles come from `manage.py compress`, run after
+# collectstatic; requests only look them up in CACHE/manifest.json. DEBUG
+# renders unhashed {% static %} URLs, which would not match the manifest.
+COMPRESS_OFFLINE = COMPRESS_ENABLED and STATIC_BUILD and not DEBUG
+COMPRESS_OUTPUT_DIR = 'CACHE'
+# Bundles get .gz/.br copies like the files collectstatic writes
+COMPRESS_STORAGE = 'core.utils.assets.PrecompressedStorage'
+if COMPRESS_ENABLED:
+    INSTALLED_APPS = [*INSTALLED_APPS, 'compressor']
+    STATICFILES_FINDERS.append('compressor.finders.CompressorFinder')
@@ -0,0 +1,112 @@
+"""
+Services layer: database, cache and email, configured from the environment.
+"""
+
+import os
+
+import dj_database_url
+
+from EIP.db import postgres_pool_options, sqlite_options
+
+# ========== DATABASE CONFIGURATION ==========
+DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3')
+DATABASES = {
+    'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600)
+}
+
+# Optional read replica: public GET pages read from it, writes stay on default
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', '')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL, conn_max_age=600)
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+# Seconds a client keeps reading from the primary after it wrote something
+DATABASE_REPLICA_PIN_SECONDS = int(
+    os.getenv('DATABASE_REPLICA_PIN_SECONDS', 5))
+
+# WAL, mmap, busy timeout and BEGIN IMMEDIATE for SQLite deployments
+SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'True').lower() == 'true'
+
+# psycopg 3 connection pool for PostgreSQL (replaces persistent connections)
+DATABASE_POOL = os.getenv('DATABASE_POOL', 'False').lower() == 'true'
+
+for db in DATABASES.values():
+    if SQLITE_TUNING and db['ENGINE'] == 'django.db.backends.sqlite3':
+        db.setdefault('OPTIONS', {}).update(sqlite_options())
+    elif db['ENGINE'] == 'django.db.backends.postgresql':
+        # Validate connections before use so a server restart is not a burst of 500s
+        db['CONN_HEALTH_CHECKS'] = True
+        if DATABASE_POOL:
+            db['CONN_MAX_AGE'] = 0
+            db.setdefault('OPTIONS', {})['pool'] = postgres_pool_options()
+
+# ========== CACHE CONFIGURATION ==========
+# Redis cache for production, fallback to local memory for development
+# (`check --deploy` warns about the fallback, core.W001)
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'CONNECTION_POOL_KWARGS': {
+                    'max_connections': 100,
+                    'retry_on_timeout': True,
+                },
+                'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor',
+                'IGNORE_EXCEPTIONS': True,  # Prevents cache failures from crashing app
+            },
+            'KEY_PREFIX': 'eip_',
+            'TIMEOUT': 300,  # 5 minutes default
+            'VERSION': 1,
+        }
+    }
+
+    # Use Redis for session storage in production
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+    SESSION_CACHE_ALIAS = 'default'
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'TIMEOUT': 60,  # 1 minute for development
+        }
+    }
+
+# ========== EMAIL CONFIGURATION ==========
+# Console for development
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+EMAIL_HOST = os.getenv('EMAIL_HOST', '')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
+EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@eipethiopia.org')
+ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@eipethiopia.org')
+
+# Only use SMTP if explicitly configured
+if EMAIL_HOST_USER and EMAIL_HOST_PASSWORD:
+    EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+# Site URL for email links
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:8000')
+
+# 'immediate': one email per contact message/application, 'digest': one summary
+# per ADMIN_DIGEST_INTERVAL minutes (needs `manage.py run_worker`)
+ADMIN_NOTIFICATION_MODE = os.getenv('ADMIN_NOTIFICATION_MODE', 'immediate')
+ADMIN_DIGEST_INTERVAL = int(os.getenv('ADMIN_DIGEST_INTERVAL', 60))
+
+# Outbox: views queue OutboundEmail rows, `manage.py send_queued_email` sends them
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 6))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', 60))  # seconds, doubled per attempt
+EMAIL_OUTBOX_LEASE = int(os.getenv('EMAIL_OUTBOX_LEASE', 300))  # seconds a claimed batch is held
+
+# Newsletter campaigns (`manage.py send_newsletter <id>`)
+NEWSLETTER_BATCH_SIZE = int(os.getenv('NEWSLETTER_BATCH_SIZE', 500))  # subscribers per checkpoint
+NEWSLETTER_CONNECTIONS = int(os.getenv('NEWSLETTER_CONNECTIONS', 3))  # concurrent SMTP connections
+NEWSLETTER_RATE = float(os.getenv('NEWSLETTER_RATE', 10))  # messages per second, 0 = unlimited
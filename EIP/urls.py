@@ -1,9 +1,22 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.contrib.admin.views.decorators import staff_member_required
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import RedirectView
 
+from core.utils.lazy import LazyView
+
+# ckeditor_uploader.urls, with the views (and Pillow backends) imported on first use
+ckeditor_urls = [
+    re_path(r'^upload/', csrf_exempt(staff_member_required(LazyView('ckeditor_uploader.views.upload'))),
+            name='ckeditor_upload'),
+    re_path(r'^browse/', never_cache(staff_member_required(LazyView('ckeditor_uploader.views.browse'))),
+            name='ckeditor_browse'),
+]
+
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
@@ -27,7 +40,7 @@ urlpatterns = [
     path('contact-us/', RedirectView.as_view(url='/contact/', permanent=True)),
 
     # CKEditor URL (for file uploads in admin)
-    path('ckeditor/', include('ckeditor_uploader.urls')),
+    path('ckeditor/', include(ckeditor_urls)),
 ]
 
 # Serve static and media files in development
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:38
+
+import blog.models
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_dailypostview_postimage_postview_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='featured_image',
+            field=models.ImageField(blank=True, help_text='Optional. Main image shown in listings and at top of post', null=True, storage=core.storage.get_blob_storage, upload_to='posts/featured/'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='og_image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.get_blob_storage, upload_to='posts/og/'),
+        ),
+        migrations.AlterField(
+            model_name='postimage',
+            name='image',
+            field=models.ImageField(storage=core.storage.get_blob_storage, upload_to=blog.models.post_image_path),
+        ),
+    ]
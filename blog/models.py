@@ -5,6 +5,9 @@ from django.utils.html import strip_tags
 from django.utils.text import slugify
 from ckeditor.fields import RichTextField
 from django_resized import ResizedImageField
+from core.storage import get_blob_storage
+from core.utils.images import DerivativeImagesMixin, ImageMetadataMixin
+from core.utils.slugs import assign_unique_slugs, save_with_unique_slug
 import os
 import uuid
 
@@ -65,11 +68,16 @@ def post_image_path(instance, filename):
     )
 
 
-class PostImage(models.Model):
+class PostImage(ImageMetadataMixin, models.Model):
     """Model for images within post content"""
     post = models.ForeignKey(
         'Post', on_delete=models.CASCADE, related_name='content_images')
-    image = models.ImageField(upload_to=post_image_path)
+    image = models.ImageField(upload_to=post_image_path, storage=get_blob_storage)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_size = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     caption = models.CharField(max_length=200, blank=True, null=True)
     alt_text = models.CharField(max_length=200, blank=True, null=True)
     order = models.PositiveIntegerField(default=0)
@@ -82,7 +90,7 @@ class PostImage(models.Model):
         return f"Image for {self.post.title}"
 
 
-class Post(models.Model):
+class Post(ImageMetadataMixin, DerivativeImagesMixin, models.Model):
     POST_TYPES = [
         ('news', '📰 News'),
         ('blog', '📝 Blog'),
@@ -113,10 +121,16 @@ class Post(models.Model):
     # Images
     featured_image = models.ImageField(
         upload_to='posts/featured/',
+        storage=get_blob_storage,
         blank=True,
         null=True,
         help_text="Optional. Main image shown in listings and at top of post"
     )
+    featured_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_size = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_color = models.CharField(max_length=7, blank=True, editable=False)
+    featured_image_placeholder = models.TextField(blank=True, editable=False)
     featured_image_alt = models.CharField(
         max_length=200, blank=True, null=True)
 
@@ -146,7 +160,13 @@ class Post(models.Model):
     # SEO & Social
     og_title = models.CharField(max_length=200, blank=True, null=True)
     og_description = models.CharField(max_length=300, blank=True, null=True)
-    og_image = models.ImageField(upload_to='posts/og/', blank=True, null=True)
+    og_image = models.ImageField(upload_to='posts/og/', storage=get_blob_storage,
+                                 blank=True, null=True)
+    og_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    og_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    og_image_size = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    og_image_color = models.CharField(max_length=7, blank=True, editable=False)
+    og_image_placeholder = models.TextField(blank=True, editable=False)
 
     class Meta:
         ordering = ['-published_date', '-created_date']
@@ -164,17 +184,6 @@ class Post(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
-        # Auto-generate slug if empty
-        if not self.slug:
-            self.slug = slugify(self.title)[:250]
-
-            # Ensure uniqueness
-            original_slug = self.slug
-            counter = 1
-            while Post.objects.filter(slug=self.slug).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-
         # Handle published date logic
         if self.status == 'published' and not self.published_date:
             # If publishing for first time, set published_date to now
@@ -183,8 +192,26 @@ class Post(models.Model):
             # Keep published_date as is for drafts/scheduled posts
             pass
 
+        # Auto-generate a unique slug if empty (one query, retried on races)
+        if not self.slug:
+            return save_with_unique_slug(
+                self, self.title, lambda: super(Post, self).save(*args, **kwargs))
+
         super().save(*args, **kwargs)
 
+    @classmethod
+    def prepare_for_bulk_create(cls, posts):
+        """
+        Apply the save() side effects (unique slug, published date) to
+        unsaved posts so they can go through bulk_create()
+        """
+        posts = list(posts)
+        now = timezone.now()
+        for post in posts:
+            if post.status == 'published' and not post.published_date:
+                post.published_date = now
+        return assign_unique_slugs(posts, source_attr='title')
+
     @property
     def is_published(self):
         """Check if post is published AND published date is not in future"""
@@ -1,3 +1,78 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.utils import slugs
+from core.utils.slugs import unique_slug
+from .models import Post
+
+
+class PostSlugTests(TestCase):
+    def make_post(self, title, **kwargs):
+        return Post.objects.create(title=title, excerpt='Excerpt',
+                                   content='<p>Body</p>', **kwargs)
+
+    def test_slug_generated_from_title(self):
+        post = self.make_post('Annual Report 2024')
+        self.assertEqual(post.slug, 'annual-report-2024')
+
+    def test_collisions_get_next_free_suffix(self):
+        slugs = [self.make_post('Town Hall').slug for _ in range(3)]
+        self.assertEqual(slugs, ['town-hall', 'town-hall-1', 'town-hall-2'])
+
+    def test_gap_in_suffixes_is_reused(self):
+        self.make_post('Town Hall')
+        self.make_post('Town Hall', slug='town-hall-2')
+        self.assertEqual(self.make_post('Town Hall').slug, 'town-hall-1')
+
+    def test_similar_prefix_does_not_count_as_collision(self):
+        self.make_post('Town Hall Meeting')
+        self.assertEqual(self.make_post('Town Hall').slug, 'town-hall')
+
+    def test_long_titles_count_suffixes_with_a_trimmed_base(self):
+        title = 'Consultation ' * 19 + 'Paper'  # 252 characters
+        posts = [self.make_post(title) for _ in range(3)]
+        self.assertEqual(len({p.slug for p in posts}), 3)
+        self.assertTrue(all(len(p.slug) <= 250 for p in posts))
+        self.assertEqual([p.slug[-2:] for p in posts[1:]], ['-1', '-2'])
+
+        batch = Post.prepare_for_bulk_create(
+            [Post(title=title, excerpt='e', content='c') for _ in range(2)])
+        self.assertEqual([p.slug[-2:] for p in batch], ['-3', '-4'])
+
+    def test_allocation_uses_a_single_query(self):
+        for _ in range(5):
+            self.make_post('Workshop')
+        with CaptureQueriesContext(connection) as ctx:
+            slug = unique_slug(Post, 'Workshop')
+        self.assertEqual(slug, 'workshop-5')
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_prepare_for_bulk_create_assigns_unique_slugs(self):
+        self.make_post('Field Visit')
+        posts = [Post(title='Field Visit', excerpt='e', content='c',
+                      status='published') for _ in range(3)]
+        posts.append(Post(title='Other', slug='field-visit-2',
+                          excerpt='e', content='c'))
+
+        Post.prepare_for_bulk_create(posts)
+        Post.objects.bulk_create(posts)
+
+        self.assertEqual(
+            sorted(p.slug for p in posts),
+            ['field-visit-1', 'field-visit-2', 'field-visit-3', 'field-visit-4'])
+        self.assertTrue(all(p.published_date for p in posts[:3]))
+
+    def test_save_retries_when_slug_is_taken_concurrently(self):
+        self.make_post('Race')
+        real = slugs.unique_slug
+        stale = iter(['race'])  # what a concurrent writer would also have seen
+
+        def flaky(*args, **kwargs):
+            return next(stale, None) or real(*args, **kwargs)
 
-# Create your tests here.
+        with mock.patch.object(slugs, 'unique_slug', side_effect=flaky):
+            post = self.make_post('Race')
+        self.assertEqual(post.slug, 'race-1')
@@ -1,12 +1,13 @@
 from django.urls import path
+from core.utils.asyncviews import pick
 from . import views
 
 urlpatterns = [
-    path('', views.PostListView.as_view(), name='blog_list'),
-    path('news/', views.PostListView.as_view(), name='news_list'),
+    path('', pick(views.PostListView, views.AsyncPostListView), name='blog_list'),
+    path('news/', pick(views.PostListView, views.AsyncPostListView), name='news_list'),
     path('categories/', views.CategoryListView.as_view(), name='blog_categories'),
     path('tag/<slug:slug>/', views.PostListView.as_view(), name='posts_by_tag'),
     path('category/<slug:slug>/', views.PostListView.as_view(),
          name='posts_by_category'),
-    path('<slug:slug>/', views.PostDetailView.as_view(), name='blog_detail'),
+    path('<slug:slug>/', pick(views.PostDetailView, views.AsyncPostDetailView), name='blog_detail'),
 ]
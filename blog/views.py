@@ -1,14 +1,18 @@
 from django.views.generic import ListView, DetailView
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, F, Count  # ← IMPORT Count HERE
 from django.utils import timezone
+from core.routers import unpinned_writes
+from core.utils.asyncviews import AsyncMultipleObjectMixin, aevaluate, alist
+from core.utils.streaming import StreamingTemplateResponseMixin
 from .models import Post, Category, Tag, PostView
 from django.utils.html import strip_tags
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 
 
-class PostListView(ListView):
+class PostListView(StreamingTemplateResponseMixin, ListView):
     model = Post
     template_name = 'blog/list.html'
     context_object_name = 'posts'
@@ -41,6 +45,11 @@ class PostListView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context.update(self.get_sidebar_context(context['posts']))
+        return context
+
+    def get_sidebar_context(self, posts):
+        context = {}
         post_type = self.request.GET.get('type', '')
         context['post_type'] = post_type
         context['search_query'] = self.request.GET.get('q', '')
@@ -57,7 +66,7 @@ class PostListView(ListView):
         context['categories'] = categories
 
         # Recent posts for sidebar (exclude current posts)
-        current_post_ids = [post.id for post in context['posts']]
+        current_post_ids = [post.id for post in posts]
         context['recent_posts'] = Post.objects.filter(
             status='published'
         ).exclude(
@@ -72,6 +81,13 @@ class PostListView(ListView):
         return context
 
 
+class AsyncPostListView(AsyncMultipleObjectMixin, PostListView):
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context.update(await aevaluate(self.get_sidebar_context(context['posts'])))
+        return context
+
+
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/detail.html'
@@ -90,28 +106,35 @@ class PostDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Increment views
+        # Increment views, without pinning the reader to the primary
         if self.object.status == 'published':
-            self.object.increment_views()
-
-            # Track view with IP
-            PostView.objects.create(
-                post=self.object,
-                ip_address=self.get_client_ip(),
-                user_agent=self.request.META.get('HTTP_USER_AGENT', ''),
-                referer=self.request.META.get('HTTP_REFERER', '')
-            )
+            with unpinned_writes():
+                self.object.increment_views()
+
+                # Track view with IP
+                self.build_post_view().save()
+
+        context['related_posts'] = self.get_related_posts()
+
+        return context
+
+    def build_post_view(self):
+        return PostView(
+            post=self.object,
+            ip_address=self.get_client_ip(),
+            user_agent=self.request.META.get('HTTP_USER_AGENT', ''),
+            referer=self.request.META.get('HTTP_REFERER', '')
+        )
 
+    def get_related_posts(self):
         # Related posts (same category, published status)
-        context['related_posts'] = Post.objects.filter(
+        return Post.objects.filter(
             status='published',
             categories__in=self.object.categories.all()
         ).exclude(
             id=self.object.id
         ).distinct().order_by('-published_date')[:3]
 
-        return context
-
     def get_client_ip(self):
         x_forwarded_for = self.request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
@@ -122,6 +145,31 @@ class PostDetailView(DetailView):
         return context
 
 
+class AsyncPostDetailView(PostDetailView):
+    async def get(self, request, *args, **kwargs):
+        # get_queryset() checks is_staff; load the user without blocking first
+        request.user = await request.auser()
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        try:
+            self.object = await self.get_queryset().aget(**{self.get_slug_field(): slug})
+        except Post.DoesNotExist:
+            raise Http404('No post found matching the query')
+
+        if self.object.status == 'published':
+            with unpinned_writes():
+                await Post.objects.filter(pk=self.object.pk).aupdate(views=F('views') + 1)
+                await self.object.arefresh_from_db(fields=['views'])
+                await self.build_post_view().asave()
+
+        context = {
+            'view': self,
+            'object': self.object,
+            self.context_object_name: self.object,
+            'related_posts': await alist(self.get_related_posts()),
+        }
+        return self.render_to_response(context)
+
+
 class PostsByCategoryView(ListView):
     model = Post
     template_name = 'blog/list.html'
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import ContactMessage, Subscriber
+from .models import Campaign, ContactMessage, Subscriber
 from django.utils.text import Truncator
 
 
@@ -50,3 +50,24 @@ class SubscriberAdmin(admin.ModelAdmin):
             'fields': ('subscribed_date', 'token')
         }),
     )
+
+
+@admin.register(Campaign)
+class CampaignAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'sent_count', 'failed_count',
+                    'started_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('status', 'created_date', 'started_at', 'finished_at',
+                       'last_subscriber_id', 'sent_count', 'failed_count')
+
+    fieldsets = (
+        ('Campaign', {
+            'fields': ('subject', 'content'),
+            'description': 'Send with: python manage.py send_newsletter &lt;id&gt;',
+        }),
+        ('Delivery', {
+            'fields': ('status', 'created_date', 'started_at', 'finished_at',
+                       'last_subscriber_id', 'sent_count', 'failed_count')
+        }),
+    )
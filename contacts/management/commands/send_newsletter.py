@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from contacts import newsletter
+from contacts.models import Campaign
+
+
+class Command(BaseCommand):
+    help = 'Send a newsletter campaign to all active subscribers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('campaign', type=int, help='Campaign id')
+        parser.add_argument('--resume', action='store_true',
+                            help='Continue a campaign whose previous run stopped while sending')
+        parser.add_argument('--batch-size', type=int,
+                            help='Subscribers per checkpoint (default: NEWSLETTER_BATCH_SIZE)')
+        parser.add_argument('--connections', type=int,
+                            help='Concurrent SMTP connections (default: NEWSLETTER_CONNECTIONS)')
+        parser.add_argument('--rate', type=float,
+                            help='Messages per second, 0 for no limit (default: NEWSLETTER_RATE)')
+
+    def handle(self, *args, **options):
+        campaign = Campaign.objects.filter(pk=options['campaign']).first()
+        if campaign is None:
+            raise CommandError(f"Campaign {options['campaign']} does not exist")
+
+        # Conditional update: two runs cannot both start the same draft
+        started = Campaign.objects.filter(pk=campaign.pk, status='draft').update(
+            status='sending', started_at=timezone.now())
+        if not started:
+            if campaign.status == 'sent':
+                raise CommandError(f'"{campaign}" has already been sent')
+            if not options['resume']:
+                raise CommandError(
+                    f'"{campaign}" is already sending; pass --resume if that run has stopped')
+            self.stdout.write(f'Resuming after subscriber {campaign.last_subscriber_id}')
+        campaign.refresh_from_db()
+
+        campaign = newsletter.send(campaign, batch_size=options['batch_size'],
+                                   connections=options['connections'], rate=options['rate'])
+        self.stdout.write(self.style.SUCCESS(
+            f'"{campaign}": {campaign.sent_count} sent, {campaign.failed_count} failed'))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:51
+
+import ckeditor.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Campaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=200)),
+                ('content', ckeditor.fields.RichTextField()),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('sending', 'Sending'), ('sent', 'Sent')], default='draft', max_length=10)),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_subscriber_id', models.PositiveIntegerField(default=0, editable=False)),
+                ('sent_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('failed_count', models.PositiveIntegerField(default=0, editable=False)),
+            ],
+            options={
+                'ordering': ['-created_date'],
+            },
+        ),
+    ]
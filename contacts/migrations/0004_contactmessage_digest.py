@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_fingerprint'),
+        ('core', '0006_remove_admindigest_watermarks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactmessage',
+            name='digest',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contact_messages', to='core.admindigest'),
+        ),
+    ]
@@ -1,4 +1,8 @@
 from django.db import models
+from django.utils import timezone
+from ckeditor.fields import RichTextField
+
+from core.utils.dedupe import fingerprint
 
 
 class ContactMessage(models.Model):
@@ -17,9 +21,27 @@ class ContactMessage(models.Model):
         max_length=10, choices=STATUS_CHOICES, default='new')
     created_date = models.DateTimeField(auto_now_add=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
+    # Same sender, subject and message on the same day
+    fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+    # The admin digest that reported this message (ADMIN_NOTIFICATION_MODE = 'digest')
+    digest = models.ForeignKey('core.AdminDigest', null=True, blank=True, editable=False,
+                               on_delete=models.SET_NULL, related_name='contact_messages')
 
     class Meta:
         ordering = ['-created_date']
+        constraints = [
+            models.UniqueConstraint(fields=['fingerprint'], condition=~models.Q(fingerprint=''),
+                                    name='contactmessage_unique_fingerprint'),
+        ]
+
+    def compute_fingerprint(self):
+        day = (self.created_date or timezone.now()).date().isoformat()
+        return fingerprint(self.email, self.subject, self.message, day)
+
+    def save(self, *args, **kwargs):
+        if not self.fingerprint:
+            self.fingerprint = self.compute_fingerprint()
+        super().save(*args, **kwargs)
 
 
 class Subscriber(models.Model):
@@ -30,3 +52,29 @@ class Subscriber(models.Model):
 
     def __str__(self):
         return self.email
+
+
+class Campaign(models.Model):
+    """Newsletter sent to every active Subscriber by send_newsletter"""
+    STATUS_CHOICES = [
+        ('draft', 'Draft'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+    ]
+
+    subject = models.CharField(max_length=200)
+    content = RichTextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft')
+    created_date = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Checkpoint: subscribers up to this pk have been handled
+    last_subscriber_id = models.PositiveIntegerField(default=0, editable=False)
+    sent_count = models.PositiveIntegerField(default=0, editable=False)
+    failed_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        ordering = ['-created_date']
+
+    def __str__(self):
+        return self.subject
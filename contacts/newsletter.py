@@ -0,0 +1,165 @@
+"""
+Newsletter delivery.
+
+A campaign is rendered once; each recipient only gets their own
+unsubscribe link substituted into the rendered text. Active subscribers
+are streamed in pk order with ``.iterator()``, NEWSLETTER_BATCH_SIZE at a
+time, and every batch is shared between NEWSLETTER_CONNECTIONS threads
+that each keep one SMTP connection open for the whole run, under a
+global NEWSLETTER_RATE messages/second limit.
+
+After each batch the campaign records the last subscriber pk it handled,
+so a crashed run resumes from there and resends at most one batch.
+"""
+import html
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape, strip_tags
+
+from core.utils.email import render_email
+from core.utils.outbox import close_quietly, is_permanent
+from .models import Campaign, Subscriber
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the per-recipient link in the rendered campaign
+UNSUBSCRIBE_MARKER = '__UNSUBSCRIBE_URL__'
+
+
+class RateLimiter:
+    """Spaces acquire() calls from all threads `1 / rate` seconds apart"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class Sender:
+    """Sends from pool threads, one persistent connection per thread"""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = get_connection(fail_silently=False)
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def send(self, message):
+        """Send one message, reconnecting once after an error; returns success"""
+        self.limiter.acquire()
+        connection = self._connection()
+        for attempt in (1, 2):
+            try:
+                connection.open()
+                connection.send_messages([message])
+                return True
+            except Exception as exc:
+                close_quietly(connection)
+                if attempt == 2 or is_permanent(exc):
+                    logger.warning('Newsletter to %s failed: %s', message.to[0], exc)
+                    return False
+
+    def close(self):
+        for connection in self._connections:
+            close_quietly(connection)
+
+
+def unsubscribe_url(token):
+    return settings.SITE_URL + reverse('newsletter_unsubscribe', args=[token])
+
+
+def render(campaign):
+    """(subject, text, html) with UNSUBSCRIBE_MARKER in place of the link"""
+    html_content, text_content = render_email('newsletter', {
+        'campaign': campaign,
+        # The editor's HTML is the only source for the text part
+        'content_text': html.unescape(strip_tags(campaign.content)).strip(),
+        'unsubscribe_url': UNSUBSCRIBE_MARKER,
+        'site_url': settings.SITE_URL,
+    })
+    return campaign.subject, text_content, html_content
+
+
+def build_message(rendered, email, token):
+    subject, text, html_content = rendered
+    url = unsubscribe_url(token)
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=text.replace(UNSUBSCRIBE_MARKER, url),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email],
+        headers={
+            'List-Unsubscribe': f'<{url}>',
+            'List-Unsubscribe-Post': 'List-Unsubscribe=One-Click',
+        },
+    )
+    message.attach_alternative(html_content.replace(UNSUBSCRIBE_MARKER, escape(url)), 'text/html')
+    return message
+
+
+def send(campaign, batch_size=None, connections=None, rate=None):
+    """
+    Deliver a campaign already marked 'sending', starting after its
+    checkpoint. Returns the refreshed campaign.
+    """
+    batch_size = batch_size or settings.NEWSLETTER_BATCH_SIZE
+    connections = connections or settings.NEWSLETTER_CONNECTIONS
+    rate = settings.NEWSLETTER_RATE if rate is None else rate
+
+    rendered = render(campaign)
+    rows = (Subscriber.objects
+            .filter(is_active=True, pk__gt=campaign.last_subscriber_id)
+            .order_by('pk')
+            .values_list('pk', 'email', 'token')
+            .iterator(chunk_size=batch_size))
+    sender = Sender(RateLimiter(rate))
+
+    def deliver(row):
+        return sender.send(build_message(rendered, row[1], row[2]))
+
+    try:
+        with ThreadPoolExecutor(max_workers=connections,
+                                thread_name_prefix='newsletter') as executor:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                sent = sum(executor.map(deliver, batch))
+                # Checkpoint; pool threads never touch the database
+                Campaign.objects.filter(pk=campaign.pk).update(
+                    last_subscriber_id=batch[-1][0],
+                    sent_count=F('sent_count') + sent,
+                    failed_count=F('failed_count') + len(batch) - sent)
+    finally:
+        sender.close()
+
+    Campaign.objects.filter(pk=campaign.pk).update(status='sent', finished_at=timezone.now())
+    campaign.refresh_from_db()
+    return campaign
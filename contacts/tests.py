@@ -1,3 +1,136 @@
-from django.test import TestCase
+import json
+import time
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import OutboundEmail
+from . import newsletter
+from .models import Campaign, ContactMessage, Subscriber
+
+
+@override_settings(NEWSLETTER_RATE=0, SITE_URL='https://eipethiopia.org')
+class NewsletterTests(TestCase):
+    def setUp(self):
+        self.subscribers = [Subscriber.objects.create(email=f'reader{i}@example.org',
+                                                      token=f'token-{i}') for i in range(5)]
+        Subscriber.objects.create(email='gone@example.org', token='gone', is_active=False)
+        self.campaign = Campaign.objects.create(subject='June update',
+                                                content='<p>Water points finished</p>')
+
+    def send(self, *args):
+        out = StringIO()
+        call_command('send_newsletter', self.campaign.pk, *args, stdout=out)
+        self.campaign.refresh_from_db()
+        return out.getvalue()
+
+    def test_renders_once_and_personalizes_unsubscribe_link(self):
+        with mock.patch.object(newsletter, 'render_email',
+                               wraps=newsletter.render_email) as render:
+            output = self.send('--batch-size', '2')
+        self.assertEqual(render.call_count, 1)
+        self.assertIn('"June update": 5 sent, 0 failed', output)
+        self.assertEqual(self.campaign.status, 'sent')
+        self.assertEqual(self.campaign.last_subscriber_id, self.subscribers[-1].pk)
+
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox),
+                         [s.email for s in self.subscribers])
+        message = next(m for m in mail.outbox if m.to == ['reader3@example.org'])
+        url = 'https://eipethiopia.org/contact/unsubscribe/token-3/'
+        self.assertIn(url, message.body)
+        self.assertIn(f'href="{url}"', message.alternatives[0].content)
+        self.assertIn('Water points finished', message.alternatives[0].content)
+        self.assertEqual(message.extra_headers['List-Unsubscribe'], f'<{url}>')
+
+    def test_crashed_run_resumes_from_checkpoint(self):
+        real = newsletter.build_message
+
+        def crash_on_fourth(rendered, email, token):
+            if email == 'reader3@example.org':
+                raise RuntimeError('worker died')
+            return real(rendered, email, token)
+
+        with mock.patch.object(newsletter, 'build_message', side_effect=crash_on_fourth):
+            with self.assertRaises(RuntimeError):
+                self.send('--batch-size', '2', '--connections', '1')
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, 'sending')
+        self.assertEqual(self.campaign.last_subscriber_id, self.subscribers[1].pk)
+
+        with self.assertRaises(CommandError):
+            self.send()
+        mail.outbox.clear()
+        self.assertIn('Resuming after subscriber', self.send('--resume'))
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox),
+                         [s.email for s in self.subscribers[2:]])
+        self.assertEqual(self.campaign.sent_count, 5)
+
+    def test_sent_campaign_is_not_sent_again(self):
+        self.send()
+        with self.assertRaisesMessage(CommandError, 'already been sent'):
+            self.send('--resume')
+
+    def test_rate_limiter_spaces_messages(self):
+        limiter = newsletter.RateLimiter(100)
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+    def test_unsubscribe_link(self):
+        url = reverse('newsletter_unsubscribe', args=['token-0'])
+        self.assertContains(self.client.get(url), 'Unsubscribe from our newsletter?')
+        self.assertTrue(Subscriber.objects.get(token='token-0').is_active)
+
+        self.assertContains(self.client.post(url), 'You have been unsubscribed')
+        self.assertFalse(Subscriber.objects.get(token='token-0').is_active)
+        self.assertEqual(self.client.get(reverse('newsletter_unsubscribe', args=['nope'])).status_code, 404)
+
+
+class DuplicateSubmissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def post(self, key='', **fields):
+        data = {'name': 'Abebe', 'email': 'abebe@example.org', 'subject': 'Partnership',
+                'message': 'We would like to work with you.', **fields}
+        return self.client.post(reverse('contact_api'), json.dumps(data),
+                                content_type='application/json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_identical_message_is_coalesced(self):
+        first = self.post()
+        # Case and whitespace differences do not make a new message
+        second = self.post(message='  we would like to work   with you. ')
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+        self.post(subject='Another topic')
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_same_message_is_caught_by_the_table_when_the_cache_forgot(self):
+        self.post()
+        cache.clear()
+        self.assertEqual(self.post().status_code, 200)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_repeated_idempotency_key_is_not_processed_again(self):
+        self.post(key='form-1')
+        self.post(key='form-1', subject='Edited subject')
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_contact_form_renders_an_idempotency_key(self):
+        response = self.client.get(reverse('contact'))
+        self.assertContains(response, 'name="idempotency_key"')
+        key = response.context['idempotency_key']
+        data = {'name': 'Abebe', 'email': 'abebe@example.org', 'subject': 'Partnership',
+                'message': 'We would like to work with you.', 'idempotency_key': key}
+        for _ in range(2):
+            self.assertEqual(self.client.post(reverse('contact'), data).status_code, 302)
+        self.assertEqual(ContactMessage.objects.count(), 1)
@@ -4,4 +4,6 @@ from . import views
 urlpatterns = [
     path('', views.ContactView.as_view(), name='contact'),
     path('api/contact/', views.api_contact, name='contact_api'),
+    path('unsubscribe/<str:token>/', views.unsubscribe_newsletter,
+         name='newsletter_unsubscribe'),
 ]
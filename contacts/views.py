@@ -1,17 +1,61 @@
 from django.core.mail import send_mail
 from django.conf import settings
 from core.utils.email import send_contact_notification, send_contact_auto_reply
+from core.utils import dedupe
+from core.utils.ratelimit import ratelimit
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.http import JsonResponse
+from django.db import IntegrityError, transaction
+from django.http import HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from .models import ContactMessage
+from .models import ContactMessage, Subscriber
 from .forms import ContactForm
 import json
+import logging
 
+logger = logging.getLogger(__name__)
 
+
+def notify(contact_message):
+    try:
+        # Notification to admin
+        send_contact_notification(contact_message)
+
+        # Auto-reply to user
+        send_contact_auto_reply(contact_message)
+
+    except Exception:
+        # Log error but don't crash the form submission
+        logger.exception('Email queueing failed for contact message %s', contact_message.pk)
+
+
+def save_once(request, contact_message):
+    """
+    Save a new message and queue its emails, unless it duplicates a recent
+    one or repeats an idempotency key. Returns whether it was saved.
+    """
+    contact_message.fingerprint = contact_message.compute_fingerprint()
+    key = dedupe.idempotency_key(request)
+    if not dedupe.claim('contact', contact_message.fingerprint, key):
+        return False
+    try:
+        with transaction.atomic():
+            contact_message.save()
+            notify(contact_message)
+    except IntegrityError:
+        # Stored earlier, before the cache entry
+        return False
+    except Exception:
+        dedupe.release('contact', contact_message.fingerprint, key)
+        raise
+    return True
+
+
+@method_decorator(ratelimit('contact'), name='dispatch')
 class ContactView(CreateView):
     model = ContactMessage
     form_class = ContactForm
@@ -22,6 +66,7 @@ class ContactView(CreateView):
         context = super().get_context_data(**kwargs)
         context['page_title'] = 'Contact Us'
         context['meta_description'] = 'Get in touch with EIP Ethiopia'
+        context['idempotency_key'] = dedupe.new_idempotency_key()
         return context
 
     def form_valid(self, form):
@@ -35,30 +80,22 @@ class ContactView(CreateView):
         # Save with IP address
         contact_message = form.save(commit=False)
         contact_message.ip_address = ip_address
-        contact_message.save()
-
-        # Send email notifications
-        try:
-            # Send notification to admin
-            send_contact_notification(contact_message)
 
-            # Send auto-reply to user
-            send_contact_auto_reply(contact_message)
-
-        except Exception as e:
-            # Log error but don't crash the form submission
-            print(f"Email sending failed: {e}")
+        # The message and its emails commit together; a resubmission gets the same answer
+        save_once(self.request, contact_message)
+        self.object = contact_message
 
         messages.success(
             self.request,
             'Thank you for your message! We have sent a confirmation email to your address and will get back to you soon.'
         )
 
-        return super().form_valid(form)
+        return HttpResponseRedirect(self.get_success_url())
 
 
 @csrf_exempt
 @require_POST
+@ratelimit('contact')
 def api_contact(request):
     """API endpoint for AJAX contact form submission"""
     try:
@@ -71,7 +108,7 @@ def api_contact(request):
                 return JsonResponse({'error': f'{field} is required'}, status=400)
 
         # Create contact message
-        contact_message = ContactMessage.objects.create(
+        contact_message = ContactMessage(
             name=data['name'],
             email=data['email'],
             subject=data['subject'],
@@ -84,15 +121,9 @@ def api_contact(request):
             contact_message.ip_address = x_forwarded_for.split(',')[0]
         else:
             contact_message.ip_address = request.META.get('REMOTE_ADDR')
-        contact_message.save()
 
-        # Send email notifications
-        try:
-            send_contact_notification(contact_message)
-            send_contact_auto_reply(contact_message)
-        except Exception as e:
-            # Log but don't fail the API response
-            print(f"Email sending failed: {e}")
+        # Stored together with its queued emails; duplicates get the same answer
+        save_once(request, contact_message)
 
         return JsonResponse({
             'message': 'Thank you for your message! We have sent a confirmation email and will get back to you soon.',
@@ -103,3 +134,17 @@ def api_contact(request):
         return JsonResponse({'error': 'Invalid request format'}, status=400)
     except Exception as e:
         return JsonResponse({'error': 'An error occurred. Please try again.'}, status=500)
+
+
+# Token in the URL authorizes; mail clients send the one-click POST without CSRF
+@csrf_exempt
+def unsubscribe_newsletter(request, token):
+    """Unsubscribe link from newsletters: GET asks to confirm, POST unsubscribes"""
+    subscriber = get_object_or_404(Subscriber, token=token)
+    if request.method == 'POST' and subscriber.is_active:
+        subscriber.is_active = False
+        subscriber.save(update_fields=['is_active'])
+    return render(request, 'contacts/unsubscribe.html', {
+        'subscriber': subscriber,
+        'unsubscribed': request.method == 'POST' or not subscriber.is_active,
+    })
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import SliderImage, GuidingPrinciple, Partner, BoardMember, Strategy
+from django.utils import timezone
+from .models import SliderImage, GuidingPrinciple, Partner, BoardMember, Strategy, OutboundEmail, AdminDigest
 
 
 @admin.register(SliderImage)
@@ -55,3 +56,28 @@ class StrategyAdmin(admin.ModelAdmin):
     list_display = ('title', 'order', 'icon')
     list_editable = ('order',)
     search_fields = ('title', 'description')
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to')
+    readonly_fields = ('subject', 'from_email', 'to', 'reply_to', 'body', 'html_body',
+                       'attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ['retry_now']
+
+    def recipients(self, obj):
+        return ', '.join(obj.to)
+
+    @admin.action(description='Retry selected emails now')
+    def retry_now(self, request, queryset):
+        count = queryset.exclude(status='sent').update(
+            status='pending', next_attempt_at=timezone.now(), claimed_by='')
+        self.message_user(request, f'{count} emails queued for the next send_queued_email run.')
+
+
+@admin.register(AdminDigest)
+class AdminDigestAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'application_count', 'contact_count')
+    readonly_fields = ('created_at', 'contact_count', 'application_count')
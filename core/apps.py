@@ -1,6 +1,18 @@
+import logging
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import checks  # noqa: F401
+
+        logger.debug('DEBUG=%s ALLOWED_HOSTS=%s SITE_URL=%s cache=%s', settings.DEBUG,
+                     settings.ALLOWED_HOSTS, settings.SITE_URL,
+                     settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1])
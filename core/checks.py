@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+
+
+@register(Tags.templates)
+def check_email_templates(app_configs, **kwargs):
+    """Compile every email template now instead of failing when one is sent"""
+    # Imported here: the email stack is only loaded by commands that run checks
+    from core.utils.email import EMAIL_TEMPLATES, get_email_templates
+
+    errors = []
+    for name in EMAIL_TEMPLATES:
+        try:
+            get_email_templates(name)
+        except TemplateDoesNotExist as exc:
+            errors.append(Error(
+                f'Email template {exc} does not exist.',
+                hint=f'Each email needs templates/emails/{name}.html and {name}.txt.',
+                id='core.E001'))
+        except TemplateSyntaxError as exc:
+            errors.append(Error(f'Email template for "{name}" is invalid: {exc}',
+                                id='core.E002'))
+    return errors
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Rate limits, dedupe keys and cached pages need a cache shared by all workers"""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend.endswith('LocMemCache'):
+        return [Warning(
+            'The default cache is local memory, so each worker process has its own.',
+            hint='Set REDIS_URL to share rate limits, duplicate detection and cached pages.',
+            id='core.W001')]
+    return []
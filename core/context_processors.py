@@ -4,5 +4,5 @@ def site_metadata(request):
         'site_description': 'Empowering Ethiopian communities through sustainable development initiatives',
         'site_keywords': 'EIP Ethiopia, non-profit, development, Ethiopia, charity, community development, sustainable development',
         'site_author': 'EIP Ethiopia',
-        'site_image': 'images/og-image.jpg',
+        'site_image': 'images/logo/logo.jpg',
     }
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.images import metadata_columns, metadata_fields, read_metadata
+
+
+class Command(BaseCommand):
+    help = 'Store dimensions, size, colour and placeholder of existing images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fields', nargs='*', metavar='app.model.field',
+                            help='Limit to these fields (default: all with metadata columns)')
+        parser.add_argument('--force', action='store_true',
+                            help='Recompute images that already have metadata')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Parallel decoding threads (default: 4)')
+
+    def handle(self, *args, **options):
+        available = {f'{model._meta.label_lower}.{name}': (model, name)
+                     for model in apps.get_models() for name in metadata_fields(model)}
+        keys = options['fields'] or list(available)
+        unknown = set(keys) - set(available)
+        if unknown:
+            raise CommandError(f"No metadata columns: {', '.join(sorted(unknown))}")
+
+        jobs = []
+        for key in keys:
+            model, field_name = available[key]
+            rows = (model._default_manager
+                    .exclude(**{f'{field_name}__isnull': True})
+                    .exclude(**{field_name: ''}))
+            if not options['force']:
+                rows = rows.filter(**{f'{field_name}_width__isnull': True})
+            storage = model._meta.get_field(field_name).storage
+            for pk, name in rows.values_list('pk', field_name).iterator():
+                jobs.append((model, field_name, pk, storage, name))
+
+        done = failed = 0
+        # Files are read and decoded in threads; rows are written from this one
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {executor.submit(read_metadata, job[3], job[4]): job for job in jobs}
+            for future in as_completed(futures):
+                model, field_name, pk, _, name = futures[future]
+                try:
+                    metadata = future.result()
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'{name}: {exc}')
+                    continue
+                # Skip rows whose image changed meanwhile; their save() handled it
+                model._default_manager.filter(pk=pk, **{field_name: name}).update(
+                    **metadata_columns(field_name, metadata))
+                done += 1
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'  {name}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored metadata for {done} images ({failed} failed)'))
@@ -0,0 +1,88 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from EIP.db import postgres_pool_options
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Compare per-request latency of pooled and non-pooled PostgreSQL '
+            'connections using the default database server')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16,
+                            help='Concurrent simulated workers (default: 16)')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Requests per thread (default: 200)')
+        parser.add_argument('--pool-size', type=int, default=None,
+                            help='max_size of the pool (default: DATABASE_POOL_MAX_SIZE)')
+
+    def handle(self, *args, **options):
+        base = connections.settings[DEFAULT_DB_ALIAS]
+        if base['ENGINE'] != 'django.db.backends.postgresql':
+            raise CommandError('benchmark_db_pool needs DATABASE_URL to point at PostgreSQL')
+
+        pool = postgres_pool_options()
+        if options['pool_size']:
+            pool['max_size'] = options['pool_size']
+            pool['min_size'] = min(pool['min_size'], pool['max_size'])
+
+        options_without_pool = {k: v for k, v in base['OPTIONS'].items() if k != 'pool'}
+        variants = {
+            'bench_direct': {**base, 'CONN_MAX_AGE': 0, 'OPTIONS': options_without_pool},
+            'bench_pooled': {**base, 'CONN_MAX_AGE': 0,
+                             'OPTIONS': {**options_without_pool, 'pool': pool}},
+        }
+        for alias, settings_dict in variants.items():
+            connections.settings[alias] = settings_dict
+            try:
+                self.run_variant(alias, options)
+            finally:
+                connection = connections[alias]
+                connection.close()
+                if connection.pool:
+                    connection.close_pool()
+                del connections[alias]
+                del connections.settings[alias]
+
+    def run_variant(self, alias, options):
+        latencies = []
+        lock = threading.Lock()
+
+        def simulate():
+            local = []
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                # A typical list page: a count plus one page of rows
+                Post.objects.using(alias).filter(status='published').count()
+                list(Post.objects.using(alias).filter(
+                    status='published').only('id', 'title')[:9])
+                # What request_finished does: close, or hand back to the pool
+                connections[alias].close()
+                local.append(time.perf_counter() - started)
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=simulate) for _ in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        cuts = statistics.quantiles(latencies, n=100)
+        line = (f"{alias[len('bench_'):]:>7}: {len(latencies) / elapsed:,.0f} req/s, "
+                f"p50 {cuts[49] * 1000:.2f} ms, p95 {cuts[94] * 1000:.2f} ms, "
+                f"p99 {cuts[98] * 1000:.2f} ms")
+        pool = connections[alias].pool
+        if pool is not None:
+            stats = pool.get_stats()
+            line += (f", pool size {stats.get('pool_size')}, "
+                     f"queued {stats.get('requests_queued', 0)}, "
+                     f"wait {stats.get('requests_wait_ms', 0)} ms total")
+        self.stdout.write(line)
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from core.utils.email import render_email
+
+CONTEXT = {
+    'vacancy_title': 'Programme Officer',
+    'applicant_name': 'Abebe Kebede',
+    'applicant_email': 'abebe@example.org',
+    'applicant_phone': '+251911000000',
+    'cover_letter': 'I have five years of experience in WASH programmes. ' * 20,
+    'applied_date': timezone.now(),
+    'ip_address': '196.188.0.1',
+    'resume_url': 'https://eipethiopia.org/media/applications/resumes/cv.pdf',
+    'additional_docs_url': '',
+    'admin_url': 'https://eipethiopia.org/admin/vacancies/application/1/change/',
+}
+
+
+def loader_chain(name):
+    # What core.utils.email did before: loader lookup each call, text by stripping tags
+    html = render_to_string(f'emails/{name}.html', CONTEXT)
+    return html, strip_tags(html)
+
+
+class Command(BaseCommand):
+    help = ('Compare rendering an email through the template loaders plus strip_tags '
+            'with the precompiled html/txt templates of core.utils.email')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000)
+        parser.add_argument('--template', default='application_notification')
+
+    def handle(self, *args, **options):
+        name, iterations = options['template'], options['iterations']
+        results = {}
+        for label, render in (('loader + strip_tags', loader_chain),
+                              ('precompiled', lambda n: render_email(n, CONTEXT))):
+            render(name)  # warm-up: first compile, loader caches
+            started = time.perf_counter()
+            for _ in range(iterations):
+                render(name)
+            results[label] = (time.perf_counter() - started) / iterations * 1e6
+            self.stdout.write(f'{label:>20}: {results[label]:8.1f} µs per email')
+
+        baseline, compiled = results.values()
+        self.stdout.write(self.style.SUCCESS(f'Speed-up: {baseline / compiled:.2f}x'))
@@ -0,0 +1,68 @@
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from .benchmark_servers import free_port
+from .benchmark_startup import wait_for_port
+
+MODES = {
+    'rendered': {'HTML_MINIFY': 'False', 'HTML_STREAMING': 'False'},
+    'minified': {'HTML_MINIFY': 'True', 'HTML_STREAMING': 'False'},
+    'streamed': {'HTML_MINIFY': 'True', 'HTML_STREAMING': 'True'},
+}
+
+
+class Command(BaseCommand):
+    help = ('Compare time to first byte, total time and size of HTML pages served by '
+            'gunicorn as rendered, minified, and minified and streamed')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default=','.join(MODES),
+                            help='Comma-separated subset of: ' + ', '.join(MODES))
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Requests per path and mode (default: 50)')
+        parser.add_argument('--paths', default='/blog/,/publications/',
+                            help='Comma-separated paths')
+
+    def handle(self, *args, **options):
+        paths = options['paths'].split(',')
+        for name in options['modes'].split(','):
+            if name not in MODES:
+                raise CommandError(f'Unknown mode {name!r}')
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            port = free_port()
+            server = subprocess.Popen(
+                [sys.executable, '-m', 'gunicorn', 'EIP.wsgi:application', '--workers', '1',
+                 '--bind', f'127.0.0.1:{port}', '--log-level', 'warning'],
+                cwd=settings.BASE_DIR, env={**os.environ, **MODES[name]})
+            try:
+                wait_for_port(server, port)
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                for path in paths:
+                    self.get(connection, path)
+                    samples = [self.get(connection, path) for _ in range(options['requests'])]
+                    first_byte, total, size = (statistics.median(column) for column in zip(*samples))
+                    self.stdout.write(f'  {path:<22} first byte {first_byte * 1000:6.1f} ms, '
+                                      f'total {total * 1000:6.1f} ms, {size / 1024:6.1f} KiB')
+                connection.close()
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    def get(self, connection, path):
+        """(seconds to the first body byte, seconds to the last, body size)"""
+        started = time.perf_counter()
+        connection.request('GET', path)
+        response = connection.getresponse()
+        body = response.read1(65536)
+        first_byte = time.perf_counter() - started
+        body += response.read()
+        if response.status != 200:
+            raise CommandError(f'GET {path} returned {response.status}')
+        return first_byte, time.perf_counter() - started, len(body)
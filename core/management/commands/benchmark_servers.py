@@ -0,0 +1,160 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SERVERS = {
+    # Sync views in gunicorn's sync workers: one request per worker at a time
+    'wsgi': ['-m', 'gunicorn', 'EIP.wsgi:application', '--workers', '{workers}',
+             '--bind', '127.0.0.1:{port}', '--log-level', 'warning'],
+    # Async views (EIP/asgi.py sets ASYNC_VIEWS) in uvicorn workers
+    'asgi': ['-m', 'uvicorn', 'EIP.asgi:application', '--workers', '{workers}',
+             '--port', '{port}', '--log-level', 'warning', '--no-access-log'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def process_tree_rss(pid):
+    """Resident memory in bytes of `pid` and its descendants, read from /proc"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as stat:
+                    ppid = int(stat.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            with open(f'/proc/{current}/status') as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    return total
+
+
+class Command(BaseCommand):
+    help = ('Compare throughput, latency and memory of the site under gunicorn (WSGI, sync '
+            'views) and uvicorn (ASGI, async views) at several concurrency levels')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', default='wsgi,asgi',
+                            help='Comma-separated subset of: ' + ', '.join(SERVERS))
+        parser.add_argument('--concurrency', default='1,8,32,64',
+                            help='Comma-separated numbers of concurrent clients (default: 1,8,32,64)')
+        parser.add_argument('--duration', type=float, default=10,
+                            help='Seconds per concurrency level (default: 10)')
+        parser.add_argument('--workers', type=int, default=2,
+                            help='Server worker processes (default: 2)')
+        parser.add_argument('--paths', default='/,/blog/,/publications/',
+                            help='Comma-separated paths requested in turn')
+
+    def handle(self, *args, **options):
+        if not sys.platform.startswith('linux'):
+            raise CommandError('benchmark_servers reads memory usage from /proc (Linux only)')
+        levels = [int(level) for level in options['concurrency'].split(',')]
+        paths = options['paths'].split(',')
+        for name in options['servers'].split(','):
+            if name not in SERVERS:
+                raise CommandError(f'Unknown server {name!r}')
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{name.upper()} ({options['workers']} workers)"))
+            port = free_port()
+            command = [arg.format(workers=options['workers'], port=port) for arg in SERVERS[name]]
+            server = subprocess.Popen([sys.executable, *command], cwd=settings.BASE_DIR,
+                                      env={**os.environ, 'ASYNC_VIEWS': str(name == 'asgi')})
+            try:
+                self.wait_until_ready(server, port, paths)
+                for level in levels:
+                    self.run_level(server.pid, port, paths, level, options['duration'])
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    def wait_until_ready(self, server, port, paths, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError('The server exited during startup, is it installed?')
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+                # Warm every path: imports, template loading, caches
+                for path in paths:
+                    connection.request('GET', path)
+                    connection.getresponse().read()
+                connection.close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'The server did not answer within {timeout}s')
+
+    def run_level(self, pid, port, paths, clients, duration):
+        latencies, errors = [], []
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def client(offset):
+            local, failed = [], 0
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            index = offset
+            while not stop.is_set():
+                path = paths[index % len(paths)]
+                index += 1
+                started = time.perf_counter()
+                try:
+                    connection.request('GET', path)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        failed += 1
+                        continue
+                except (OSError, http.client.HTTPException):
+                    failed += 1
+                    connection.close()
+                    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                    continue
+                local.append(time.perf_counter() - started)
+            connection.close()
+            with lock:
+                latencies.extend(local)
+                errors.append(failed)
+
+        peak_rss = process_tree_rss(pid)
+        threads = [threading.Thread(target=client, args=(offset,)) for offset in range(clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        while time.perf_counter() - started < duration:
+            time.sleep(0.25)
+            peak_rss = max(peak_rss, process_tree_rss(pid))
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if len(latencies) < 2:
+            self.stdout.write(f'{clients:>5} clients: no successful requests')
+            return
+        cuts = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{clients:>5} clients: {len(latencies) / elapsed:8,.1f} req/s, '
+            f'p50 {cuts[49] * 1000:7.1f} ms, p95 {cuts[94] * 1000:7.1f} ms, '
+            f'errors {sum(errors)}, peak RSS {peak_rss / 2 ** 20:6.1f} MiB')
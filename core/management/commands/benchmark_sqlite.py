@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from EIP.db import sqlite_init_pragmas
+
+SCHEMA = """
+CREATE TABLE blog_post (
+    id INTEGER PRIMARY KEY, slug TEXT UNIQUE, title TEXT, views INTEGER NOT NULL
+);
+CREATE TABLE blog_postview (
+    id INTEGER PRIMARY KEY, post_id INTEGER NOT NULL REFERENCES blog_post (id),
+    ip_address TEXT, user_agent TEXT, viewed_at TEXT
+);
+CREATE INDEX blog_postview_post ON blog_postview (post_id, viewed_at);
+"""
+
+PROFILES = ('default', 'tuned')
+
+
+def _connect(path, profile):
+    # 'default' is what Django does without OPTIONS: rollback journal, 5s timeout
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+    if profile == 'tuned':
+        for pragma in sqlite_init_pragmas():
+            conn.execute(pragma)
+    return conn
+
+
+def _worker(path, profile, posts, duration, results):
+    """Replay the queries of a PostDetailView hit until the time is up"""
+    conn = _connect(path, profile)
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+    n = os.getpid()
+    while time.monotonic() < deadline:
+        n += 1
+        post_id = n % posts + 1
+        started = time.perf_counter()
+        try:
+            conn.execute('SELECT * FROM blog_post WHERE slug = ?',
+                         (f'post-{post_id}',)).fetchone()
+            conn.execute('UPDATE blog_post SET views = views + 1 WHERE id = ?',
+                         (post_id,))
+            conn.execute('SELECT views FROM blog_post WHERE id = ?',
+                         (post_id,)).fetchone()
+            conn.execute(
+                "INSERT INTO blog_postview (post_id, ip_address, user_agent, viewed_at) "
+                "VALUES (?, '127.0.0.1', 'bench', datetime('now'))", (post_id,))
+            conn.execute('SELECT * FROM blog_post WHERE id != ? ORDER BY id DESC LIMIT 3',
+                         (post_id,)).fetchall()
+        except sqlite3.OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+    results.put((latencies, errors))
+
+
+class Command(BaseCommand):
+    help = ('Measure sustained requests/s of the post detail write path on SQLite '
+            'with several worker processes, with and without the WAL profile')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=10.0,
+                            help='Seconds per profile (default: 10)')
+        parser.add_argument('--posts', type=int, default=50)
+        parser.add_argument('--profile', choices=PROFILES + ('both',), default='both')
+
+    def handle(self, *args, **options):
+        profiles = PROFILES if options['profile'] == 'both' else (options['profile'],)
+        for profile in profiles:
+            self.run_profile(profile, options)
+
+    def run_profile(self, profile, options):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.sqlite3')
+            conn = _connect(path, profile)
+            conn.executescript(SCHEMA)
+            conn.executemany(
+                'INSERT INTO blog_post (id, slug, title, views) VALUES (?, ?, ?, 0)',
+                [(i, f'post-{i}', f'Post {i}') for i in range(1, options['posts'] + 1)])
+            conn.close()
+
+            results = multiprocessing.Queue()
+            workers = [
+                multiprocessing.Process(target=_worker, args=(
+                    path, profile, options['posts'], options['duration'], results))
+                for _ in range(options['workers'])
+            ]
+            for worker in workers:
+                worker.start()
+            latencies, errors = [], 0
+            for _ in workers:
+                worker_latencies, worker_errors = results.get()
+                latencies.extend(worker_latencies)
+                errors += worker_errors
+            for worker in workers:
+                worker.join()
+
+        rps = len(latencies) / options['duration']
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=100)
+            p50, p99 = cuts[49] * 1000, cuts[98] * 1000
+        else:
+            p50 = p99 = 0.0
+        self.stdout.write(
+            f"{profile:>8}: {options['workers']} workers, {rps:,.0f} req/s, "
+            f"p50 {p50:.2f} ms, p99 {p99:.2f} ms, {errors} 'database is locked' errors")
@@ -0,0 +1,99 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from .benchmark_servers import free_port
+
+VARIANTS = {
+    # Plain gunicorn: the worker imports the app and compiles on demand
+    'cold': {'GUNICORN_PRELOAD': 'False', 'GUNICORN_WARMUP': 'False'},
+    # gunicorn.conf.py defaults: preloaded master, warm-up after the fork
+    'warm': {'GUNICORN_PRELOAD': 'True', 'GUNICORN_WARMUP': 'True'},
+}
+
+
+def wait_for_port(server, port, timeout=60):
+    """Wait until the `server` process listens on `port`"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise CommandError('gunicorn exited during startup, is it installed?')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise CommandError(f'gunicorn did not listen within {timeout}s')
+
+
+class Command(BaseCommand):
+    help = ('Measure the latency of the first requests a fresh gunicorn worker serves, '
+            'with and without the preload/warm-up in gunicorn.conf.py')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--variants', default='cold,warm',
+                            help='Comma-separated subset of: ' + ', '.join(VARIANTS))
+        parser.add_argument('--runs', type=int, default=5,
+                            help='Server starts per variant (default: 5)')
+        parser.add_argument('--settle', type=float, default=3,
+                            help='Seconds between the port opening and the first request, '
+                                 'so the worker has booted (default: 3)')
+        parser.add_argument('--paths', default='/,/blog/,/publications/,/contact/',
+                            help='Comma-separated paths, each requested twice in turn')
+
+    def handle(self, *args, **options):
+        paths = options['paths'].split(',')
+        for name in options['variants'].split(','):
+            if name not in VARIANTS:
+                raise CommandError(f'Unknown variant {name!r}')
+            first = {path: [] for path in paths}
+            second = {path: [] for path in paths}
+            for _ in range(options['runs']):
+                for path, (cold, warm) in self.measure(name, paths, options['settle']).items():
+                    first[path].append(cold)
+                    second[path].append(warm)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{name} (median of {options['runs']} starts)"))
+            for path in paths:
+                self.stdout.write(
+                    f'  {path:<20} first {statistics.median(first[path]) * 1000:7.1f} ms, '
+                    f'second {statistics.median(second[path]) * 1000:7.1f} ms')
+            total = statistics.median(sum(run) for run in zip(*first.values()))
+            self.stdout.write(f'  {"all first requests":<20} {total * 1000:7.1f} ms')
+
+    def measure(self, name, paths, settle):
+        """Start one single-worker server, returns {path: (first, second) seconds}"""
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'EIP.wsgi:application', '--workers', '1',
+             '--bind', f'127.0.0.1:{port}', '--max-requests', '0', '--log-level', 'warning'],
+            cwd=settings.BASE_DIR, env={**os.environ, **VARIANTS[name]})
+        try:
+            wait_for_port(server, port)
+            time.sleep(settle)
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            timings = {}
+            for path in paths:
+                timings[path] = tuple(self.get(connection, path) for _ in range(2))
+            connection.close()
+            return timings
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    def get(self, connection, path):
+        started = time.perf_counter()
+        connection.request('GET', path)
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise CommandError(f'GET {path} returned {response.status}')
+        return time.perf_counter() - started
@@ -0,0 +1,39 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.utils.content_transfer import CONTENT_TYPES, export_records
+
+
+class Command(BaseCommand):
+    help = 'Stream posts, publications and vacancies to a JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', default='-',
+                            help="File to write, or '-' for stdout (default)")
+        parser.add_argument('--model', action='append', choices=sorted(CONTENT_TYPES),
+                            help='Limit the export to a model (repeatable)')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Rows fetched per database round-trip (default: 500)')
+
+    def handle(self, *args, **options):
+        labels = options['model'] or list(CONTENT_TYPES)
+        to_stdout = options['output'] == '-'
+        out = sys.stdout if to_stdout else open(options['output'], 'w', encoding='utf-8')
+
+        started = time.monotonic()
+        count = 0
+        try:
+            for line in export_records(labels, chunk_size=options['chunk_size']):
+                out.write(line + '\n')
+                count += 1
+        finally:
+            if not to_stdout:
+                out.close()
+
+        seconds = time.monotonic() - started
+        rate = count / seconds if seconds else 0
+        # Keep stdout clean for piping, report on stderr
+        self.stderr.write(self.style.SUCCESS(
+            f'Exported {count} objects in {seconds:.2f}s ({rate:.0f} objects/s)'))
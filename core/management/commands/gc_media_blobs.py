@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.storage import collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed media blobs that nothing references any more'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=int,
+                            help='Keep unreferenced blobs this long (default: MEDIA_BLOB_GC_GRACE_HOURS)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be deleted without deleting it')
+
+    def handle(self, *args, **options):
+        stats = collect_garbage(options['grace_hours'], dry_run=options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(f"{stats['blobs']} blobs tracked, {stats['recounted']} refcounts corrected")
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {stats['deleted']} blobs ({stats['bytes'] / 1024 / 1024:.1f} MB)"))
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.images import generate, get_manifest
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive image derivatives for existing media (IMAGE_DERIVATIVES)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fields', nargs='*', metavar='app.model.field',
+                            help='Limit to these fields (default: all configured)')
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate images that already have derivatives')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Parallel encoding threads (default: 4)')
+
+    def handle(self, *args, **options):
+        keys = options['fields'] or list(settings.IMAGE_DERIVATIVES)
+        unknown = set(keys) - set(settings.IMAGE_DERIVATIVES)
+        if unknown:
+            raise CommandError(f"Not in IMAGE_DERIVATIVES: {', '.join(sorted(unknown))}")
+
+        jobs = []
+        for key in keys:
+            label, field_name = key.rsplit('.', 1)
+            model = apps.get_model(label)
+            names = (model._default_manager
+                     .exclude(**{f'{field_name}__isnull': True})
+                     .exclude(**{field_name: ''})
+                     .values_list(field_name, flat=True))
+            storage = model._meta.get_field(field_name).storage
+            for name in names.iterator():
+                field_file = getattr(model(**{field_name: name}), field_name)
+                if options['force'] or not get_manifest(field_file):
+                    jobs.append((storage, name, settings.IMAGE_DERIVATIVES[key]))
+
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {executor.submit(generate, *job): job[1] for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                    done += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'{futures[future]}: {exc}')
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'  {futures[future]}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated derivatives for {done} images ({failed} failed)'))
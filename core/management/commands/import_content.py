@@ -0,0 +1,55 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.content_transfer import CONTENT_TYPES, ContentImporter, iter_jsonl
+
+
+class Command(BaseCommand):
+    help = 'Stream posts, publications and vacancies from a JSONL file into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSONL file to read, or '-' for stdin")
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Objects written per bulk INSERT (default: 500)')
+        parser.add_argument('--media-source',
+                            help='Directory that file paths in the export are relative to; '
+                                 'referenced files are copied into MEDIA_ROOT')
+        parser.add_argument('--workers', type=int, default=8,
+                            help='Parallel media copy threads (default: 8)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        importer = ContentImporter(
+            batch_size=options['batch_size'],
+            media_source=options['media_source'],
+            workers=options['workers'],
+        )
+
+        stream = sys.stdin if options['path'] == '-' else open(
+            options['path'], encoding='utf-8')
+        try:
+            for count, record in enumerate(iter_jsonl(stream), start=1):
+                importer.feed(record)
+                if options['verbosity'] > 1 and count % options['batch_size'] == 0:
+                    self.stdout.write(f'  {count} records read')
+            stats = importer.close()
+        except (ValueError, OSError) as exc:
+            raise CommandError(str(exc))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        seconds = stats.pop('total')['seconds']
+        created = 0
+        for label, counts in sorted(stats.items()):
+            details = ', '.join(f'{key}={value}' for key, value in sorted(counts.items()))
+            self.stdout.write(f'{label}: {details}')
+            if label in CONTENT_TYPES:
+                created += counts.get('created', 0)
+
+        rate = created / seconds if seconds else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {created} objects in {seconds:.2f}s ({rate:.0f} objects/s)'))
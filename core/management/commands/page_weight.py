@@ -0,0 +1,120 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+VARIANTS = {
+    # Assets served one by one from the source directories, uncompressed
+    'source': {'DEBUG': 'True', 'STATIC_BUILD': 'False', 'COMPRESS_ENABLED': 'False'},
+    # The Dockerfile build: hashed names, bundles, .gz/.br copies
+    'built': {'DEBUG': 'False', 'STATIC_BUILD': 'True', 'COMPRESS_ENABLED': 'True'},
+}
+# Same HTML in both variants, so the difference is the assets
+COMMON_ENV = {'HTML_MINIFY': 'True', 'HTML_STREAMING': 'False'}
+
+TAG_RE = re.compile(r'<(?:link|script|img)\b[^>]*>', re.IGNORECASE)
+URL_RE = re.compile(r'\b(?:href|src)="([^"]+)"')
+
+
+class Command(BaseCommand):
+    help = ('Report the bytes a browser downloads for a page and its same-origin assets, '
+            'before and after the static build (collectstatic + compress)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paths', default='/,/blog/,/publications/',
+                            help='Comma-separated paths')
+        parser.add_argument('--variants', default=','.join(VARIANTS),
+                            help='Comma-separated subset of: ' + ', '.join(VARIANTS))
+        parser.add_argument('--measure', action='store_true',
+                            help='Measure the current settings only and print JSON '
+                                 '(used by the variant subprocesses)')
+
+    def handle(self, *args, **options):
+        paths = options['paths'].split(',')
+        if options['measure']:
+            self.stdout.write(json.dumps({path: self.measure(path) for path in paths}))
+            return
+
+        results = {}
+        for name in options['variants'].split(','):
+            if name not in VARIANTS:
+                raise CommandError(f'Unknown variant {name!r}')
+            with tempfile.TemporaryDirectory() as static_root:
+                env = {**os.environ, **COMMON_ENV, **VARIANTS[name], 'STATIC_ROOT': static_root}
+                if name == 'built':
+                    self.run(['collectstatic', '--noinput', '-v0'], env)
+                    self.run(['compress', '-v0'], env)
+                results[name] = json.loads(self.run(['page_weight', '--measure',
+                                                     '--paths', options['paths']], env))
+
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for path in paths:
+                page = results[name][path]
+                assets = ', '.join(f"{kind} {count} × {size / 1024:.1f} KiB"
+                                   for kind, (count, size) in page['assets'].items())
+                self.stdout.write(
+                    f"  {path:<16} {page['total'] / 1024:7.1f} KiB in {page['requests']} requests "
+                    f"({page['immutable']} immutable): HTML {page['html'] / 1024:.1f} KiB, {assets}"
+                    f"; {page['third_party']} third-party requests not counted")
+
+        if len(results) == 2:
+            self.stdout.write(self.style.MIGRATE_HEADING('change'))
+            before, after = results.values()
+            for path in paths:
+                old, new = before[path]['total'], after[path]['total']
+                self.stdout.write(f'  {path:<16} {old / 1024:7.1f} → {new / 1024:7.1f} KiB '
+                                  f'({(new - old) / old:+.0%}), requests '
+                                  f"{before[path]['requests']} → {after[path]['requests']}")
+
+    def run(self, command, env):
+        process = subprocess.run([sys.executable, 'manage.py', *command], cwd=settings.BASE_DIR,
+                                 env=env, capture_output=True, text=True)
+        if process.returncode:
+            raise CommandError(f"{' '.join(command)} failed:\n{process.stderr}")
+        return process.stdout
+
+    def measure(self, path):
+        """Bytes transferred for `path` and its /static/ assets by a browser accepting br"""
+        host = next((host for host in settings.ALLOWED_HOSTS if host not in ('*', '')
+                     and not host.startswith('.')), 'localhost')
+        client = Client(HTTP_HOST=host, HTTP_ACCEPT_ENCODING='br, gzip')
+        response = client.get(path, secure=True)
+        if response.status_code != 200:
+            raise CommandError(f'GET {path} returned {response.status_code}')
+        html_size = len(response.content)
+        html = response.content.decode()
+
+        local, third_party = [], 0
+        for tag in TAG_RE.findall(html):
+            if tag.lower().startswith('<link') and 'stylesheet' not in tag and 'icon' not in tag:
+                continue
+            for url in URL_RE.findall(tag):
+                if url.startswith(settings.STATIC_URL):
+                    local.append(url)
+                elif url.startswith(('http://', 'https://', '//')):
+                    third_party += 1
+
+        assets, immutable = {}, 0
+        for url in dict.fromkeys(local):
+            response = client.get(url, secure=True)
+            if response.status_code != 200:
+                raise CommandError(f'GET {url} returned {response.status_code}')
+            size = sum(len(chunk) for chunk in response.streaming_content)
+            kind = os.path.splitext(url.split('?')[0])[1].lstrip('.') or 'other'
+            count, total = assets.get(kind, (0, 0))
+            assets[kind] = (count + 1, total + size)
+            immutable += 'immutable' in response.get('Cache-Control', '')
+        return {
+            'html': html_size,
+            'assets': assets,
+            'total': html_size + sum(size for _, size in assets.values()),
+            'requests': 1 + sum(count for count, _ in assets.values()),
+            'immutable': immutable,
+            'third_party': third_party,
+        }
@@ -0,0 +1,107 @@
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# One `-X importtime` line; parent is the module whose import triggered this one
+Import = namedtuple('Import', 'name self_us cumulative_us depth parent')
+
+
+def parse_importtime(text):
+    """Imports listed in `python -X importtime` stderr, in the order they finished"""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    # A module is printed after everything it imported, indented 2 spaces per level,
+    # so its parent is the next less-indented line
+    imports, stack = [], []
+    for raw_name, self_us, cumulative_us in reversed(rows):
+        name = raw_name.lstrip()
+        depth = (len(raw_name) - len(name)) // 2
+        while stack and stack[-1].depth >= depth:
+            stack.pop()
+        entry = Import(name, self_us, cumulative_us, depth, stack[-1] if stack else None)
+        stack.append(entry)
+        imports.append(entry)
+    imports.reverse()
+    return imports
+
+
+def local_packages():
+    return {entry for entry in os.listdir(settings.BASE_DIR)
+            if os.path.isfile(os.path.join(settings.BASE_DIR, entry, '__init__.py'))}
+
+
+def importer(entry, local):
+    """Nearest project module above `entry` in the import chain"""
+    parent = entry.parent
+    while parent is not None and parent.name.split('.')[0] not in local:
+        parent = parent.parent
+    return parent.name if parent else '-'
+
+
+class Command(BaseCommand):
+    help = ('Run a management command under `python -X importtime` and report the most '
+            'expensive imports, which packages they belong to and what pulled them in')
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', nargs='*', default=['check'],
+                            help='Command line to profile (default: check)')
+        parser.add_argument('--top', type=int, default=20,
+                            help='Rows per table (default: 20)')
+
+    def handle(self, *args, **options):
+        command = [sys.executable, '-X', 'importtime', 'manage.py', *options['target']]
+        started = time.perf_counter()
+        result = subprocess.run(command, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        if result.returncode:
+            raise CommandError(f"`{' '.join(options['target'])}` failed:\n{result.stderr[-2000:]}")
+        imports = parse_importtime(result.stderr)
+        if not imports:
+            raise CommandError('No -X importtime output, was the interpreter started with -E?')
+
+        top = options['top']
+        local = local_packages()
+        total = sum(entry.cumulative_us for entry in imports if entry.depth == 0)
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"manage.py {' '.join(options['target'])}: {elapsed * 1000:.0f} ms wall, "
+            f'{total / 1000:.0f} ms importing {len(imports)} modules'))
+
+        packages = defaultdict(int)
+        for entry in imports:
+            packages[entry.name.split('.')[0]] += entry.self_us
+        self.stdout.write(self.style.MIGRATE_HEADING('By package (self time)'))
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            kind = 'project' if package in local else ''
+            self.stdout.write(f'  {self_us / 1000:8.1f} ms  {package} {kind}'.rstrip())
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            'Top-level imports: settings, app loading, urlconfs (cumulative)'))
+        roots = [entry for entry in imports if entry.depth == 0]
+        for entry in sorted(roots, key=lambda entry: -entry.cumulative_us)[:top]:
+            self.stdout.write(f'  {entry.cumulative_us / 1000:8.1f} ms  {entry.name}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            'Third-party imports made by project modules (cumulative)'))
+        pulled = [entry for entry in imports
+                  if entry.parent is not None and entry.name.split('.')[0] not in local
+                  and entry.parent.name.split('.')[0] in local]
+        for entry in sorted(pulled, key=lambda entry: -entry.cumulative_us)[:top]:
+            self.stdout.write(f'  {entry.cumulative_us / 1000:8.1f} ms  {entry.name:<45} '
+                              f'from {entry.parent.name}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Slowest modules (self time)'))
+        for entry in sorted(imports, key=lambda entry: -entry.self_us)[:top]:
+            self.stdout.write(f'  {entry.self_us / 1000:8.1f} ms  {entry.name:<45} '
+                              f'from {importer(entry, local)}')
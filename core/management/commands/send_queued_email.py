@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.utils.outbox import deliver
+
+
+class Command(BaseCommand):
+    help = 'Send queued OutboundEmail messages (the email outbox)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            help='Messages per SMTP connection (default: EMAIL_OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling instead of exiting once the outbox is drained')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds between polls with --loop (default: 5)')
+
+    def handle(self, *args, **options):
+        while True:
+            stats = deliver(options['batch_size'])
+            if stats or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Sent {stats['sent']} emails ({stats['retrying']} to retry, {stats['failed']} failed)"))
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
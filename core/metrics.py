@@ -0,0 +1,40 @@
+# core/metrics.py
+"""
+Runtime statistics exposed through core.views.metrics.
+
+Each collector returns a JSON-serialisable dict; register new ones in
+COLLECTORS so they show up on the metrics endpoint.
+"""
+from django.db import connections
+
+
+def db_pool_stats():
+    """psycopg pool size and wait-time counters per database alias"""
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            continue
+        pool_stats = pool.get_stats()
+        # Counters are cumulative since the pool opened; derive the mean wait
+        requests = pool_stats.get('requests_num', 0)
+        wait_ms = pool_stats.get('requests_wait_ms', 0)
+        pool_stats['requests_wait_ms_avg'] = round(
+            wait_ms / requests, 2) if requests else 0
+        stats[alias] = pool_stats
+    return stats
+
+
+def counter_stats():
+    from core.utils.counters import counters
+    return counters.stats()
+
+
+COLLECTORS = {
+    'db_pools': db_pool_stats,
+    'counters': counter_stats,
+}
+
+
+def collect():
+    return {name: collector() for name, collector in COLLECTORS.items()}
@@ -0,0 +1,147 @@
+# core/middleware.py
+import codecs
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import FileResponse
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .routers import end_request, replica_configured, start_request
+from .utils import htmlmin
+
+# CACHE/css/output.0123456789ab.css, as written by `manage.py compress`
+COMPRESSOR_BUNDLE_RE = re.compile(r'^CACHE/(?:css|js)/[^/]+\.[0-9a-f]{12}\.(?:css|js)$')
+
+# Cookie that keeps a client on the primary for a few seconds after it wrote,
+# so the redirect that follows a form POST does not hit a lagging replica
+PRIMARY_PIN_COOKIE = 'db_primary'
+
+# Pages that must always see fresh data
+PRIMARY_ONLY_PATHS = ('/admin/', '/ckeditor/')
+
+
+class ReplicaRoutingMiddleware:
+    """Decide per request whether reads may be served by the replica"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_configured():
+            return self.get_response(request)
+
+        token = start_request(self.use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = end_request(token)
+        return self.pin(response, wrote)
+
+    async def __acall__(self, request):
+        if not replica_configured():
+            return await self.get_response(request)
+
+        token = start_request(self.use_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = end_request(token)
+        return self.pin(response, wrote)
+
+    def use_replica(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and not request.path.startswith(PRIMARY_ONLY_PATHS)
+            and PRIMARY_PIN_COOKIE not in request.COOKIES
+        )
+
+    def pin(self, response, wrote):
+        if wrote:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE, '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can run on the event loop: the stock middleware is
+    sync-only, which would move every ASGI request onto a thread
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    def immutable_file_test(self, path, url):
+        # django-compressor bundles carry their content hash, but not in the
+        # form the manifest storage uses
+        return (super().immutable_file_test(path, url)
+                or bool(COMPRESSOR_BUNDLE_RE.match(url[len(self.static_prefix):])))
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class HtmlMinifyMiddleware:
+    """Strip comments and collapse whitespace in HTML pages (HTML_MINIFY)"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.minify(self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.minify(await self.get_response(request))
+
+    def minify(self, response):
+        if (not settings.HTML_MINIFY
+                or not response.get('Content-Type', '').startswith('text/html')
+                or response.has_header('Content-Encoding')
+                or isinstance(response, FileResponse)):
+            return response
+        if response.streaming:
+            if not response.is_async:
+                response.streaming_content = self.minify_chunks(
+                    response.streaming_content, response.charset)
+            return response
+        response.content = htmlmin.minify(response.content.decode(response.charset))
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        return response
+
+    def minify_chunks(self, chunks, charset):
+        decoder = codecs.getincrementaldecoder(charset)()
+        text = (decoder.decode(chunk) for chunk in chunks)
+        for minified in htmlmin.minify_stream(text):
+            yield minified.encode(charset)
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:38
+
+import core.storage
+import django_resized.forms
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.BigIntegerField()),
+                ('refcount', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('released_at', models.DateTimeField(blank=True, help_text='When the last reference was dropped', null=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='boardmember',
+            name='photo',
+            field=django_resized.forms.ResizedImageField(crop=None, force_format=None, keep_meta=True, quality=85, scale=None, size=[400, 400], storage=core.storage.get_blob_storage, upload_to='board/'),
+        ),
+        migrations.AlterField(
+            model_name='partner',
+            name='logo',
+            field=models.ImageField(storage=core.storage.get_blob_storage, upload_to='partners/'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_contact_id', models.PositiveBigIntegerField(default=0)),
+                ('last_application_id', models.PositiveBigIntegerField(default=0)),
+                ('contact_count', models.PositiveIntegerField(default=0)),
+                ('application_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:51
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_admindigest'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='admindigest',
+            name='last_application_id',
+        ),
+        migrations.RemoveField(
+            model_name='admindigest',
+            name='last_contact_id',
+        ),
+    ]
@@ -1,11 +1,20 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from ckeditor.fields import RichTextField
 from django_resized import ResizedImageField
 
-class SliderImage(models.Model):
+from core.storage import get_blob_storage
+from core.utils.images import DerivativeImagesMixin, ImageMetadataMixin
+
+class SliderImage(ImageMetadataMixin, DerivativeImagesMixin, models.Model):
     title = models.CharField(max_length=200)
     image = ResizedImageField(size=[1920, 1080], quality=90, upload_to='slider/')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_size = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     order = models.IntegerField(default=0)
@@ -23,16 +32,27 @@ class GuidingPrinciple(models.Model):
     class Meta:
         ordering = ['order']
 
-class Partner(models.Model):
+class Partner(ImageMetadataMixin, DerivativeImagesMixin, models.Model):
     name = models.CharField(max_length=200)
-    logo = models.ImageField(upload_to='partners/')
+    logo = models.ImageField(upload_to='partners/', storage=get_blob_storage)
+    logo_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    logo_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    logo_size = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    logo_color = models.CharField(max_length=7, blank=True, editable=False)
+    logo_placeholder = models.TextField(blank=True, editable=False)
     website = models.URLField(blank=True)
     is_active = models.BooleanField(default=True)
 
-class BoardMember(models.Model):
+class BoardMember(ImageMetadataMixin, DerivativeImagesMixin, models.Model):
     name = models.CharField(max_length=200)
     position = models.CharField(max_length=200)
-    photo = ResizedImageField(size=[400, 400], quality=85, upload_to='board/')
+    photo = ResizedImageField(size=[400, 400], quality=85, upload_to='board/',
+                              storage=get_blob_storage)
+    photo_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    photo_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    photo_size = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    photo_color = models.CharField(max_length=7, blank=True, editable=False)
+    photo_placeholder = models.TextField(blank=True, editable=False)
     bio = RichTextField()
     order = models.IntegerField(default=0)
     
@@ -46,4 +66,61 @@ class Strategy(models.Model):
     order = models.IntegerField(default=0)
     
     class Meta:
-        ordering = ['order']
\ No newline at end of file
+        ordering = ['order']
+
+
+class MediaBlob(models.Model):
+    """Reference count for a file in the content-addressed media storage"""
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    released_at = models.DateTimeField(null=True, blank=True,
+                                       help_text="When the last reference was dropped")
+
+    def __str__(self):
+        return self.name
+
+
+class OutboundEmail(models.Model):
+    """Rendered email waiting for send_queued_email (the outbox)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list, blank=True)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now,
+                                           help_text="Also pushed forward while a worker holds it")
+    claimed_by = models.CharField(max_length=32, blank=True, editable=False)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)}"
+
+
+class AdminDigest(models.Model):
+    """A summary email of new contact messages and applications (digest mode)"""
+    created_at = models.DateTimeField(auto_now_add=True)
+    contact_count = models.PositiveIntegerField(default=0)
+    application_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Digest {self.created_at:%Y-%m-%d %H:%M}: {self.application_count} applications, {self.contact_count} messages"
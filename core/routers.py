@@ -0,0 +1,84 @@
+# core/routers.py
+"""
+Primary/replica database routing.
+
+Reads go to the ``replica`` alias only inside requests that
+``core.middleware.ReplicaRoutingMiddleware`` marked as replica-safe (public
+GET/HEAD pages). The first write of a request pins the rest of it to the
+primary, so a view always reads what it has just written. Writes the
+request never reads back (view tracking) can opt out with unpinned_writes().
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+
+# None outside of a request: management commands and shells use the primary
+_request_state = ContextVar('db_routing_state', default=None)
+
+
+def start_request(use_replica):
+    """Open a routing scope for one request, returns a token for end_request()"""
+    return _request_state.set({'use_replica': use_replica, 'wrote': False, 'pin': True})
+
+
+def end_request(token):
+    """Close the routing scope, returns True if the request wrote anything"""
+    state = _request_state.get()
+    _request_state.reset(token)
+    return bool(state and state['wrote'])
+
+
+def current_routing():
+    """Whether the current request reads from the replica, None outside of a request"""
+    state = _request_state.get()
+    return None if state is None else state['use_replica']
+
+
+def pin_to_primary():
+    """Send every remaining query of the current request to the primary"""
+    state = _request_state.get()
+    if state is not None:
+        state['use_replica'] = False
+        state['wrote'] = True
+
+
+@contextmanager
+def unpinned_writes():
+    """Writes inside the block go to the primary without pinning the request"""
+    state = _request_state.get()
+    token = _request_state.set(state and {**state, 'pin': False})
+    try:
+        yield
+    finally:
+        _request_state.reset(token)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in connections.settings
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state and state['use_replica'] and replica_configured():
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is None or state['pin']:
+            pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema through replication
+        return db == DEFAULT_DB_ALIAS
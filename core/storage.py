@@ -0,0 +1,242 @@
+"""
+Content-addressed media storage.
+
+Files are stored once per distinct content under
+``MEDIA_BLOB_DIR/<aa>/<bb>/<sha256><ext>``: re-uploading the same logo or
+photo returns the existing name instead of writing another copy. The name
+changes whenever the content does, so blob URLs can be cached forever.
+
+Every save adds a reference and every delete (including the ones
+django_cleanup issues when a file is replaced or its row deleted) removes
+one; a blob whose count drops to zero stays on disk until the
+``gc_media_blobs`` command confirms nothing references it any more.
+"""
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.functional import LazyObject
+
+HASH_CHUNK = 64 * 1024
+# Canonical extension per format so .jpeg and .JPG uploads share a blob
+EXTENSION_ALIASES = {'.jpeg': '.jpg', '.jpe': '.jpg', '.tif': '.tiff'}
+
+
+def _blob_model():
+    from core.models import MediaBlob
+    return MediaBlob
+
+
+def is_derived_name(name):
+    """CKEditor stores thumbnails under a name computed from the original"""
+    return posixpath.splitext(name)[0].endswith('_thumb')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def blob_name(self, digest, name):
+        ext = posixpath.splitext(name)[1].lower()
+        ext = EXTENSION_ALIASES.get(ext, ext)
+        return posixpath.join(settings.MEDIA_BLOB_DIR, digest[:2], digest[2:4], digest + ext)
+
+    def is_blob(self, name):
+        return name.startswith(settings.MEDIA_BLOB_DIR.rstrip('/') + '/') and not is_derived_name(name)
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content, see _save()
+        return name
+
+    def _save(self, name, content):
+        if is_derived_name(name):
+            if self.exists(name):
+                return name
+            return super()._save(name, content)
+
+        directory = os.path.join(self.location, settings.MEDIA_BLOB_DIR)
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.upload')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks(HASH_CHUNK):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(chunk)
+
+            name = self.blob_name(digest.hexdigest(), name)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.unlink(tmp)
+                # Fresh mtime: the garbage collector's grace period restarts
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.chmod(tmp, self.file_permissions_mode or 0o644)
+                # Atomic: a concurrent upload of the same bytes just replaces it
+                os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        self._add_reference(name, size)
+        return name
+
+    def _add_reference(self, name, size):
+        MediaBlob = _blob_model()
+        changes = {'refcount': F('refcount') + 1, 'released_at': None}
+        if MediaBlob.objects.filter(name=name).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.create(name=name, size=size, refcount=1)
+        except IntegrityError:
+            MediaBlob.objects.filter(name=name).update(**changes)
+
+    def delete(self, name):
+        if not name or not self.is_blob(name):
+            return super().delete(name)
+        MediaBlob = _blob_model()
+        # The file stays until gc_media_blobs; another row may still use it
+        if not MediaBlob.objects.filter(name=name, refcount__gt=1).update(
+                refcount=F('refcount') - 1):
+            MediaBlob.objects.filter(name=name).update(refcount=0, released_at=timezone.now())
+
+    @property
+    def derived_storage(self):
+        """Where files computed from a blob (resized copies...) are written"""
+        return plain_storage
+
+    def is_referenced(self, name):
+        """Whether some row still holds a reference to `name`"""
+        if not self.is_blob(name):
+            return self.exists(name)
+        return _blob_model().objects.filter(name=name, refcount__gt=0).exists()
+
+    def purge(self, name):
+        """Remove a blob from disk for good (garbage collection)"""
+        super().delete(name)
+        thumb = '{}_thumb{}'.format(*posixpath.splitext(name))
+        if self.exists(thumb):
+            super().delete(thumb)
+
+
+plain_storage = FileSystemStorage()
+
+
+class BlobStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage()
+
+
+blob_storage = BlobStorage()
+
+
+def get_blob_storage():
+    """Storage callable for FileFields, keeps the instance out of migrations"""
+    return blob_storage
+
+
+def count_references():
+    """
+    Count blob references by scanning the database: file fields holding a
+    blob name and rich text embedding blob URLs (editor uploads).
+    """
+    prefix = settings.MEDIA_BLOB_DIR.rstrip('/') + '/'
+    pattern = re.compile(re.escape(prefix) + r'[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(?:\.\w+)?')
+    counts = Counter()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                values = model._default_manager.filter(
+                    **{f'{field.name}__startswith': prefix}).values_list(field.name, flat=True)
+                counts.update(values.iterator())
+            elif isinstance(field, models.TextField):
+                values = model._default_manager.filter(
+                    **{f'{field.name}__contains': prefix}).values_list(field.name, flat=True)
+                for text in values.iterator():
+                    counts.update(set(pattern.findall(text)))
+    return counts
+
+
+def collect_garbage(grace_hours=None, dry_run=False):
+    """
+    Recount references from the database, then delete blobs that have been
+    unreferenced for longer than the grace period. The grace period covers
+    uploads whose transaction has not committed yet and editor uploads not
+    yet saved into any content; run it off-peak all the same.
+    """
+    from core.utils.images import delete_derivatives
+    from core.utils.resize import purge_cached
+
+    MediaBlob = _blob_model()
+    grace = settings.MEDIA_BLOB_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    now = timezone.now()
+    cutoff = now - timedelta(hours=grace)
+    counts = count_references()
+    stats = Counter()
+
+    known = set()
+    for blob in MediaBlob.objects.iterator():
+        known.add(blob.name)
+        references = counts.get(blob.name, 0)
+        if references:
+            released_at = None
+        else:
+            released_at = blob.released_at if blob.refcount == 0 and blob.released_at else now
+        if (references, released_at) == (blob.refcount, blob.released_at):
+            continue
+        stats['recounted'] += 1
+        if not dry_run:
+            # Conditional: leave rows alone that an upload touched since the scan
+            MediaBlob.objects.filter(pk=blob.pk, refcount=blob.refcount).update(
+                refcount=references, released_at=released_at)
+
+    doomed = list(MediaBlob.objects.filter(
+        refcount=0, released_at__lt=cutoff).values_list('name', 'size'))
+
+    # Files without a row: uploads whose transaction rolled back
+    root = blob_storage.path(settings.MEDIA_BLOB_DIR)
+    expires = time.time() - grace * 3600
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = posixpath.join(settings.MEDIA_BLOB_DIR, os.path.relpath(
+                path, root).replace(os.sep, '/'))
+            if (is_derived_name(name) or name in known or name in counts
+                    or os.path.getmtime(path) >= expires):
+                continue
+            if filename.endswith('.upload'):
+                if not dry_run:
+                    os.unlink(path)
+                continue
+            doomed.append((name, os.path.getsize(path)))
+
+    for name, size in doomed:
+        if not dry_run:
+            # Only if nobody re-uploaded the same bytes since the recount
+            if name in known:
+                if not MediaBlob.objects.filter(name=name, refcount=0).delete()[0]:
+                    continue
+            elif MediaBlob.objects.filter(name=name).exists():
+                continue
+            blob_storage.purge(name)
+            delete_derivatives(blob_storage, name)
+            purge_cached(name)
+        stats['deleted'] += 1
+        stats['bytes'] += size
+    stats['blobs'] = len(known)
+    return stats
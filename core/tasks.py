@@ -0,0 +1,15 @@
+from taskqueue.decorators import task
+
+from core.utils import digest, outbox
+
+
+@task(max_attempts=1, unique=True)
+def deliver_outbox():
+    """Send queued email as soon as a worker is free; send_queued_email retries the rest"""
+    outbox.deliver()
+
+
+@task(unique=True)
+def send_admin_digest():
+    """Summarise new contact messages and applications for ADMIN_EMAIL"""
+    digest.send_digest()
@@ -0,0 +1,31 @@
+from django import template
+from django.apps import apps
+
+register = template.Library()
+
+
+class PassthroughNode(template.Node):
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def render(self, context):
+        return self.nodelist.render(context)
+
+
+@register.tag
+def compress(parser, token):
+    """
+    django-compressor's {% compress %}, loaded only while it is installed.
+
+        {% load assets %}
+        {% compress css %}<link rel="stylesheet" href="{% static 'css/theme.css' %}">{% endcompress %}
+
+    COMPRESS_ENABLED adds compressor to INSTALLED_APPS. Without it, the
+    enclosed tags render unchanged and compressor is never imported.
+    """
+    if apps.is_installed('compressor'):
+        from compressor.templatetags.compress import compress as compressor_compress
+        return compressor_compress(parser, token)
+    nodelist = parser.parse(('endcompress',))
+    parser.delete_first_token()
+    return PassthroughNode(nodelist)
@@ -0,0 +1,82 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from core.utils import resize
+from core.utils.images import ENCODERS, get_manifest, stored_metadata
+
+register = template.Library()
+
+
+def _srcset(storage, sources):
+    return ', '.join(f'{storage.url(name)} {width}w'
+                     for width, name in sorted(sources.items(), key=lambda item: int(item[0])))
+
+
+def _attrs(attrs):
+    return format_html_join('', ' {}="{}"', (
+        (key.replace('_', '-'), value) for key, value in attrs.items()
+        if value is not None and value is not False))
+
+
+@register.simple_tag
+def responsive_image(field_file, size, sizes=None, **attrs):
+    """
+    <picture> with AVIF/WebP sources and a JPEG/PNG <img> fallback.
+
+        {% responsive_image post.featured_image 'card' sizes='(min-width: 768px) 33vw, 100vw' alt=post.title class='w-full' %}
+
+    `size` names one of the field's IMAGE_DERIVATIVES widths: it picks the
+    fallback `src` and the width/height attributes. Until derivatives exist
+    the original is rendered as a plain <img>, sized from the stored
+    metadata. Opaque images get their blurred placeholder as background.
+    """
+    if not field_file:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    metadata = stored_metadata(field_file)
+    if metadata and metadata['placeholder']:
+        attrs.setdefault('style', 'background:{} url({}) center/cover no-repeat'.format(
+            metadata['color'], metadata['placeholder']))
+    manifest = get_manifest(field_file)
+    if not manifest or size not in manifest['sizes']:
+        if metadata:
+            attrs.setdefault('width', metadata['width'])
+            attrs.setdefault('height', metadata['height'])
+        return format_html('<img src="{}"{}>', field_file.url, _attrs(attrs))
+
+    storage = getattr(field_file.storage, 'derived_storage', field_file.storage)
+    width = manifest['sizes'][size]
+    height = round(manifest['height'] * width / manifest['width'])
+    sizes = sizes or f'(max-width: {width}px) 100vw, {width}px'
+    fallback = manifest['fallback']
+
+    sources = format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', (
+        (ENCODERS[fmt]['mime'], _srcset(storage, widths), sizes)
+        for fmt, widths in manifest['sources'].items() if fmt != fallback))
+    fallback_sources = manifest['sources'][fallback]
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}"{}></picture>',
+        sources, storage.url(fallback_sources[str(width)]),
+        _srcset(storage, fallback_sources), sizes, width, height, _attrs(attrs))
+
+
+@register.simple_tag
+def resized_url(image, size):
+    """Signed /img/ URL for a stored image or media path at an IMAGE_RESIZE_SIZES size"""
+    if not image:
+        return ''
+    return resize.resize_url(getattr(image, 'name', image), size)
+
+
+@register.filter
+def image_metadata(field_file):
+    """Stored width, height, size, color and placeholder of an image, or None"""
+    return stored_metadata(field_file) if field_file else None
+
+
+@register.filter
+def responsive_content(html):
+    """srcset and lazy loading for media images embedded in rich text"""
+    return mark_safe(resize.responsive_content(str(html)))
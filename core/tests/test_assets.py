@@ -0,0 +1,46 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from core.middleware import StaticFilesMiddleware
+
+BLOCK = ("{% load assets %}{% compress css %}"
+         "<link rel=\"stylesheet\" href=\"/static/css/theme.css\">{% endcompress %}")
+
+
+class CompressTagTests(SimpleTestCase):
+    def test_tags_render_unchanged_without_compressor(self):
+        self.assertNotIn('compressor', settings.INSTALLED_APPS)
+        self.assertEqual(Template(BLOCK).render(Context()),
+                         '<link rel="stylesheet" href="/static/css/theme.css">')
+
+    def test_compressor_handles_the_block_when_installed(self):
+        from compressor.templatetags.compress import CompressorNode
+
+        with override_settings(INSTALLED_APPS=[*settings.INSTALLED_APPS, 'compressor']):
+            nodes = Template(BLOCK).nodelist
+        self.assertIsInstance(nodes[-1], CompressorNode)
+
+
+class StaticAssetTests(SimpleTestCase):
+    def test_bundles_and_hashed_files_are_immutable(self):
+        middleware = StaticFilesMiddleware(lambda request: None)
+        self.assertTrue(middleware.immutable_file_test(
+            None, '/static/CACHE/css/output.0123456789ab.css'))
+        self.assertFalse(middleware.immutable_file_test(None, '/static/CACHE/manifest.json'))
+        self.assertFalse(middleware.immutable_file_test(None, '/static/css/theme.css'))
+
+    def test_bundles_are_saved_with_compressed_copies(self):
+        from core.utils.assets import PrecompressedStorage
+
+        with tempfile.TemporaryDirectory() as root:
+            storage = PrecompressedStorage(location=root, base_url='/static/')
+            storage.save('CACHE/css/output.0123456789ab.css',
+                         ContentFile(b'.card { margin: 0; }\n' * 200))
+            written = sorted(os.listdir(os.path.join(root, 'CACHE', 'css')))
+        self.assertEqual(written, ['output.0123456789ab.css', 'output.0123456789ab.css.br',
+                                   'output.0123456789ab.css.gz'])
@@ -0,0 +1,83 @@
+import re
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import include, path
+from django.utils import timezone
+
+from blog import views as blog_views
+from blog.models import Post, PostView
+from core import views as core_views
+from publications import views as publication_views
+from publications.models import Publication, PublicationCategory
+
+# The async variants in front of the regular URLconf (EIP/asgi.py sets ASYNC_VIEWS)
+urlpatterns = [
+    path('', core_views.AsyncHomeView.as_view()),
+    path('blog/', blog_views.AsyncPostListView.as_view()),
+    path('blog/<slug:slug>/', blog_views.AsyncPostDetailView.as_view()),
+    path('publications/', publication_views.AsyncPublicationListView.as_view()),
+    path('', include('EIP.urls')),
+]
+
+
+def page(response):
+    # CSRF tokens are masked differently on every render
+    return re.sub(rb'name="csrfmiddlewaretoken" value="\w+"', b'', response.content)
+
+
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        published = timezone.now() - timedelta(days=1)
+        cls.posts = [Post.objects.create(
+            title=f'Water project {index}', excerpt='Excerpt', content='<p>Body</p>',
+            post_type='news', status='published', published_date=published - timedelta(hours=index))
+            for index in range(12)]
+        Post.objects.create(title='Draft', excerpt='e', content='c', status='draft')
+        category = PublicationCategory.objects.create(name='Reports', slug='reports')
+        for index in range(3):
+            Publication.objects.create(title=f'Report {index}', slug=f'report-{index}',
+                                       description='d', category=category,
+                                       file=f'publications/report-{index}.pdf')
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    async def fetch(self, url):
+        """The same page from the sync and the async view"""
+        sync = await self.async_client.get(url)
+        self.assertFalse(sync.resolver_match.func.view_class.view_is_async)
+        # The async views fill the home page cache themselves
+        await cache.aclear()
+        with override_settings(ROOT_URLCONF='core.tests.test_async_views'):
+            asynchronous = await self.async_client.get(url)
+            self.assertTrue(asynchronous.resolver_match.func.view_class.view_is_async)
+        return sync, asynchronous
+
+    async def test_pages_match_the_sync_views(self):
+        for url in ['/', '/blog/', '/blog/?page=2', '/blog/?type=news&q=project',
+                    '/publications/', '/publications/?category=reports']:
+            with self.subTest(url=url):
+                sync, asynchronous = await self.fetch(url)
+                self.assertEqual(sync.status_code, 200)
+                self.assertEqual(asynchronous.status_code, 200)
+                self.assertEqual(page(sync), page(asynchronous))
+
+    async def test_list_pagination_errors(self):
+        for url in ['/blog/?page=9', '/publications/?category=missing']:
+            with self.subTest(url=url):
+                sync, asynchronous = await self.fetch(url)
+                self.assertEqual((sync.status_code, asynchronous.status_code), (404, 404))
+
+    async def test_detail_counts_the_view(self):
+        post = self.posts[0]
+        with override_settings(ROOT_URLCONF='core.tests.test_async_views'):
+            response = await self.async_client.get(f'/blog/{post.slug}/', headers={'referer': 'https://example.org/'})
+            self.assertContains(response, post.title)
+            self.assertEqual(response.context['post'].views, 1)
+            self.assertEqual(len(response.context['related_posts']), 0)
+            self.assertEqual((await self.async_client.get('/blog/draft/')).status_code, 404)
+        self.assertEqual(await PostView.objects.filter(post=post, referer='https://example.org/').acount(), 1)
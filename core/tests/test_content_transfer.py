@@ -0,0 +1,136 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from PIL import Image
+
+from blog.models import Category, Post, Tag
+from publications.models import Publication, PublicationCategory
+from vacancies.models import Vacancy
+
+
+class ContentTransferTests(TestCase):
+    def write_jsonl(self, records):
+        handle = tempfile.NamedTemporaryFile(
+            'w', suffix='.jsonl', delete=False, encoding='utf-8')
+        with handle:
+            for record in records:
+                handle.write(json.dumps(record) + '\n')
+        self.addCleanup(os.unlink, handle.name)
+        return handle.name
+
+    def test_import_creates_objects_and_relations_in_batches(self):
+        Category.objects.create(name='News')
+        records = [
+            {'model': 'blog.post', 'fields': {
+                'title': 'Town Hall', 'excerpt': 'e', 'content': 'c',
+                'status': 'published', 'created_date': '2021-03-01T10:00:00Z',
+                'categories': ['News', 'Peacebuilding'], 'tags': ['Oromia'],
+            }}
+            for _ in range(5)
+        ]
+        records.append({'model': 'publications.publication', 'fields': {
+            'title': 'Annual Report', 'description': 'd',
+            'category': 'Reports', 'file': 'publications/report.pdf',
+            'cover_image': 'publication_covers/report.jpg',
+            'published_date': '2020-01-15',
+        }})
+        records.append({'model': 'vacancies.vacancy', 'fields': {
+            'title': 'Officer', 'description': 'd', 'requirements': 'r',
+            'responsibilities': 'r', 'job_type': 'contract',
+            'location': 'Addis Ababa', 'deadline': '2030-01-01',
+        }})
+
+        out = StringIO()
+        call_command('import_content', self.write_jsonl(records),
+                     batch_size=2, stdout=out)
+
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertEqual(
+            sorted(Post.objects.values_list('slug', flat=True)),
+            ['town-hall', 'town-hall-1', 'town-hall-2', 'town-hall-3', 'town-hall-4'])
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(Tag.objects.count(), 1)
+        post = Post.objects.get(slug='town-hall')
+        self.assertEqual(post.categories.count(), 2)
+        self.assertEqual(post.created_date.year, 2021)
+        self.assertIsNotNone(post.published_date)
+
+        publication = Publication.objects.get()
+        self.assertEqual(publication.slug, 'annual-report')
+        self.assertEqual(publication.category,
+                         PublicationCategory.objects.get(slug='reports'))
+        self.assertEqual(publication.published_date, date(2020, 1, 15))
+        self.assertEqual(Vacancy.objects.get().slug, 'officer')
+        self.assertIn('Imported 7 objects', out.getvalue())
+
+    def test_reimporting_an_export_skips_existing_slugs(self):
+        post = Post.objects.create(title='Report', excerpt='e', content='c')
+        post.tags.add(Tag.objects.create(name='Climate'))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'content.jsonl')
+            call_command('export_content', output=path, stderr=StringIO())
+            with open(path, encoding='utf-8') as fh:
+                exported = [json.loads(line) for line in fh]
+            call_command('import_content', path, stdout=StringIO())
+
+        self.assertEqual(exported[0]['fields']['tags'], ['Climate'])
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_media_files_are_copied_from_source(self):
+        with tempfile.TemporaryDirectory() as source, \
+                tempfile.TemporaryDirectory() as media_root:
+            os.makedirs(os.path.join(source, 'posts', 'featured'))
+            Image.new('RGB', (40, 20)).save(os.path.join(source, 'posts', 'featured', 'a.jpg'))
+            path = self.write_jsonl([{'model': 'blog.post', 'fields': {
+                'title': 'With image', 'excerpt': 'e', 'content': 'c',
+                'featured_image': 'posts/featured/a.jpg',
+            }}])
+
+            with self.settings(MEDIA_ROOT=media_root):
+                call_command('import_content', path,
+                             media_source=source, stdout=StringIO())
+
+            self.assertTrue(os.path.exists(
+                os.path.join(media_root, 'posts', 'featured', 'a.jpg')))
+
+    def test_imported_files_get_what_save_would_schedule(self):
+        with tempfile.TemporaryDirectory() as source, \
+                tempfile.TemporaryDirectory() as media_root:
+            for name in ['posts/featured/a.jpg', 'publication_covers/report.jpg']:
+                os.makedirs(os.path.dirname(os.path.join(source, name)), exist_ok=True)
+                Image.new('RGB', (300, 200), (200, 40, 40)).save(os.path.join(source, name))
+            with open(os.path.join(source, 'report.pdf'), 'wb') as fh:
+                fh.write(b'%PDF-1.4')
+            path = self.write_jsonl([
+                {'model': 'blog.post', 'fields': {
+                    'title': 'With image', 'excerpt': 'e', 'content': 'c',
+                    'featured_image': 'posts/featured/a.jpg',
+                }},
+                {'model': 'publications.publication', 'fields': {
+                    'title': 'Annual Report', 'description': 'd', 'category': 'Reports',
+                    'file': 'report.pdf', 'cover_image': 'publication_covers/report.jpg',
+                }},
+            ])
+
+            out = StringIO()
+            with self.settings(MEDIA_ROOT=media_root), \
+                    mock.patch('core.utils.content_transfer.schedule_derivatives') as derivatives, \
+                    mock.patch('publications.ingest.schedule') as ingest:
+                call_command('import_content', path, batch_size=1,
+                             media_source=source, stdout=out)
+
+        self.assertIn('media: copied=3', out.getvalue())
+        post = Post.objects.get()
+        self.assertEqual((post.featured_image_width, post.featured_image_height), (300, 200))
+        publication = Publication.objects.get()
+        self.assertEqual(publication.cover_image_width, 300)
+        self.assertEqual(sorted(call.args[1] for call in derivatives.call_args_list),
+                         ['posts/featured/a.jpg', 'publication_covers/report.jpg'])
+        ingest.assert_called_once_with(publication)
@@ -0,0 +1,24 @@
+import os
+import sqlite3
+import tempfile
+
+from django.test import SimpleTestCase
+
+from EIP.db import sqlite_init_pragmas, sqlite_options
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    def test_options_use_immediate_transactions(self):
+        options = sqlite_options()
+        self.assertEqual(options['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('PRAGMA journal_mode=WAL', options['init_command'])
+
+    def test_pragmas_apply_to_a_file_database(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = sqlite3.connect(os.path.join(tmp, 'db.sqlite3'))
+            for pragma in sqlite_init_pragmas():
+                conn.execute(pragma)
+            self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 1)
+            self.assertEqual(conn.execute('PRAGMA busy_timeout').fetchone()[0], 5000)
+            conn.close()
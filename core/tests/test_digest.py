@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from contacts.models import ContactMessage
+from core.models import AdminDigest, OutboundEmail
+from core.utils import digest, email
+from taskqueue.models import Task
+from vacancies.models import Application, Vacancy
+
+
+@override_settings(ADMIN_NOTIFICATION_MODE='digest', ADMIN_DIGEST_INTERVAL=30,
+                   SITE_URL='https://eipethiopia.org')
+class AdminDigestTests(TestCase):
+    def setUp(self):
+        self.vacancies = [Vacancy.objects.create(
+            title=title, slug=title.lower(), description='d', requirements='r',
+            responsibilities='r', job_type='full-time', location='Addis Ababa',
+            deadline=date(2030, 1, day)) for day, title in [(31, 'Accountant'), (15, 'Driver')]]
+
+    def apply(self, vacancy, name, **fields):
+        application = Application.objects.create(
+            **fields, vacancy=vacancy, full_name=name, email=f'{name.lower()}@example.org',
+            phone='0911', cover_letter='c', resume='applications/resumes/cv.pdf')
+        email.send_application_notification(application)
+        return application
+
+    def contact(self, subject):
+        message = ContactMessage.objects.create(
+            name='Hana', email='hana@example.org', subject=subject, message='m')
+        email.send_contact_notification(message)
+        return message
+
+    def test_submissions_schedule_one_digest(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.apply(self.vacancies[0], 'Abebe')
+            self.contact('Partnership')
+        self.assertFalse(OutboundEmail.objects.exists())
+        scheduled = Task.objects.get(name='core.tasks.send_admin_digest')
+        self.assertAlmostEqual(scheduled.run_after, timezone.now() + timedelta(minutes=30),
+                               delta=timedelta(seconds=5))
+
+    def test_digest_groups_applications_by_vacancy(self):
+        for name in ['Abebe', 'Sara', 'Yonas']:
+            self.apply(self.vacancies[0], name)
+        self.apply(self.vacancies[1], 'Meron')
+        self.contact('Partnership')
+
+        sent = digest.send_digest()
+        self.assertEqual((sent.application_count, sent.contact_count), (4, 1))
+        # The contact messages plus one aggregate over all applications
+        with self.assertNumQueries(2):
+            contacts, vacancies = digest.collect(sent)
+        self.assertEqual([(v['vacancy__title'], v['count']) for v in vacancies],
+                         [('Driver', 1), ('Accountant', 3)])
+
+        message = OutboundEmail.objects.get()
+        self.assertEqual(message.subject, 'Website digest: 4 applications, 1 messages')
+        self.assertEqual(message.to, ['admin@eipethiopia.org'])
+        self.assertRegex(message.body, r'(?s)Driver: 1 new.*Accountant: 3 new')
+        self.assertIn(f'/admin/vacancies/application/?vacancy__id__exact={self.vacancies[0].pk}',
+                      message.html_body)
+        self.assertIn('Partnership', message.html_body)
+
+    def test_next_digest_starts_after_the_last(self):
+        self.apply(self.vacancies[0], 'Abebe')
+        digest.send_digest()
+        self.assertIsNone(digest.send_digest())
+
+        self.apply(self.vacancies[1], 'Meron')
+        latest = digest.send_digest()
+        self.assertEqual((latest.application_count, latest.contact_count), (1, 0))
+        self.assertEqual(AdminDigest.objects.count(), 2)
+        self.assertIn('Driver: 1 new', OutboundEmail.objects.latest('pk').body)
+
+    def test_rows_committed_out_of_order_are_not_skipped(self):
+        self.apply(self.vacancies[0], 'Abebe', pk=100)
+        digest.send_digest()
+
+        # A transaction that took a lower id commits after the digest ran
+        self.apply(self.vacancies[1], 'Meron', pk=50)
+        latest = digest.send_digest()
+        self.assertEqual(latest.application_count, 1)
+        self.assertEqual(Application.objects.get(pk=50).digest, latest)
+
+    @override_settings(ADMIN_NOTIFICATION_MODE='immediate')
+    def test_immediate_mode_emails_each_submission(self):
+        self.apply(self.vacancies[0], 'Abebe')
+        self.contact('Partnership')
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+        self.assertFalse(Task.objects.filter(name='core.tasks.send_admin_digest').exists())
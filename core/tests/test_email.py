@@ -0,0 +1,59 @@
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import checks
+from core.models import OutboundEmail
+from core.utils import email
+from vacancies.models import Application, Vacancy
+
+
+class EmailTemplateTests(SimpleTestCase):
+    def setUp(self):
+        email._compiled.clear()
+
+    def test_text_part_comes_from_its_own_template(self):
+        html, text = email.render_email('contact_auto_reply', {
+            'name': 'Tom & Jerry', 'subject': 'Visit', 'message': 'Hello <there>'})
+        self.assertIn('Tom &amp; Jerry', html)
+        self.assertIn('Dear Tom & Jerry,', text)
+        self.assertIn('Hello <there>', text)
+        self.assertNotIn('<p>', text)
+        self.assertIn('- Latest News & Blog: https://eipethiopia.org/blog/', text)
+
+    def test_templates_are_compiled_once(self):
+        with mock.patch.object(email, 'get_template', wraps=email.get_template) as get_template:
+            for _ in range(3):
+                email.render_email('contact_notification', {'name': 'n'})
+        self.assertEqual(get_template.call_count, 2)
+
+    def test_check_reports_missing_templates(self):
+        self.assertEqual(checks.check_email_templates(None), [])
+        with override_settings(TEMPLATES=[{
+                'BACKEND': 'django.template.backends.django.DjangoTemplates',
+                'DIRS': [tempfile.gettempdir()]}]):
+            errors = checks.check_email_templates(None)
+        self.assertEqual(len(errors), len(email.EMAIL_TEMPLATES))
+        self.assertEqual({error.id for error in errors}, {'core.E001'})
+
+
+class ApplicationEmailTests(TestCase):
+    def test_confirmation_is_queued(self):
+        vacancy = Vacancy.objects.create(
+            title='Programme Officer', slug='po', description='d', requirements='r',
+            responsibilities='r', job_type='full-time', location='Addis Ababa',
+            deadline=date(2030, 1, 31))
+        application = Application.objects.create(
+            vacancy=vacancy, full_name='Abebe Kebede', email='abebe@example.org',
+            phone='0911', cover_letter='c', resume='applications/resumes/cv.pdf')
+        email.send_application_confirmation(application)
+        email.send_application_notification(application)
+
+        confirmation, notification = OutboundEmail.objects.order_by('pk')
+        self.assertEqual(confirmation.to, ['abebe@example.org'])
+        self.assertIn('Application deadline: January 31, 2030', confirmation.body)
+        self.assertIn(f'Resume/CV: {settings.SITE_URL}/media/applications/resumes/cv.pdf',
+                      notification.body)
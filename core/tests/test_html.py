@@ -0,0 +1,133 @@
+import re
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.messages import constants
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+from core.utils import htmlmin
+from core.utils.streaming import stream_response
+
+PAGE = """<!DOCTYPE html>
+<html>
+  <head>
+    <!-- Styles -->
+    <!--[if lt IE 9]><script src="html5shiv.js"></script><![endif]-->
+    <style>
+      body  {  margin: 0; }
+    </style>
+  </head>
+  <body>
+    <p>Water   points <b>finished</b>  <i>today</i></p>
+    <a title="Water  points > 2"   data-note='two  spaces'
+       href="/">Home</a>
+    <input name="q" value="  padded  ">
+    <pre>
+  indented    code
+    </pre>
+    <textarea name="note">  keep  this  </textarea>
+    <script>
+      // comment  kept
+      var  x = "<!-- not a comment -->";
+    </script>
+  </body>
+</html>
+"""
+
+
+class MinifyTests(SimpleTestCase):
+    def setUp(self):
+        htmlmin.cache.clear()
+
+    def test_strips_comments_and_collapses_whitespace(self):
+        html = htmlmin.minify(PAGE)
+        self.assertNotIn('Styles', html)
+        self.assertIn('<p>Water points <b>finished</b> <i>today</i></p>', html)
+        self.assertNotIn('\n  ', html.split('<style>')[0])
+        for kept in ('<!--[if lt IE 9]><script src="html5shiv.js"></script><![endif]-->',
+                     '<pre>\n  indented    code\n    </pre>',
+                     '<textarea name="note">  keep  this  </textarea>',
+                     '      // comment  kept\n      var  x = "<!-- not a comment -->";',
+                     '      body  {  margin: 0; }'):
+            self.assertIn(kept, html)
+
+    def test_attribute_values_are_left_alone(self):
+        html = htmlmin.minify(PAGE)
+        self.assertIn('<a title="Water  points > 2" data-note=\'two  spaces\'\nhref="/">Home</a>',
+                      html)
+        self.assertIn('<input name="q" value="  padded  ">', html)
+
+    def test_unclosed_block_is_left_alone(self):
+        self.assertEqual(htmlmin.minify('<p>a  b</p>  <script>var  x'), '<p>a b</p> <script>var  x')
+
+    def test_stream_matches_whole_page_for_any_chunking(self):
+        expected = htmlmin.minify(PAGE)
+        for size in range(1, 40):
+            chunks = [PAGE[start:start + size] for start in range(0, len(PAGE), size)]
+            self.assertEqual(''.join(htmlmin.minify_stream(chunks)), expected, size)
+
+    @override_settings(HTML_MINIFY_CACHE_SIZE=2)
+    def test_minified_pages_are_cached(self):
+        with mock.patch.object(htmlmin, '_minify', wraps=htmlmin._minify) as minify:
+            for html in (PAGE, PAGE, '<p>a</p>', '<p>b</p>', PAGE):
+                htmlmin.minify(html)
+        # PAGE was evicted by the two later pages
+        self.assertEqual(minify.call_count, 4)
+        self.assertEqual(len(htmlmin.cache._pages), 2)
+
+
+def page(content):
+    # CSRF tokens are masked differently on every render
+    return re.sub(r'name="csrfmiddlewaretoken" value="\w+"', '', content)
+
+
+class HtmlResponseTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        published = timezone.now() - timedelta(days=1)
+        for index in range(3):
+            Post.objects.create(title=f'Water project {index}', excerpt='Excerpt',
+                                content='<p>Body</p>', status='published',
+                                published_date=published)
+
+    @override_settings(HTML_MINIFY=True)
+    def test_middleware_minifies_pages(self):
+        response = self.client.get(reverse('blog_list'))
+        content = response.content.decode()
+        self.assertContains(response, 'Water project 2')
+        self.assertNotIn('<!-- Navigation -->', content)
+        # Attribute values, like the meta description, keep their whitespace
+        head = re.sub(r'"[^"]*"', '""', content.split('<script')[0])
+        self.assertNotIn('\n  ', head)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+    def test_streamed_page_matches_the_rendered_one(self):
+        rendered = self.client.get(reverse('blog_list')).content.decode()
+        with self.settings(HTML_STREAMING=True, HTML_STREAM_CHUNK_SIZE=4096):
+            response = self.client.get(reverse('blog_list'))
+            chunks = [chunk.decode() for chunk in response.streaming_content]
+        self.assertTrue(response.streaming)
+        self.assertIn('csrftoken', response.cookies)
+        self.assertIn('</head>', chunks[0])
+        self.assertNotIn('Water project', chunks[0])
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(page(''.join(chunks)), page(rendered))
+
+    @override_settings(HTML_STREAMING=True, HTML_MINIFY=True)
+    def test_streamed_page_is_minified(self):
+        response = self.client.get(reverse('blog_list'))
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Water project 0', content)
+        self.assertNotIn('<!-- Navigation -->', content)
+
+    def test_messages_are_consumed_before_streaming(self):
+        request = RequestFactory().get('/')
+        request.session = self.client.session
+        request._messages = FallbackStorage(request)
+        request._messages.add(constants.SUCCESS, 'Subscribed')
+        stream_response(request, 'partials/messages.html')
+        self.assertTrue(request._messages.used)
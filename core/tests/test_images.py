@@ -0,0 +1,179 @@
+import io
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from blog.models import Post
+from core.models import BoardMember, Partner
+from core.utils.images import derivative_dir, get_manifest
+
+
+def image_file(name, size=(2000, 1000), mode='RGB', fmt='JPEG'):
+    buffer = io.BytesIO()
+    # Colour derived from the name: distinct files must not deduplicate
+    colour = (len(name) * 20 % 256, ord(name[0]), 40, 128)
+    Image.new(mode, size, colour[:len(mode)]).save(buffer, fmt)
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+@override_settings(IMAGE_DERIVATIVES_MODE='sync', IMAGE_DERIVATIVE_FORMATS=['webp'])
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        cache.clear()
+
+    def create_post(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(title='Field visit', excerpt='e', content='c',
+                                       featured_image=image)
+
+    def render(self, template, **context):
+        return Template('{% load responsive_images %}' + template).render(Context(context))
+
+    def test_upload_generates_each_width_without_upscaling(self):
+        post = self.create_post(image_file('visit.jpg'))
+        manifest = get_manifest(post.featured_image)
+
+        self.assertEqual(manifest['fallback'], 'jpeg')
+        self.assertEqual(sorted(manifest['sources']), ['jpeg', 'webp'])
+        self.assertEqual(sorted(manifest['sources']['webp'], key=int),
+                         ['160', '480', '960', '1600'])
+        path = os.path.join(self.media_root, manifest['sources']['webp']['480'])
+        with Image.open(path) as derivative:
+            self.assertEqual(derivative.size, (480, 240))
+
+    def test_tag_renders_picture_with_srcset_and_dimensions(self):
+        post = self.create_post(image_file('visit.jpg'))
+        html = self.render("{% responsive_image post.featured_image 'card' alt='Visit' class='w-full' %}",
+                           post=post)
+        folder = '/media/' + derivative_dir(post.featured_image.name)
+        self.assertIn(f'<source type="image/webp" srcset="{folder}/160.webp 160w', html)
+        self.assertIn(f'src="{folder}/480.jpg"', html)
+        self.assertIn('width="480" height="240"', html)
+        self.assertIn('alt="Visit" class="w-full" loading="lazy"', html)
+
+    def test_tag_falls_back_to_original_before_generation(self):
+        with self.settings(IMAGE_DERIVATIVES_MODE='off'):
+            post = self.create_post(image_file('raw.jpg'))
+        html = self.render("{% responsive_image post.featured_image 'card' %}", post=post)
+        self.assertTrue(html.startswith(f'<img src="/media/{post.featured_image.name}"'))
+        self.assertEqual(self.render("{% responsive_image post.og_image 'card' %}", post=post), '')
+
+    def test_transparent_logo_keeps_png_fallback_and_small_source(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            partner = Partner.objects.create(
+                name='UNDP', logo=image_file('undp.png', (200, 100), 'RGBA', 'PNG'))
+        manifest = get_manifest(partner.logo)
+        self.assertEqual(manifest['fallback'], 'png')
+        self.assertEqual(manifest['sizes'], {'logo': 160, 'retina': 200})
+
+    def test_replacing_the_image_drops_old_derivatives(self):
+        post = self.create_post(image_file('old.jpg'))
+        old_dir = os.path.join(self.media_root, derivative_dir(post.featured_image.name))
+        self.assertTrue(os.listdir(old_dir))
+
+        post.featured_image = image_file('new.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save()
+        self.assertEqual(os.listdir(old_dir), [])
+        self.assertIsNotNone(get_manifest(post.featured_image))
+
+    def test_backfill_command(self):
+        with self.settings(IMAGE_DERIVATIVES_MODE='off'):
+            post = self.create_post(image_file('legacy.jpg'))
+        cache.clear()
+
+        out = StringIO()
+        call_command('generate_image_derivatives', 'blog.post.featured_image', stdout=out)
+        self.assertIn('Generated derivatives for 1 images (0 failed)', out.getvalue())
+        self.assertIsNotNone(get_manifest(post.featured_image))
+
+        call_command('generate_image_derivatives', stdout=out)
+        self.assertIn('Generated derivatives for 0 images', out.getvalue())
+
+
+@override_settings(IMAGE_DERIVATIVES_MODE='off')
+class ImageMetadataTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        cache.clear()
+
+    def test_upload_stores_dimensions_colour_and_placeholder(self):
+        post = Post.objects.create(title='t', excerpt='e', content='c',
+                                   featured_image=image_file('visit.jpg'))
+        post.refresh_from_db()
+        self.assertEqual((post.featured_image_width, post.featured_image_height), (2000, 1000))
+        self.assertEqual(post.featured_image_size, post.featured_image.size)
+        self.assertRegex(post.featured_image_color, r'^#[0-9a-f]{6}$')
+        self.assertTrue(post.featured_image_placeholder.startswith('data:image/'))
+        self.assertLess(len(post.featured_image_placeholder), 1000)
+        self.assertIsNone(post.og_image_width)
+
+    def test_resized_uploads_store_the_stored_size(self):
+        member = BoardMember.objects.create(name='n', position='p', bio='b',
+                                            photo=image_file('member.jpg', (1200, 600)))
+        member.refresh_from_db()
+        self.assertEqual((member.photo_width, member.photo_height), (400, 200))
+
+    def test_transparent_image_has_colour_but_no_placeholder(self):
+        partner = Partner.objects.create(
+            name='UNDP', logo=image_file('undp.png', (200, 100), 'RGBA', 'PNG'))
+        # Half-transparent pixels, seen over a white page
+        self.assertEqual(partner.logo_color, '#cfba93')
+        self.assertEqual(partner.logo_placeholder, '')
+
+    def test_clearing_the_image_clears_metadata(self):
+        post = Post.objects.create(title='t', excerpt='e', content='c',
+                                   featured_image=image_file('visit.jpg'))
+        post.featured_image = None
+        post.save()
+        post.refresh_from_db()
+        self.assertIsNone(post.featured_image_width)
+        self.assertEqual(post.featured_image_placeholder, '')
+
+    def test_missing_file_leaves_metadata_empty_quietly(self):
+        with self.assertNoLogs('core.utils.images', 'WARNING'):
+            post = Post.objects.create(title='t', excerpt='e', content='c',
+                                       featured_image='blog/missing.jpg')
+        self.assertIsNone(post.featured_image_width)
+
+    def test_tag_sizes_image_from_stored_metadata(self):
+        post = Post.objects.create(title='t', excerpt='e', content='c',
+                                   featured_image=image_file('visit.jpg'))
+        html = Template(
+            "{% load responsive_images %}{% responsive_image post.featured_image 'card' %}"
+            "{% with meta=post.featured_image|image_metadata %}{{ meta.width }}{% endwith %}"
+        ).render(Context({'post': post}))
+        self.assertIn('width="2000" height="1000"', html)
+        self.assertIn(f'style="background:{post.featured_image_color} url(data:image/', html)
+        self.assertTrue(html.endswith('>2000'))
+
+    def test_backfill_command(self):
+        post = Post.objects.create(title='t', excerpt='e', content='c',
+                                   featured_image=image_file('legacy.jpg'))
+        Post.objects.update(featured_image_width=None, featured_image_height=None)
+
+        out = StringIO()
+        call_command('backfill_image_metadata', 'blog.post.featured_image', stdout=out)
+        self.assertIn('Stored metadata for 1 images (0 failed)', out.getvalue())
+        post.refresh_from_db()
+        self.assertEqual(post.featured_image_height, 1000)
+
+        call_command('backfill_image_metadata', stdout=out)
+        self.assertIn('Stored metadata for 0 images', out.getvalue())
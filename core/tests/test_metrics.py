@@ -0,0 +1,37 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from EIP.db import postgres_pool_options
+
+
+class MetricsViewTests(TestCase):
+    def test_anonymous_is_forbidden(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_staff_sees_pool_section(self):
+        User.objects.create_user('staff', password='pw12345678', is_staff=True)
+        self.client.login(username='staff', password='pw12345678')
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        # SQLite has no pool, the section is present but empty
+        self.assertEqual(response.json()['db_pools'], {})
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_bearer_token(self):
+        response = self.client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+
+    def test_pool_options_from_environment(self):
+        with mock.patch.dict('os.environ', {'DATABASE_POOL_MAX_SIZE': '25',
+                                            'DATABASE_POOL_TIMEOUT': '2.5'}):
+            options = postgres_pool_options()
+        self.assertEqual(options['max_size'], 25)
+        self.assertEqual(options['timeout'], 2.5)
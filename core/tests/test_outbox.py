@@ -0,0 +1,165 @@
+import json
+import smtplib
+import socket
+import unittest
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from contacts.models import ContactMessage
+from core.models import OutboundEmail
+from core.utils import outbox
+from taskqueue.models import Task
+from taskqueue.worker import claim, execute
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
+
+
+def message(to='someone@example.org', subject='Hello'):
+    email = EmailMultiAlternatives(subject, 'Plain body', 'noreply@example.org', [to])
+    email.attach_alternative('<p>HTML body</p>', 'text/html')
+    return email
+
+
+class FailingBackend:
+    """Connection whose every send raises `error`"""
+    error = smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+
+    def __init__(self, **kwargs):
+        pass
+
+    def open(self):
+        return True
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise self.error
+
+
+class OutboxTests(TestCase):
+    def test_contact_submission_queues_instead_of_sending(self):
+        response = self.client.post(reverse('contact_api'), json.dumps({
+            'name': 'Abebe', 'email': 'abebe@example.org', 'subject': 'Partnership',
+            'message': 'We would like to work with you.'}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.filter(status='pending').count(), 2)
+        self.assertEqual(mail.outbox, [])
+
+        out = StringIO()
+        call_command('send_queued_email', stdout=out)
+        self.assertIn('Sent 2 emails (0 to retry, 0 failed)', out.getvalue())
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox),
+                         ['abebe@example.org', 'admin@eipethiopia.org'])
+        self.assertEqual(mail.outbox[0].alternatives[0].mimetype, 'text/html')
+        self.assertFalse(OutboundEmail.objects.exclude(status='sent').exists())
+
+    def test_rolled_back_transaction_leaves_no_email(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            outbox.queue(message())
+            raise RuntimeError
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    @override_settings(EMAIL_BACKEND='core.tests.test_outbox.FailingBackend',
+                       EMAIL_OUTBOX_RETRY_DELAY=60, EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        email = outbox.queue(message())
+        self.assertEqual(outbox.deliver(), {'retrying': 1})
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertIn('SMTPServerDisconnected', email.last_error)
+        self.assertAlmostEqual(email.next_attempt_at, timezone.now() + timedelta(seconds=60),
+                               delta=timedelta(seconds=5))
+        # Not due yet
+        self.assertEqual(outbox.deliver(), {})
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.deliver(), {'failed': 1})
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 2))
+
+    @override_settings(EMAIL_BACKEND='core.tests.test_outbox.FailingBackend')
+    def test_permanent_rejection_is_not_retried(self):
+        email = outbox.queue(message())
+        with mock.patch.object(FailingBackend, 'error',
+                               smtplib.SMTPDataError(554, b'Message rejected')):
+            outbox.deliver()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 1))
+
+    def test_commit_queues_one_delivery_task(self):
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            outbox.queue(message('a@example.org'))
+            outbox.queue(message('b@example.org'))
+        self.assertEqual(list(Task.objects.values_list('name', flat=True)),
+                         ['core.tasks.deliver_outbox'])
+
+        execute(claim(1, 'worker')[0])
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_claimed_messages_are_not_claimed_twice(self):
+        outbox.queue(message())
+        self.assertEqual(len(outbox.claim(10)), 1)
+        self.assertEqual(outbox.claim(10), [])
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith('bounce@'):
+            return '550 No such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.messages.append(envelope)
+        return '250 Message accepted'
+
+
+@unittest.skipUnless(Controller, 'aiosmtpd is not installed')
+class SMTPDeliveryTests(TestCase):
+    def setUp(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        self.handler = RecordingHandler()
+        controller = Controller(self.handler, hostname='127.0.0.1', port=port)
+        controller.start()
+        self.addCleanup(controller.stop)
+        smtp = override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=port, EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='')
+        smtp.enable()
+        self.addCleanup(smtp.disable)
+
+    def test_batch_shares_one_connection(self):
+        for index in range(5):
+            outbox.queue(message(f'user{index}@example.org'))
+        self.assertEqual(outbox.deliver(batch_size=10), {'sent': 5})
+        self.assertEqual(len(self.handler.messages), 5)
+        self.assertEqual(len(self.handler.sessions), 1)
+
+    def test_rejected_recipient_does_not_block_the_batch(self):
+        outbox.queue(message('bounce@example.org'))
+        outbox.queue(message('ok@example.org'))
+        self.assertEqual(outbox.deliver(), {'failed': 1, 'sent': 1})
+        self.assertEqual(OutboundEmail.objects.get(status='failed').to, ['bounce@example.org'])
+        self.assertEqual(self.handler.messages[0].rcpt_tos, ['ok@example.org'])
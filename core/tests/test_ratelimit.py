@@ -0,0 +1,77 @@
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from contacts.models import Subscriber
+from core.utils.ratelimit import parse_rate
+from vacancies.models import Application, Vacancy
+
+
+@override_settings(RATELIMITS={'contact': '2/m', 'newsletter': '2/m', 'application': '1/h'},
+                   RATELIMIT_PROXY_COUNT=1)
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def subscribe(self, email, **extra):
+        return self.client.post(reverse('subscribe_api'), json.dumps({'email': email}),
+                                content_type='application/json', **extra)
+
+    def test_json_endpoint_returns_429_with_retry_after(self):
+        for index in range(2):
+            self.assertEqual(self.subscribe(f'reader{index}@example.org').status_code, 200)
+        response = self.subscribe('reader2@example.org')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Too many requests', response.json()['error'])
+        self.assertTrue(1 <= int(response['Retry-After']) <= 61)
+        self.assertEqual(Subscriber.objects.count(), 2)
+
+    def test_limits_are_per_client_and_per_endpoint(self):
+        for index in range(2):
+            self.subscribe(f'reader{index}@example.org', HTTP_X_FORWARDED_FOR='10.0.0.1')
+        self.assertEqual(self.subscribe('a@example.org', HTTP_X_FORWARDED_FOR='10.0.0.1').status_code, 429)
+        # A forged leftmost entry does not buy a fresh bucket
+        self.assertEqual(self.subscribe('b@example.org',
+                                        HTTP_X_FORWARDED_FOR='1.2.3.4, 10.0.0.1').status_code, 429)
+        self.assertEqual(self.subscribe('c@example.org', HTTP_X_FORWARDED_FOR='10.0.0.2').status_code, 200)
+
+        response = self.client.post(reverse('contact_api'), json.dumps({
+            'name': 'Abebe', 'email': 'abebe@example.org', 'subject': 's', 'message': 'm'}),
+            content_type='application/json', HTTP_X_FORWARDED_FOR='10.0.0.1')
+        self.assertEqual(response.status_code, 200)
+
+    def test_upload_view_is_limited_before_the_body_is_read(self):
+        vacancy = Vacancy.objects.create(
+            title='Programme Officer', slug='programme-officer', description='d',
+            requirements='r', responsibilities='r', job_type='full-time',
+            location='Addis Ababa', deadline=timezone.now().date() + timedelta(days=7))
+        url = reverse('apply_vacancy', args=[vacancy.slug])
+        self.client.post(url, {'full_name': 'Abebe'})
+        response = self.client.post(url, {'full_name': 'Abebe'})
+        self.assertContains(response, 'Please slow down', status_code=429)
+        self.assertIn('Retry-After', response)
+        self.assertFalse(Application.objects.exists())
+        # Reading the form is not limited
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(RATELIMIT_PROXY_COUNT=0)
+    def test_forwarded_header_is_ignored_without_a_proxy(self):
+        for index in range(2):
+            self.subscribe(f'reader{index}@example.org', HTTP_X_FORWARDED_FOR=f'10.0.0.{index}')
+        self.assertEqual(self.subscribe('a@example.org', HTTP_X_FORWARDED_FOR='10.0.0.9').status_code, 429)
+
+    @override_settings(RATELIMIT_ENABLED=False)
+    def test_can_be_disabled(self):
+        for index in range(3):
+            self.assertEqual(self.subscribe(f'reader{index}@example.org').status_code, 200)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/m'), (5, 60))
+        self.assertEqual(parse_rate('20/10m'), (20, 600))
+        with self.assertRaises(ValueError):
+            parse_rate('5 per minute')
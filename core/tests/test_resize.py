@@ -0,0 +1,93 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock, skipIf
+
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core.utils import resize
+
+
+class ResizeEndpointTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        os.makedirs(os.path.join(self.media_root, 'uploads', '2024'))
+        self.path = 'uploads/2024/photo.jpg'
+        Image.new('RGB', (1600, 1200), 'green').save(
+            os.path.join(self.media_root, self.path), 'JPEG')
+
+    def fetch(self, url):
+        response = self.client.get(url)
+        if response.status_code == 200:
+            response.image = Image.open(io.BytesIO(b''.join(response.streaming_content)))
+        return response
+
+    def test_width_only_keeps_aspect_ratio(self):
+        response = self.fetch(resize.resize_url(self.path, '640x0'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.image.size, (640, 480))
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertTrue(os.path.exists(os.path.join(
+            self.media_root, 'resized', '640x0', 'uploads', '2024', 'photo.jpg')))
+
+    def test_both_dimensions_crop_to_fill(self):
+        response = self.fetch(resize.resize_url(self.path, '160x160'))
+        self.assertEqual(response.image.size, (160, 160))
+
+    def test_rejects_unsigned_unknown_size_and_traversal(self):
+        url = resize.resize_url(self.path, '640x0')
+        self.assertEqual(self.client.get(url.split('?')[0]).status_code, 404)
+        self.assertEqual(self.client.get(url.replace('640x0', '641x0')).status_code, 404)
+        with override_settings(IMAGE_RESIZE_SIZES=['641x0']):
+            self.assertEqual(self.client.get(url.replace('640x0', '641x0')).status_code, 404)
+        bad = f"/img/640x0/uploads/../../secret.jpg?s={resize.sign('640x0', 'uploads/../../secret.jpg')}"
+        self.assertEqual(self.client.get(bad).status_code, 404)
+        missing = resize.resize_url('uploads/missing.jpg', '640x0')
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_concurrent_requests_render_once(self):
+        real = resize.render
+        calls = []
+
+        def slow_render(*args):
+            calls.append(args)
+            started.wait(1)
+            return real(*args)
+
+        started = threading.Event()
+        results = []
+        with mock.patch.object(resize, 'render', side_effect=slow_render):
+            threads = [threading.Thread(target=lambda: results.append(
+                resize.get_or_render(960, 0, self.path))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            started.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(results)), 1)
+
+    @skipIf(resize.fcntl is None, 'no cross-process locking without fcntl')
+    def test_lock_file_is_kept_for_waiting_processes(self):
+        target = resize.get_or_render(960, 0, self.path)
+        # Removing it would let a waiter and a newcomer lock different files
+        self.assertTrue(os.path.exists(f'{target}.lock'))
+
+    def test_responsive_content_filter(self):
+        html = ('<p><img alt="x" src="/media/uploads/2024/photo.jpg"></p>'
+                '<img src="https://example.org/a.jpg">')
+        rendered = Template('{% load responsive_images %}{{ html|responsive_content }}').render(
+            Context({'html': html}))
+        self.assertIn('srcset="/img/320x0/uploads/2024/photo.jpg?s=', rendered)
+        self.assertIn('1280w"', rendered)
+        self.assertIn('loading="lazy"', rendered)
+        self.assertIn('<img src="https://example.org/a.jpg">', rendered)
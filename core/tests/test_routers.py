@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from blog.models import Post, PostView
+from core.middleware import PRIMARY_PIN_COOKIE
+from core.routers import (REPLICA_DB_ALIAS, PrimaryReplicaRouter,
+                          end_request, start_request)
+
+
+@override_settings(DATABASE_ROUTERS=['core.routers.PrimaryReplicaRouter'])
+class ReplicaRoutingTests(TestCase):
+    """The test database is the primary, a second SQLite file the replica"""
+    # Resolved in setUpClass, after the replica alias has been registered
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        connections.settings[REPLICA_DB_ALIAS] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: {},
+            REPLICA_DB_ALIAS: {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(cls.tmpdir, 'replica.sqlite3'),
+            },
+        })[REPLICA_DB_ALIAS]
+        with connections[REPLICA_DB_ALIAS].schema_editor() as editor:
+            for model in apps.get_models():
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_DB_ALIAS].close()
+        del connections[REPLICA_DB_ALIAS]
+        del connections.settings[REPLICA_DB_ALIAS]
+        shutil.rmtree(cls.tmpdir)
+
+    def setUp(self):
+        self.make_post('Only on primary', DEFAULT_DB_ALIAS)
+        self.make_post('Only on replica', REPLICA_DB_ALIAS)
+
+    def make_post(self, title, using):
+        return Post.objects.using(using).create(
+            title=title, slug=title.lower().replace(' ', '-'),
+            excerpt='e', content='c', status='published')
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(Post),
+                         DEFAULT_DB_ALIAS)
+
+    def test_public_get_reads_from_replica(self):
+        response = self.client.get(reverse('blog_list'))
+        self.assertContains(response, 'Only on replica')
+        self.assertNotContains(response, 'Only on primary')
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+    def test_write_pins_rest_of_request_to_primary(self):
+        router = PrimaryReplicaRouter()
+        token = start_request(use_replica=True)
+        self.assertEqual(router.db_for_read(Post), REPLICA_DB_ALIAS)
+        self.assertEqual(router.db_for_write(Post), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_read(Post), DEFAULT_DB_ALIAS)
+        self.assertTrue(end_request(token))
+
+    def test_tracking_post_views_does_not_pin_readers(self):
+        response = self.client.get(reverse('blog_detail', kwargs={'slug': 'only-on-replica'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+        self.assertEqual(PostView.objects.using(DEFAULT_DB_ALIAS).count(), 1)
+
+    def test_client_reads_own_writes_after_post(self):
+        response = self.client.post(reverse('contact'), {
+            'name': 'Abebe', 'email': 'abebe@example.com',
+            'subject': 'Hello', 'message': 'A message long enough.',
+        })
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+        response = self.client.get(reverse('blog_list'))
+        self.assertContains(response, 'Only on primary')
+        self.assertNotContains(response, 'Only on replica')
@@ -0,0 +1,48 @@
+import sys
+
+from django.test import SimpleTestCase, override_settings
+
+from core.checks import check_shared_cache
+from core.management.commands.profile_imports import parse_importtime
+from core.utils.lazy import LazyView
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     re._parser
+import time:       200 |        300 |   re
+import time:        50 |        350 | core.utils.slugs
+import time:        40 |         40 |   json
+import time:        10 |         50 | core.utils.dedupe
+"""
+
+
+class ImportProfileTests(SimpleTestCase):
+    def test_parse_builds_the_import_tree(self):
+        imports = {entry.name: entry for entry in parse_importtime(IMPORTTIME)}
+        self.assertEqual(list(imports), ['re._parser', 're', 'core.utils.slugs', 'json',
+                                         'core.utils.dedupe'])
+        self.assertEqual(imports['re._parser'].parent.name, 're')
+        self.assertEqual(imports['re'].parent.name, 'core.utils.slugs')
+        self.assertEqual(imports['json'].parent.name, 'core.utils.dedupe')
+        self.assertIsNone(imports['core.utils.slugs'].parent)
+        self.assertEqual((imports['re'].self_us, imports['re'].cumulative_us), (200, 300))
+
+
+class StartupTests(SimpleTestCase):
+    def test_local_memory_cache_is_a_deploy_warning(self):
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=locmem):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['core.W001'])
+        redis = {'default': {'BACKEND': 'django_redis.cache.RedisCache'}}
+        with override_settings(CACHES=redis):
+            self.assertEqual(check_shared_cache(None), [])
+
+    def test_lazy_view_imports_on_first_call(self):
+        view = LazyView('core.tests.test_startup.echo_view')
+        self.assertNotIn('view', view.__dict__)
+        self.assertEqual(view('request', 1), ('request', 1))
+        self.assertIs(view.view, sys.modules[__name__].echo_view)
+
+
+def echo_view(request, *args):
+    return (request, *args)
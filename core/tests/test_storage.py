@@ -0,0 +1,107 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Post
+from core.models import MediaBlob, Partner
+from core.storage import blob_storage
+
+
+@override_settings(IMAGE_DERIVATIVES_MODE='off')
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def partner(self, content=b'logo-bytes', name='logo.PNG'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Partner.objects.create(name='UNDP', logo=ContentFile(content, name=name))
+
+    def test_same_content_is_stored_once(self):
+        first = self.partner()
+        second = self.partner(name='another-name.png')
+        post = Post.objects.create(title='t', excerpt='e', content='c',
+                                   featured_image=ContentFile(b'logo-bytes', name='x.png'))
+
+        self.assertEqual(first.logo.name, second.logo.name)
+        self.assertEqual(first.logo.name, post.featured_image.name)
+        self.assertRegex(first.logo.name, r'^uploads/blobs/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertEqual(MediaBlob.objects.get().refcount, 3)
+        files = [f for _, _, fs in os.walk(self.media_root) for f in fs]
+        self.assertEqual(len(files), 1)
+
+    def test_cleanup_releases_references_but_keeps_shared_files(self):
+        first, second = self.partner(), self.partner()
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.refcount, 1)
+        self.assertTrue(blob_storage.exists(second.logo.name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.refcount, 0)
+        self.assertIsNotNone(blob.released_at)
+        self.assertTrue(blob_storage.exists(blob.name))
+
+    def test_gc_removes_only_unreferenced_blobs_after_grace(self):
+        kept = self.partner(b'kept')
+        dropped = self.partner(b'dropped')
+        dropped_name = dropped.logo.name
+        with self.captureOnCommitCallbacks(execute=True):
+            dropped.delete()
+
+        # Editor upload embedded in post content counts as a reference
+        editor_name = blob_storage.save('uploads/2024/photo.jpg', ContentFile(b'editor'))
+        Post.objects.create(title='t', excerpt='e', content=f'<img src="/media/{editor_name}">')
+
+        call_command('gc_media_blobs', stdout=StringIO())
+        self.assertTrue(blob_storage.exists(dropped_name))
+
+        MediaBlob.objects.filter(name=dropped_name).update(
+            released_at=timezone.now() - timedelta(days=2))
+        out = StringIO()
+        call_command('gc_media_blobs', stdout=out)
+        self.assertIn('Deleted 1 blobs', out.getvalue())
+        self.assertFalse(blob_storage.exists(dropped_name))
+        self.assertTrue(blob_storage.exists(kept.logo.name))
+        self.assertTrue(blob_storage.exists(editor_name))
+        self.assertEqual(MediaBlob.objects.get(name=editor_name).refcount, 1)
+
+    def test_reupload_revives_a_released_blob(self):
+        partner = self.partner()
+        with self.captureOnCommitCallbacks(execute=True):
+            partner.delete()
+        self.partner()
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.refcount, 1)
+        self.assertIsNone(blob.released_at)
+
+    def test_editor_upload_and_thumbnail(self):
+        User.objects.create_user('editor', password='pw12345678', is_staff=True)
+        self.client.login(username='editor', password='pw12345678')
+        buffer = io.BytesIO()
+        Image.new('RGB', (300, 200), 'blue').save(buffer, 'JPEG')
+        for _ in range(2):
+            upload = ContentFile(buffer.getvalue(), name='photo.jpg')
+            response = self.client.post('/ckeditor/upload/', {'upload': upload})
+        url = response.json()['url']
+
+        name = url[len('/media/'):]
+        self.assertTrue(name.startswith('uploads/blobs/'))
+        self.assertTrue(blob_storage.exists(name.replace('.jpg', '_thumb.jpg')))
+        self.assertEqual(MediaBlob.objects.get().refcount, 2)
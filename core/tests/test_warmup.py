@@ -0,0 +1,37 @@
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.db import connection
+from django.template import engines
+from django.test import TestCase
+
+from core.utils import warmup
+
+
+class WarmUpTests(TestCase):
+    def test_templates_urls_and_database_are_ready(self):
+        loader = engines['django'].engine.template_loaders[0]
+        loader.reset()
+        with self.assertLogs('core.utils.warmup', 'INFO'):
+            counts = warmup.warm_up()
+        self.assertIn('base.html', loader.get_template_cache)
+        self.assertIn('emails/contact_auto_reply.txt', loader.get_template_cache)
+        self.assertIn('admin/base.html', loader.get_template_cache)
+        self.assertEqual(counts['templates'], len(loader.get_template_cache))
+        self.assertGreater(counts['urls'], 20)
+        self.assertEqual(counts['databases'], 1)
+        self.assertIsNotNone(connection.connection)
+
+    def test_gunicorn_config(self):
+        config = runpy.run_path(str(settings.BASE_DIR / 'gunicorn.conf.py'))
+        self.assertTrue(config['preload_app'])
+        self.assertEqual((config['max_requests'], config['max_requests_jitter']), (1000, 100))
+
+        with mock.patch.object(warmup, 'warm_up') as warm_up, \
+                mock.patch('gc.freeze') as freeze:
+            config['when_ready'](None)
+            config['post_fork'](None, None)
+            config['post_worker_init'](None)
+        self.assertEqual(warm_up.call_args_list, [mock.call(database=False), mock.call()])
+        freeze.assert_called_once_with()
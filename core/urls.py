@@ -1,8 +1,9 @@
 from django.urls import path
 from . import views
+from .utils.asyncviews import pick
 
 urlpatterns = [
-    path('', views.HomeView.as_view(), name='home'),
+    path('', pick(views.HomeView, views.AsyncHomeView), name='home'),
     path('about/who-we-are/', views.WhoWeAreView.as_view(), name='about_who_we_are'),
     path('about/guiding-principles/', views.GuidingPrinciplesView.as_view(),
          name='about_guiding_principles'),
@@ -13,5 +14,8 @@ urlpatterns = [
     path('what-we-do/', views.WhatWeDoView.as_view(), name='what_we_do'),
     path('search/', views.SearchView.as_view(), name='search'),
     path('api/subscribe/', views.subscribe_newsletter, name='subscribe_api'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('img/<int:width>x<int:height>/<path:path>', views.resize_image,
+         name='resize_image'),
 
 ]
@@ -0,0 +1,29 @@
+# core/utils/assets.py
+"""
+Static asset build for production.
+
+The build runs in two steps, in this order (see the Dockerfile):
+
+1. `collectstatic` copies the sources to STATIC_ROOT under content-hashed
+   names and writes .gz and .br copies next to them.
+2. `compress` renders every {% compress %} block in the templates. It
+   writes one minified bundle per block to STATIC_ROOT/CACHE, named after
+   its content hash. It has to run second because the blocks reference
+   the hashed names from step 1.
+
+Bundles are saved through PrecompressedStorage, so they get the same
+.gz/.br copies. StaticFilesMiddleware marks both kinds of name as
+immutable.
+"""
+from compressor.storage import CompressorFileStorage
+from whitenoise.compress import Compressor
+
+
+class PrecompressedStorage(CompressorFileStorage):
+    """django-compressor output with .gz and .br copies for WhiteNoise to serve"""
+
+    def save(self, filename, content):
+        filename = super().save(filename, content)
+        # Copies that save less than 5% are skipped, as collectstatic does
+        Compressor(quiet=True).compress(self.path(filename))
+        return filename
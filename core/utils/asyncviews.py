@@ -0,0 +1,88 @@
+# core/utils/asyncviews.py
+"""
+Helpers for the async (ASGI) versions of the busiest public views.
+
+Each async view subclasses its sync counterpart and keeps its
+get_queryset(); only get() is async. Queries run through the async ORM
+and every queryset the template needs is evaluated before rendering, so
+the event loop only hands off to a thread for template rendering (which
+Django's ASGI handler already does for TemplateResponse).
+
+pick() chooses the variant in urls.py: ASYNC_VIEWS is switched on by
+EIP/asgi.py, so WSGI workers keep serving the sync views.
+"""
+import asyncio
+
+from django.conf import settings
+from django.core.paginator import InvalidPage, Page
+from django.db.models.query import QuerySet
+from django.http import Http404
+
+
+def pick(sync_view, async_view, **initkwargs):
+    """as_view() of the variant that matches the server (ASYNC_VIEWS)"""
+    view = async_view if settings.ASYNC_VIEWS else sync_view
+    return view.as_view(**initkwargs)
+
+
+async def alist(queryset):
+    return [obj async for obj in queryset]
+
+
+async def aevaluate(context):
+    """Replace every QuerySet in `context` with its results, fetched asynchronously"""
+    keys = [key for key, value in context.items() if isinstance(value, QuerySet)]
+    results = await asyncio.gather(*(alist(context[key]) for key in keys))
+    context.update(zip(keys, results))
+    return context
+
+
+class AsyncMultipleObjectMixin:
+    """
+    get() for ListView subclasses: the same context as ListView, with the
+    page counted and fetched through the async ORM
+    """
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty())
+        # Paginator.count would run a blocking COUNT
+        paginator.count = await queryset.acount()
+        page_kwarg = self.page_kwarg
+        page = self.kwargs.get(page_kwarg) or self.request.GET.get(page_kwarg) or 1
+        try:
+            page_number = paginator.num_pages if page == 'last' else int(page)
+            number = paginator.validate_number(page_number)
+        except (ValueError, InvalidPage) as e:
+            raise Http404(f'Invalid page ({page}): {e}')
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        object_list = await alist(queryset[bottom:top])
+        return paginator, Page(object_list, number, paginator), object_list, paginator.num_pages > 1
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        page_size = self.get_paginate_by(queryset)
+        if page_size:
+            paginator, page, object_list, is_paginated = await self.apaginate_queryset(queryset, page_size)
+        else:
+            paginator, page, object_list, is_paginated = None, None, await alist(queryset), False
+        if not object_list and not self.get_allow_empty():
+            raise Http404('Empty list and “%(class_name)s.allow_empty” is False.'
+                          % {'class_name': self.__class__.__name__})
+        self.object_list = object_list
+        context = await self.aget_context_data(
+            paginator=paginator, page_obj=page, is_paginated=is_paginated)
+        return self.render_to_response(context)
+
+    async def aget_context_data(self, **kwargs):
+        context = {'view': self, 'object_list': self.object_list, **kwargs}
+        context_object_name = self.get_context_object_name(self.object_list)
+        if context_object_name is not None:
+            context[context_object_name] = self.object_list
+        if self.extra_context is not None:
+            context.update(self.extra_context)
+        return context
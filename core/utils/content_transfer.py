@@ -0,0 +1,342 @@
+# core/utils/content_transfer.py
+"""
+Streaming JSONL import/export of site content.
+
+Each line holds one object in the same shape Django's serializers use:
+
+    {"model": "blog.post", "fields": {"title": "...", "categories": ["News"]}}
+
+Categories and tags are referenced by name, authors by username and files
+by their storage name relative to MEDIA_ROOT.
+
+Rows are written with bulk_create(), which skips Model.save(). Once a
+batch's files are in place, the importer runs what save() would have
+scheduled: image metadata, image derivatives and the model's own
+after_bulk_create() hook (PDF ingestion for publications).
+"""
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.utils.text import slugify
+
+from .images import metadata_columns, metadata_fields, read_metadata, sizes_for
+from .images import schedule as schedule_derivatives
+from .slugs import assign_unique_slugs
+
+logger = logging.getLogger(__name__)
+
+# What needs special handling per importable model
+CONTENT_TYPES = {
+    'blog.post': {
+        'named_m2m': {'categories': 'blog.Category', 'tags': 'blog.Tag'},
+        'named_fk': {},
+        'user_fk': ['author'],
+    },
+    'publications.publication': {
+        'named_m2m': {},
+        'named_fk': {'category': 'publications.PublicationCategory'},
+        'user_fk': [],
+    },
+    'vacancies.vacancy': {
+        'named_m2m': {},
+        'named_fk': {},
+        'user_fk': [],
+    },
+}
+
+
+def _file_fields(model):
+    return [f.name for f in model._meta.concrete_fields
+            if isinstance(f, models.FileField)]
+
+
+def _auto_now_add_fields(model):
+    return [f.name for f in model._meta.concrete_fields
+            if getattr(f, 'auto_now_add', False)]
+
+
+class ContentImporter:
+    """
+    Buffer incoming records per model and write them in batches.
+
+    Every flush costs a fixed number of queries regardless of batch size:
+    one slug lookup, one lookup (plus one insert) per related name table,
+    one bulk INSERT for the objects and one per M2M through table, plus
+    one UPDATE per image that gets its metadata stored. A flush waits for
+    its own media copies, so at most one batch of copies is in flight.
+    """
+
+    def __init__(self, batch_size=500, media_source=None, workers=8):
+        self.batch_size = batch_size
+        self.media_source = media_source
+        self.stats = defaultdict(lambda: defaultdict(int))
+        self._pending = defaultdict(list)
+        self._named = defaultdict(dict)
+        self._users = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers) if media_source else None
+        self._started = time.monotonic()
+
+    def feed(self, record):
+        label = record.get('model', '').lower()
+        if label not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported model '{record.get('model')}'")
+        self._pending[label].append(record.get('fields') or {})
+        if len(self._pending[label]) >= self.batch_size:
+            self.flush(label)
+
+    def close(self):
+        """Flush what is left and stop the media copy threads"""
+        for label in list(self._pending):
+            self.flush(label)
+        if self._executor:
+            self._executor.shutdown()
+        self.stats['total']['seconds'] = time.monotonic() - self._started
+        return self.stats
+
+    def flush(self, label):
+        rows = self._pending.pop(label, [])
+        if not rows:
+            return
+        spec = CONTENT_TYPES[label]
+        model = apps.get_model(label)
+        stats = self.stats[label]
+
+        slugs = [row['slug'] for row in rows if row.get('slug')]
+        taken = set(model.objects.filter(
+            slug__in=slugs).values_list('slug', flat=True)) if slugs else set()
+
+        named = {}
+        for name, rel_label in {**spec['named_m2m'], **spec['named_fk']}.items():
+            values = set()
+            for row in rows:
+                value = row.get(name)
+                values.update(value if isinstance(value, list) else [value])
+            named[name] = self._resolve_named(rel_label, values)
+        users = self._resolve_users(
+            {row.get(name) for row in rows for name in spec['user_fk']})
+
+        objs, relations, archived, copies = [], [], [], []
+        for row in rows:
+            fields = dict(row)
+            if fields.get('slug'):
+                if fields['slug'] in taken:
+                    stats['skipped'] += 1
+                    continue
+                taken.add(fields['slug'])
+
+            m2m = {name: fields.pop(name, None) or []
+                   for name in spec['named_m2m']}
+            for name in spec['named_fk']:
+                fields[name] = named[name].get(fields.get(name))
+            for name in spec['user_fk']:
+                fields[name] = users.get(fields.get(name))
+
+            obj = model(**self._to_python(model, fields))
+            archived.append({name: getattr(obj, name)
+                             for name in _auto_now_add_fields(model)
+                             if fields.get(name)})
+            copies.extend(self._queue_media(model, obj))
+            objs.append(obj)
+            relations.append(m2m)
+
+        if not objs:
+            return
+
+        if hasattr(model, 'prepare_for_bulk_create'):
+            model.prepare_for_bulk_create(objs)
+        else:
+            assign_unique_slugs(objs, source_attr='title')
+
+        with transaction.atomic():
+            model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+            # auto_now_add overwrites archived dates on INSERT, restore them
+            dated = sorted({name for dates in archived for name in dates})
+            if dated:
+                for obj, dates in zip(objs, archived):
+                    for name, value in dates.items():
+                        setattr(obj, name, value)
+                model.objects.bulk_update(
+                    objs, dated, batch_size=self.batch_size)
+
+            for name in spec['named_m2m']:
+                field = model._meta.get_field(name)
+                through = field.remote_field.through
+                source = f'{field.m2m_field_name()}_id'
+                target = f'{field.m2m_reverse_field_name()}_id'
+                links = []
+                for obj, m2m in zip(objs, relations):
+                    for value in m2m[name]:
+                        related = named[name].get(value)
+                        if related:
+                            links.append(through(
+                                **{source: obj.pk, target: related.pk}))
+                through.objects.bulk_create(
+                    links, batch_size=self.batch_size, ignore_conflicts=True)
+                stats[f'{name}_links'] += len(links)
+
+        stats['created'] += len(objs)
+
+        for future in copies:
+            self.stats['media'][future.result()] += 1
+        self._after_create(model, objs)
+
+    def _after_create(self, model, objs):
+        """The save() side effects that bulk_create() skipped"""
+        reads = []
+        for name in metadata_fields(model):
+            for obj in objs:
+                field_file = getattr(obj, name)
+                # Exports carry the metadata of images that already had it
+                if field_file and getattr(obj, f'{name}_width') is None:
+                    reads.append((obj, name, field_file.storage, field_file.name))
+        # Decoded on the copy threads when there are any
+        read = self._executor.map if self._executor else map
+        results = read(self._read_metadata, [r[2] for r in reads], [r[3] for r in reads])
+        for (obj, name, _, _), metadata in zip(reads, results):
+            if metadata:
+                model._default_manager.filter(pk=obj.pk).update(
+                    **metadata_columns(name, metadata))
+
+        for field in model._meta.concrete_fields:
+            sizes = sizes_for(model, field.name)
+            if sizes:
+                for obj in objs:
+                    field_file = getattr(obj, field.name)
+                    if field_file:
+                        schedule_derivatives(field_file.storage, field_file.name, sizes)
+
+        if hasattr(model, 'after_bulk_create'):
+            model.after_bulk_create(objs)
+
+    def _read_metadata(self, storage, name):
+        try:
+            return read_metadata(storage, name)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning('Image metadata failed for %s: %s', name, exc)
+            return None
+
+    def _to_python(self, model, fields):
+        values = {}
+        for name, value in fields.items():
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise ValueError(
+                    f"Unknown field '{name}' for {model._meta.label_lower}")
+            if field.is_relation or isinstance(field, models.FileField):
+                values[name] = value
+            else:
+                values[name] = field.to_python(value)
+        return values
+
+    def _resolve_named(self, rel_label, names):
+        """Map names to rows (matched on slug), creating missing ones in bulk"""
+        rel_model = apps.get_model(rel_label)
+        cache = self._named[rel_label]
+        slug_length = rel_model._meta.get_field('slug').max_length
+        slugs, wanted = {}, {}
+        for name in names:
+            slug = slugify(name or '')[:slug_length]
+            if slug:
+                slugs[name] = slug
+                if slug not in cache:
+                    wanted[slug] = name
+
+        if wanted:
+            for obj in rel_model.objects.filter(slug__in=wanted):
+                cache[obj.slug] = obj
+            missing = [rel_model(name=name, slug=slug)
+                       for slug, name in wanted.items() if slug not in cache]
+            if missing:
+                rel_model.objects.bulk_create(missing, ignore_conflicts=True)
+                for obj in rel_model.objects.filter(
+                        slug__in=[obj.slug for obj in missing]):
+                    cache[obj.slug] = obj
+                self.stats[rel_label.lower()]['created'] += len(missing)
+
+        return {name: cache.get(slug) for name, slug in slugs.items()}
+
+    def _resolve_users(self, usernames):
+        wanted = {name for name in usernames
+                  if name and name not in self._users}
+        if wanted:
+            found = {user.username: user
+                     for user in User.objects.filter(username__in=wanted)}
+            for name in wanted:
+                self._users[name] = found.get(name)
+        return self._users
+
+    def _queue_media(self, model, obj):
+        """Start copying the files of `obj`, returns the futures"""
+        if not self._executor:
+            return []
+        return [self._executor.submit(self._copy_file, getattr(obj, name).name)
+                for name in _file_fields(model) if getattr(obj, name).name]
+
+    def _copy_file(self, name):
+        source = os.path.join(self.media_source, name)
+        if default_storage.exists(name):
+            return 'existing'
+        if not os.path.exists(source):
+            return 'missing'
+        with open(source, 'rb') as fh:
+            default_storage.save(name, File(fh))
+        return 'copied'
+
+
+def iter_jsonl(stream):
+    """Yield one decoded record per non-empty line"""
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Line {number}: {exc}") from exc
+
+
+def export_records(labels, chunk_size=500):
+    """Yield JSONL lines for every object of the given models"""
+    for label in labels:
+        spec = CONTENT_TYPES[label]
+        model = apps.get_model(label)
+        relations = list(spec['named_fk']) + spec['user_fk']
+        queryset = model.objects.order_by('pk').select_related(
+            *relations).prefetch_related(*spec['named_m2m'])
+
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            fields = {}
+            for field in model._meta.concrete_fields:
+                if field.primary_key:
+                    continue
+                if field.name in spec['user_fk']:
+                    user = getattr(obj, field.name)
+                    fields[field.name] = user.username if user else None
+                elif field.name in spec['named_fk']:
+                    related = getattr(obj, field.name)
+                    fields[field.name] = related.name if related else None
+                elif isinstance(field, models.FileField):
+                    fields[field.name] = getattr(obj, field.name).name or ''
+                else:
+                    fields[field.name] = field.value_from_object(obj)
+            for name in spec['named_m2m']:
+                fields[name] = [related.name
+                                for related in getattr(obj, name).all()]
+            yield json.dumps({'model': label, 'fields': fields},
+                             cls=DjangoJSONEncoder, ensure_ascii=False)
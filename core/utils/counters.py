@@ -0,0 +1,96 @@
+# core/utils/counters.py
+"""
+Buffered counters for hot "+1" columns (views, downloads).
+
+Increments are summed in process memory and written back with atomic
+``F()`` updates: one UPDATE per (model, field, amount) group instead of one
+per request. The buffer is flushed after a request finishes once it is due
+(COUNTER_FLUSH_INTERVAL seconds or COUNTER_FLUSH_THRESHOLD increments)
+and when the process exits.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)
+        self._count = 0
+        self._last_flush = time.monotonic()
+
+    def incr(self, model, pk, field, amount=1):
+        """Record `amount` more for `field` of the `model` row with `pk`"""
+        with self._lock:
+            self._pending[(model, field, pk)] += amount
+            self._count += amount
+
+    def pending(self, model, pk, field):
+        """Increments not yet written to the database"""
+        with self._lock:
+            return self._pending.get((model, field, pk), 0)
+
+    def stats(self):
+        with self._lock:
+            return {'pending_increments': self._count,
+                    'pending_rows': len(self._pending),
+                    'seconds_since_flush': round(time.monotonic() - self._last_flush, 1)}
+
+    def is_due(self):
+        return bool(self._count) and (
+            self._count >= settings.COUNTER_FLUSH_THRESHOLD
+            or time.monotonic() - self._last_flush >= settings.COUNTER_FLUSH_INTERVAL)
+
+    def flush(self):
+        """Write all pending increments, returns the number of UPDATEs run"""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._count = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        # Rows that received the same amount share one UPDATE ... WHERE pk IN
+        groups = defaultdict(list)
+        for (model, field, pk), amount in pending.items():
+            groups[(model, field, amount)].append(pk)
+
+        try:
+            with transaction.atomic():
+                for (model, field, amount), pks in groups.items():
+                    model._default_manager.filter(pk__in=pks).update(
+                        **{field: F(field) + amount})
+        except Exception:
+            logger.exception('Counter flush failed, keeping increments')
+            with self._lock:
+                for key, amount in pending.items():
+                    self._pending[key] += amount
+                    self._count += amount
+            return 0
+        return len(groups)
+
+
+counters = CounterBuffer()
+
+
+def increment(model, pk, field, amount=1):
+    counters.incr(model, pk, field, amount)
+
+
+def _flush_if_due(**kwargs):
+    if counters.is_due():
+        counters.flush()
+
+
+request_finished.connect(_flush_if_due, dispatch_uid='core.counters.flush')
+atexit.register(counters.flush)
@@ -0,0 +1,56 @@
+# core/utils/dedupe.py
+"""
+Duplicate submission filter.
+
+A submission is identified twice over: by a fingerprint of its
+normalized content (e.g. email, subject and message of a ContactMessage)
+and, when the form sends one, by an idempotency key generated when the
+form was rendered. claim() adds both to the cache with cache.add(), which
+is atomic, so a double-click or a resent message is recognised before
+anything is written or emailed. The fingerprint is also stored in a
+conditionally unique column, which catches what the cache misses (entry
+expired, evicted, or a per-process LocMemCache).
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def normalize(value):
+    return ' '.join(str(value).split()).casefold()
+
+
+def fingerprint(*parts):
+    """sha256 of the parts, ignoring case and whitespace differences"""
+    content = '\x1f'.join(normalize(part) for part in parts)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def new_idempotency_key():
+    """Rendered into forms as the `idempotency_key` hidden field"""
+    return uuid.uuid4().hex
+
+
+def idempotency_key(request):
+    """The Idempotency-Key header or `idempotency_key` form field, if any"""
+    key = request.headers.get('Idempotency-Key') or request.POST.get('idempotency_key', '')
+    return key.strip()[:100]
+
+
+def _keys(scope, fingerprint, key):
+    keys = {f'dedupe:{scope}:{fingerprint}': settings.DEDUPE_TTL}
+    if key:
+        keys[f'idempotency:{scope}:{key}'] = settings.DEDUPE_KEY_TTL
+    return keys
+
+
+def claim(scope, fingerprint, key=''):
+    """Register a submission; False if its fingerprint or key was seen recently"""
+    return all([cache.add(name, 1, ttl) for name, ttl in _keys(scope, fingerprint, key).items()])
+
+
+def release(scope, fingerprint, key=''):
+    """Forget a claimed submission that failed, so that resending it works"""
+    cache.delete_many(list(_keys(scope, fingerprint, key)))
@@ -0,0 +1,110 @@
+# core/utils/digest.py
+"""
+Admin notification digests.
+
+With ADMIN_NOTIFICATION_MODE = 'digest' a new ContactMessage or
+Application does not email ADMIN_EMAIL. It schedules one send_admin_digest
+task at the end of the current ADMIN_DIGEST_INTERVAL instead, and that
+digest summarises everything received since the previous one:
+applications per vacancy from one aggregated query, and the contact
+messages themselves. Each ContactMessage and Application points at the
+AdminDigest that reported it, so a row that commits late, after the digest
+read a newer one, is still picked up by the next digest.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from core.models import AdminDigest
+from core.utils.email import render_email
+from core.utils.outbox import queue
+
+# Rows older than this before the previous digest (or before now, for the
+# first one) were already emailed in immediate mode and are left out
+DIGEST_LOOKBACK = timedelta(days=1)
+
+
+def is_enabled():
+    return settings.ADMIN_NOTIFICATION_MODE == 'digest'
+
+
+def schedule():
+    """Make sure a digest goes out at the end of the current interval"""
+    from core.tasks import send_admin_digest
+
+    interval = timedelta(minutes=settings.ADMIN_DIGEST_INTERVAL)
+    previous = AdminDigest.objects.order_by('-pk').values_list('created_at', flat=True).first()
+    if previous is None:
+        run_after = timezone.now() + interval
+    else:
+        run_after = max(timezone.now(), previous + interval)
+    send_admin_digest.enqueue_at(run_after)
+
+
+def claim(digest, previous=None):
+    """Attach everything not yet digested to `digest`, returns how many rows it took"""
+    from contacts.models import ContactMessage
+    from vacancies.models import Application
+
+    since = (previous.created_at if previous else timezone.now()) - DIGEST_LOOKBACK
+    return (ContactMessage.objects.filter(digest__isnull=True, created_date__gte=since)
+            .update(digest=digest)
+            + Application.objects.filter(digest__isnull=True, applied_date__gte=since)
+            .update(digest=digest))
+
+
+def collect(digest):
+    """(contact messages, per-vacancy application rows) attached to `digest`"""
+    from contacts.models import ContactMessage
+    from vacancies.models import Application
+
+    contacts = list(ContactMessage.objects.filter(digest=digest).order_by('pk')
+                    .values('pk', 'name', 'email', 'subject', 'created_date'))
+    vacancies = list(Application.objects.filter(digest=digest)
+                     .values('vacancy_id', 'vacancy__title', 'vacancy__deadline')
+                     .annotate(count=Count('pk'), latest=Max('applied_date'))
+                     .order_by('vacancy__deadline', 'vacancy__title'))
+    return contacts, vacancies
+
+
+def send_digest():
+    """Queue a digest of everything new, returns the AdminDigest or None"""
+    with transaction.atomic():
+        # Serializes concurrent runs where the database supports row locks
+        previous = AdminDigest.objects.select_for_update().order_by('-pk').first()
+        digest = AdminDigest.objects.create()
+        if not claim(digest, previous):
+            transaction.set_rollback(True)
+            return None
+
+        contacts, vacancies = collect(digest)
+        digest.contact_count = len(contacts)
+        digest.application_count = sum(v['count'] for v in vacancies)
+        digest.save(update_fields=['contact_count', 'application_count'])
+        admin_url = f'{settings.SITE_URL}/admin'
+        for contact in contacts:
+            contact['admin_url'] = f"{admin_url}/contacts/contactmessage/{contact['pk']}/change/"
+        for vacancy in vacancies:
+            vacancy['admin_url'] = (f"{admin_url}/vacancies/application/"
+                                    f"?vacancy__id__exact={vacancy['vacancy_id']}")
+
+        html_content, text_content = render_email('admin_digest', {
+            'digest': digest,
+            'since': previous.created_at if previous else None,
+            'contacts': contacts,
+            'vacancies': vacancies,
+        })
+        email = EmailMultiAlternatives(
+            subject=(f'Website digest: {digest.application_count} applications, '
+                     f'{digest.contact_count} messages'),
+            body=text_content,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[settings.ADMIN_EMAIL],
+        )
+        email.attach_alternative(html_content, "text/html")
+        queue(email)
+    return digest
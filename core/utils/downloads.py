@@ -0,0 +1,157 @@
+# core/utils/downloads.py
+"""
+Serve stored files either through the front proxy or from Python.
+
+FILE_DOWNLOAD_MODE selects how:
+
+* ``'x-accel'``: empty response with ``X-Accel-Redirect`` pointing at an
+  internal nginx location (X_ACCEL_REDIRECT_PREFIX) that maps to
+  MEDIA_ROOT. nginx streams the file and handles ranges itself.
+* ``'x-sendfile'``: empty response with ``X-Sendfile`` set to the absolute
+  path, for Apache mod_xsendfile / lighttpd.
+* ``'python'`` (default): Django streams the file, honouring ``Range``,
+  ``If-Range`` and ``If-None-Match`` so interrupted downloads can resume.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (FileResponse, HttpResponse, HttpResponseNotModified,
+                         StreamingHttpResponse)
+from django.utils.http import (content_disposition_header, http_date,
+                               parse_http_date_safe)
+
+CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_etag(size, modified):
+    """Strong validator from size and modification time"""
+    return f'"{size:x}-{int(modified.timestamp()):x}"'
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) for a single byte range, None to serve the whole
+    file, or False when the range cannot be satisfied.
+
+    Multi-range requests are answered with the full body, which RFC 9110
+    allows and saves building multipart responses.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def starts_download(request):
+    """False for range requests that resume or seek within a download"""
+    bounds = RANGE_RE.match(request.headers.get('Range', '').strip())
+    return not bounds or bounds.group(1) == '0'
+
+
+def _if_range_matches(request, etag, modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(modified.timestamp()) <= since
+
+
+def _iter_range(fh, start, length):
+    try:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def _local_path(field_file):
+    try:
+        return field_file.path
+    except NotImplementedError:
+        # Remote storages (S3...) have no local path to hand to the proxy
+        return None
+
+
+def serve_file(request, field_file, filename=None, as_attachment=True):
+    """Return a response that delivers `field_file` per FILE_DOWNLOAD_MODE"""
+    filename = filename or os.path.basename(field_file.name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    disposition = content_disposition_header(as_attachment, filename)
+
+    mode = settings.FILE_DOWNLOAD_MODE
+    path = _local_path(field_file)
+    if mode in ('x-accel', 'x-sendfile') and path:
+        response = HttpResponse(content_type=content_type)
+        if mode == 'x-accel':
+            prefix = settings.X_ACCEL_REDIRECT_PREFIX.rstrip('/')
+            response['X-Accel-Redirect'] = f"{prefix}/{quote(field_file.name)}"
+        else:
+            response['X-Sendfile'] = path
+        response['Content-Disposition'] = disposition
+        return response
+
+    storage = field_file.storage
+    size = field_file.size
+    modified = storage.get_modified_time(field_file.name)
+    etag = file_etag(size, modified)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(modified.timestamp()),
+        'Accept-Ranges': 'bytes',
+        'Content-Disposition': disposition,
+    }
+
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    bounds = None
+    if _if_range_matches(request, etag, modified):
+        bounds = parse_range(request.headers.get('Range'), size)
+
+    if bounds is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if bounds is None:
+        response = FileResponse(storage.open(field_file.name, 'rb'),
+                                content_type=content_type)
+    else:
+        start, end = bounds
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(storage.open(field_file.name, 'rb'), start, length),
+            status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+
+    for name, value in headers.items():
+        response[name] = value
+    return response
@@ -1,11 +1,68 @@
+import threading
+
 from django.core.mail import send_mail, EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import get_template
+from django.utils.autoreload import file_changed
 from django.conf import settings
 
+from core.utils.outbox import queue
+
+# Every email has templates/emails/<name>.html and a plain text <name>.txt;
+# the core.E001 system check loads them all at startup
+EMAIL_TEMPLATES = (
+    'contact_notification',
+    'contact_auto_reply',
+    'application_notification',
+    'application_confirmation',
+    'newsletter',
+    'admin_digest',
+)
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def get_email_templates(name):
+    """Compiled (html, text) templates of an email, loaded once per process"""
+    templates = _compiled.get(name)
+    if templates is None:
+        with _compiled_lock:
+            templates = _compiled.get(name)
+            if templates is None:
+                templates = _compiled[name] = (get_template(f'emails/{name}.html'),
+                                               get_template(f'emails/{name}.txt'))
+    return templates
+
+
+def render_email(name, context):
+    """(html, text) bodies of an email"""
+    html, text = get_email_templates(name)
+    return html.render(context), text.render(context)
+
+
+@receiver(file_changed)
+@receiver(setting_changed)
+def _reset_compiled(**kwargs):
+    # runserver edits and TEMPLATES overrides in tests
+    _compiled.clear()
+
+
+def _scheduled_for_digest():
+    """Whether the admin notification is left to the next digest (digest mode)"""
+    from core.utils import digest
+
+    if not digest.is_enabled():
+        return False
+    digest.schedule()
+    return True
+
 
 def send_contact_notification(contact_message):
-    """Send email notification to admin about new contact message"""
+    """Queue email notification to admin about new contact message"""
+    if _scheduled_for_digest():
+        return
     subject = f'New Contact Message: {contact_message.subject}'
 
     # Create HTML context
@@ -20,11 +77,8 @@ def send_contact_notification(contact_message):
     }
 
     # Render HTML content
-    html_content = render_to_string(
-        'emails/contact_notification.html', context)
-    text_content = strip_tags(html_content)
+    html_content, text_content = render_email('contact_notification', context)
 
-    # Send email
     email = EmailMultiAlternatives(
         subject=subject,
         body=text_content,
@@ -32,11 +86,11 @@ def send_contact_notification(contact_message):
         to=[settings.ADMIN_EMAIL],
     )
     email.attach_alternative(html_content, "text/html")
-    email.send(fail_silently=True)
+    queue(email)
 
 
 def send_contact_auto_reply(contact_message):
-    """Send auto-reply to user who submitted contact form"""
+    """Queue auto-reply to user who submitted contact form"""
     subject = f'Thank you for contacting EIP Ethiopia'
 
     context = {
@@ -45,8 +99,7 @@ def send_contact_auto_reply(contact_message):
         'message': contact_message.message,
     }
 
-    html_content = render_to_string('emails/contact_auto_reply.html', context)
-    text_content = strip_tags(html_content)
+    html_content, text_content = render_email('contact_auto_reply', context)
 
     email = EmailMultiAlternatives(
         subject=subject,
@@ -55,11 +108,13 @@ def send_contact_auto_reply(contact_message):
         to=[contact_message.email],
     )
     email.attach_alternative(html_content, "text/html")
-    email.send(fail_silently=True)
+    queue(email)
 
 
 def send_application_notification(application):
-    """Send notification about new job application"""
+    """Queue notification about new job application"""
+    if _scheduled_for_digest():
+        return
     subject = f'New Application: {application.vacancy.title}'
 
     context = {
@@ -70,14 +125,12 @@ def send_application_notification(application):
         'cover_letter': application.cover_letter,
         'applied_date': application.applied_date,
         'ip_address': application.ip_address,
-        'resume_url': application.resume.url if application.resume else '',
-        'additional_docs_url': application.additional_documents.url if application.additional_documents else '',
+        'resume_url': f'{settings.SITE_URL}{application.resume.url}' if application.resume else '',
+        'additional_docs_url': f'{settings.SITE_URL}{application.additional_documents.url}' if application.additional_documents else '',
         'admin_url': f'{settings.SITE_URL}/admin/vacancies/application/{application.id}/change/',
     }
 
-    html_content = render_to_string(
-        'emails/application_notification.html', context)
-    text_content = strip_tags(html_content)
+    html_content, text_content = render_email('application_notification', context)
 
     email = EmailMultiAlternatives(
         subject=subject,
@@ -86,11 +139,11 @@ def send_application_notification(application):
         to=[settings.ADMIN_EMAIL],
     )
     email.attach_alternative(html_content, "text/html")
-    email.send(fail_silently=True)
+    queue(email)
 
 
 def send_application_confirmation(application):
-    """Send confirmation email to job applicant"""
+    """Queue confirmation email to job applicant"""
     subject = f'Application Received: {application.vacancy.title}'
 
     context = {
@@ -100,9 +153,7 @@ def send_application_confirmation(application):
         'deadline': application.vacancy.deadline,
     }
 
-    html_content = render_to_string(
-        'emails/application_confirmation.html', context)
-    text_content = strip_tags(html_content)
+    html_content, text_content = render_email('application_confirmation', context)
 
     email = EmailMultiAlternatives(
         subject=subject,
@@ -111,4 +162,4 @@ def send_application_confirmation(application):
         to=[application.email],
     )
     email.attach_alternative(html_content, "text/html")
-    email.send(fail_silently=True)
+    queue(email)
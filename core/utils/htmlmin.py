@@ -0,0 +1,149 @@
+# core/utils/htmlmin.py
+"""
+HTML minification for text/html responses.
+
+A regex pass instead of an HTML parser: comments are dropped, and runs
+of whitespace collapse to one character (a newline if the run had one).
+<pre>, <textarea>, <script> and <style> blocks, IE conditional comments
+and quoted attribute values (title, value, data-*) are left exactly as
+rendered. Collapsing never removes whitespace altogether, so inline
+elements render as before.
+
+Pages are usually rendered identically for every anonymous visitor, so
+minified output is kept in a per-process LRU keyed by a digest of the
+rendered page. minify_stream() handles streamed bodies chunk by chunk
+without splitting a comment or a preserved block.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+# Every alternative starts with '<', which lets the engine skip ahead to it
+_BLOCK_RE = re.compile(
+    r'<(?:(?P<keep>!--\[if.*?<!\[endif\]-->|(?P<tag>pre|textarea|script|style)\b.*?</(?P=tag)\s*>)'
+    r'|!--.*?-->'
+    r'|(?P<open>!--|(?:pre|textarea|script|style)\b))',
+    re.IGNORECASE | re.DOTALL)
+# A tag, quote-aware so a '>' in an attribute value does not end it, or a
+# '<' that opens no tag (only possible when no '>' follows)
+_TAG_RE = re.compile(r'''<[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>|(?P<lt><)''')
+_QUOTED_RE = re.compile(r'"[^"]*"' r"|'[^']*'")
+_NEWLINE_RUN_RE = re.compile(r'[ \t\r\f\v]*\n\s*')
+_SPACE_RUN_RE = re.compile(r'[ \t\r\f\v]{2,}')
+_WHITESPACE_PAIR_RE = re.compile(r'\s\s')
+
+
+def _collapse_text(text):
+    return _SPACE_RUN_RE.sub(' ', _NEWLINE_RUN_RE.sub('\n', text))
+
+
+def _collapse(text):
+    """Collapse whitespace in `text`, except inside quoted attribute values"""
+    parts, position = [], 0
+    for tag in _TAG_RE.finditer(text):
+        # Only values with two whitespace characters in a row would change
+        if tag.group('lt') or not _WHITESPACE_PAIR_RE.search(tag.group()):
+            continue
+        for value in _QUOTED_RE.finditer(text, tag.start(), tag.end()):
+            if _WHITESPACE_PAIR_RE.search(value.group()):
+                parts.append(_collapse_text(text[position:value.start()]))
+                parts.append(value.group())
+                position = value.end()
+    parts.append(_collapse_text(text[position:]))
+    return ''.join(parts)
+
+
+def _minify(html):
+    parts, position = [], 0
+    for match in _BLOCK_RE.finditer(html):
+        parts.append(_collapse(html[position:match.start()]))
+        if match.group('open'):
+            # Unclosed comment or block: leave the rest of the page alone
+            parts.append(html[match.start():])
+            return ''.join(parts)
+        if match.group('keep'):
+            parts.append(match.group())
+        position = match.end()
+    parts.append(_collapse(html[position:]))
+    return ''.join(parts)
+
+
+class MinifyCache:
+    """Thread-safe LRU of minified pages, keyed by a digest of the original"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages = OrderedDict()
+
+    def minify(self, html):
+        size = settings.HTML_MINIFY_CACHE_SIZE
+        if not size:
+            return _minify(html)
+        key = hashlib.blake2b(html.encode(), digest_size=16).digest()
+        with self._lock:
+            minified = self._pages.get(key)
+            if minified is not None:
+                self._pages.move_to_end(key)
+                return minified
+        minified = _minify(html)
+        with self._lock:
+            self._pages[key] = minified
+            while len(self._pages) > size:
+                self._pages.popitem(last=False)
+        return minified
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+
+cache = MinifyCache()
+
+
+def minify(html):
+    """Minified `html`, from the cache when the same page was minified before"""
+    return cache.minify(html)
+
+
+def _last_tag_end(text, start, stop):
+    """
+    (end of the last complete tag in text[start:stop] or None, whether the
+    scan reached `stop`); a '<' that opens no tag yet may open one once
+    more text arrives, so the scan stops there
+    """
+    end = None
+    for tag in _TAG_RE.finditer(text, start, stop):
+        if tag.group('lt'):
+            return end, False
+        end = tag.end()
+    return end, True
+
+
+def _safe_end(text):
+    """Length of the longest prefix of `text` that can be minified on its own"""
+    # Cut after a complete tag or preserved block, so no whitespace run,
+    # tag or attribute value is split
+    end = position = 0
+    for match in _BLOCK_RE.finditer(text):
+        tag_end, complete = _last_tag_end(text, position, match.start())
+        if match.group('open') or not complete:
+            return tag_end or end
+        end = position = match.end()
+    tag_end, _ = _last_tag_end(text, position, len(text))
+    return tag_end or end
+
+
+def minify_stream(chunks):
+    """Minify an iterable of str chunks, yielding as soon as a prefix is complete"""
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        end = _safe_end(pending)
+        if end:
+            yield _minify(pending[:end])
+            pending = pending[end:]
+    if pending:
+        yield _minify(pending)
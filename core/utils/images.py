@@ -0,0 +1,352 @@
+# core/utils/images.py
+"""
+Responsive derivatives for uploaded images.
+
+IMAGE_DERIVATIVES names the widths wanted per model field:
+
+    {'blog.post.featured_image': {'card': 480, 'full': 960}}
+
+Each width is encoded in every IMAGE_DERIVATIVE_FORMATS format plus a
+JPEG fallback (PNG when the source has transparency). The files live at
+``derivatives/<original name without extension>/<width>.<ext>`` next to a
+``manifest.json`` that the ``responsive_image`` template tag reads, so
+rendering never touches Pillow. Originals are never upscaled.
+
+Generation runs after commit on a thread pool (Pillow releases the GIL
+while resizing and encoding); IMAGE_DERIVATIVES_MODE 'sync' runs it
+inline and 'off' disables it.
+
+ImageMetadataMixin stores each image's dimensions, byte size, dominant
+colour and a tiny placeholder in ``<field>_width`` ... columns, so
+templates can size images and paint placeholders without file I/O.
+"""
+import base64
+import functools
+import io
+import json
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import models, transaction
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIR = 'derivatives'
+MANIFEST_NAME = 'manifest.json'
+# How long a missing manifest is remembered before storage is checked again
+MISSING_TIMEOUT = 60
+# Longest side of the inline placeholder, stretched and blurred by the browser
+PLACEHOLDER_SIZE = 16
+METADATA_KEYS = ('width', 'height', 'size', 'color', 'placeholder')
+
+ENCODERS = {
+    'avif': {'format': 'AVIF', 'mime': 'image/avif', 'options': {'quality': 55, 'speed': 6}},
+    'webp': {'format': 'WEBP', 'mime': 'image/webp', 'options': {'quality': 78, 'method': 5}},
+    'jpeg': {'format': 'JPEG', 'mime': 'image/jpeg',
+             'options': {'quality': 80, 'optimize': True, 'progressive': True}},
+    'png': {'format': 'PNG', 'mime': 'image/png', 'options': {'optimize': True}},
+}
+EXTENSIONS = {'jpeg': 'jpg'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def sizes_for(model, field_name):
+    """Named widths configured for a model field, or None"""
+    key = f'{model._meta.label_lower}.{field_name}'
+    return settings.IMAGE_DERIVATIVES.get(key)
+
+
+def derivative_dir(name):
+    return posixpath.join(DERIVATIVES_DIR, posixpath.splitext(name)[0])
+
+
+def _derived(storage):
+    # Content-addressed storages hand out a plain one for computed files
+    return getattr(storage, 'derived_storage', storage)
+
+
+def _cache_key(name):
+    return f'imgd:{name}'
+
+
+def _modern_formats():
+    return [fmt for fmt in settings.IMAGE_DERIVATIVE_FORMATS
+            if fmt in ('avif', 'webp') and features.check(fmt)]
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (
+        image.mode == 'P' and 'transparency' in image.info)
+
+
+def _encode(image, fmt):
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif fmt != 'jpeg' and image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, ENCODERS[fmt]['format'], **ENCODERS[fmt]['options'])
+    return buffer.getvalue()
+
+
+def generate(storage, name, sizes):
+    """Write all derivatives of the stored image `name`, returns the manifest"""
+    with storage.open(name, 'rb') as fh:
+        source = Image.open(fh)
+        source = ImageOps.exif_transpose(source)
+        source.load()
+    storage = _derived(storage)
+    width, height = source.size
+    alpha = _has_alpha(source)
+    if alpha:
+        source = source.convert('RGBA')
+    elif source.mode != 'RGB':
+        source = source.convert('RGB')
+
+    # Never upscale; a source smaller than every size gets one rendition at its own width
+    widths = sorted({min(w, width) for w in sizes.values()})
+    fallback = 'png' if alpha else 'jpeg'
+    formats = _modern_formats() + [fallback]
+    folder = derivative_dir(name)
+
+    manifest = {
+        'width': width, 'height': height, 'fallback': fallback,
+        'sizes': {label: min(w, width) for label, w in sizes.items()},
+        'sources': {fmt: {} for fmt in formats},
+    }
+    for target in widths:
+        resized = source if target == width else source.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS)
+        for fmt in formats:
+            path = posixpath.join(folder, f'{target}.{EXTENSIONS.get(fmt, fmt)}')
+            if storage.exists(path):
+                storage.delete(path)
+            manifest['sources'][fmt][str(target)] = storage.save(
+                path, ContentFile(_encode(resized, fmt)))
+
+    manifest_path = posixpath.join(folder, MANIFEST_NAME)
+    if storage.exists(manifest_path):
+        storage.delete(manifest_path)
+    storage.save(manifest_path, ContentFile(json.dumps(manifest).encode()))
+    cache.set(_cache_key(name), manifest, None)
+    return manifest
+
+
+def get_manifest(field_file):
+    """Manifest for a stored image, None until its derivatives exist"""
+    if not field_file:
+        return None
+    key = _cache_key(field_file.name)
+    manifest = cache.get(key)
+    if manifest is not None:
+        return manifest or None
+
+    path = posixpath.join(derivative_dir(field_file.name), MANIFEST_NAME)
+    try:
+        with _derived(field_file.storage).open(path, 'rb') as fh:
+            manifest = json.loads(fh.read())
+    except (OSError, ValueError):
+        cache.set(key, {}, MISSING_TIMEOUT)
+        return None
+    cache.set(key, manifest, None)
+    return manifest
+
+
+def delete_derivatives(storage, name):
+    """Remove the derivatives of a replaced or deleted original"""
+    # Deduplicating storages keep shared files alive for other rows
+    is_referenced = getattr(storage, 'is_referenced', None)
+    if is_referenced and is_referenced(name):
+        return
+    storage = _derived(storage)
+    folder = derivative_dir(name)
+    try:
+        _, files = storage.listdir(folder)
+    except (OSError, NotImplementedError):
+        return
+    for file_name in files:
+        storage.delete(posixpath.join(folder, file_name))
+    cache.delete(_cache_key(name))
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+                thread_name_prefix='image-derivatives')
+    return _executor
+
+
+def _run(storage, name, sizes):
+    try:
+        generate(storage, name, sizes)
+    except Exception:
+        logger.exception('Image derivatives failed for %s', name)
+
+
+def schedule(storage, name, sizes):
+    """Generate derivatives for `name` once the current transaction commits"""
+    mode = settings.IMAGE_DERIVATIVES_MODE
+    if mode == 'off' or not name or not sizes:
+        return
+    if mode == 'sync':
+        job = functools.partial(_run, storage, name, sizes)
+    else:
+        job = functools.partial(_get_executor().submit, _run, storage, name, sizes)
+    transaction.on_commit(job)
+
+
+class DerivativeImagesMixin:
+    """
+    Model mixin: (re)generate derivatives for every configured image field
+    whose file changed on save, and drop the old file's derivatives.
+    Queryset updates and deletes bypass it; generate_image_derivatives
+    catches up on missing derivatives.
+    """
+
+    def _derivative_fields(self):
+        return [name for name in (f.name for f in self._meta.concrete_fields)
+                if sizes_for(type(self), name)]
+
+    def save(self, *args, **kwargs):
+        fields = self._derivative_fields()
+        previous = {}
+        if fields and self.pk:
+            previous = type(self)._default_manager.filter(
+                pk=self.pk).values(*fields).first() or {}
+        super().save(*args, **kwargs)
+
+        for name in fields:
+            field_file = getattr(self, name)
+            old = previous.get(name)
+            if name in previous and old == field_file.name:
+                continue
+            if old:
+                transaction.on_commit(functools.partial(
+                    delete_derivatives, field_file.storage, old))
+            schedule(field_file.storage, field_file.name, sizes_for(type(self), name))
+
+    def delete(self, *args, **kwargs):
+        stored = [(getattr(self, name).storage, getattr(self, name).name)
+                  for name in self._derivative_fields() if getattr(self, name)]
+        result = super().delete(*args, **kwargs)
+        for storage, name in stored:
+            transaction.on_commit(functools.partial(delete_derivatives, storage, name))
+        return result
+
+
+def image_metadata(fh):
+    """Dimensions, dominant colour and placeholder data: URI of an open image file"""
+    image = Image.open(fh)
+    width, height = image.size
+    if image.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+        # Displayed rotated by a quarter turn
+        width, height = height, width
+    # JPEG decodes straight to a reduced scale
+    image.draft('RGB', (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+    image = ImageOps.exif_transpose(image)
+    alpha = _has_alpha(image)
+    small = image.convert('RGBA' if alpha else 'RGB')
+    small.thumbnail((PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+
+    opaque = small
+    if alpha:
+        # Colour of what is drawn, not of the transparent background
+        opaque = Image.new('RGB', small.size, (255, 255, 255))
+        opaque.paste(small, mask=small.getchannel('A'))
+    palette = opaque.quantize(colors=5)
+    _, index = max(palette.getcolors())
+    red, green, blue = palette.getpalette()[index * 3:index * 3 + 3]
+
+    placeholder = ''
+    if not alpha:
+        # A blurred background would show through transparent logos
+        small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        fmt = 'webp' if features.check('webp') else 'jpeg'
+        buffer = io.BytesIO()
+        small.save(buffer, ENCODERS[fmt]['format'], quality=40)
+        placeholder = 'data:{};base64,{}'.format(
+            ENCODERS[fmt]['mime'], base64.b64encode(buffer.getvalue()).decode())
+    return {'width': width, 'height': height,
+            'color': f'#{red:02x}{green:02x}{blue:02x}', 'placeholder': placeholder}
+
+
+def read_metadata(storage, name):
+    """image_metadata() plus byte size of a stored image"""
+    with storage.open(name, 'rb') as fh:
+        metadata = image_metadata(fh)
+    metadata['size'] = storage.size(name)
+    return metadata
+
+
+def metadata_columns(field_name, metadata=None):
+    """Model field values for `metadata`; empty values clear them"""
+    metadata = metadata or {}
+    return {f'{field_name}_{key}': metadata.get(key, '' if key in ('color', 'placeholder') else None)
+            for key in METADATA_KEYS}
+
+
+def metadata_fields(model):
+    """Image fields of `model` that have metadata columns"""
+    names = {field.name for field in model._meta.concrete_fields}
+    return [field.name for field in model._meta.concrete_fields
+            if isinstance(field, models.ImageField) and f'{field.name}_width' in names]
+
+
+def stored_metadata(field_file):
+    """Stored metadata of a model's image, None when not known yet"""
+    instance = getattr(field_file, 'instance', None)
+    name = getattr(getattr(field_file, 'field', None), 'name', None)
+    if instance is None or getattr(instance, f'{name}_width', None) is None:
+        return None
+    return {key: getattr(instance, f'{name}_{key}') for key in METADATA_KEYS}
+
+
+class ImageMetadataMixin:
+    """
+    Model mixin: refresh the metadata columns of every image field whose
+    file changed on save. They are read back from the stored file after
+    saving, since django_resized shrinks uploads on the way in.
+    backfill_image_metadata fills in rows saved before the columns existed.
+    """
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        changes, stale = {}, []
+        for name in metadata_fields(type(self)):
+            if update_fields is not None and name not in update_fields:
+                continue
+            field_file = getattr(self, name)
+            if field_file and (not field_file._committed
+                               or getattr(self, f'{name}_width') is None):
+                stale.append(name)
+            elif not field_file and getattr(self, f'{name}_width') is not None:
+                changes.update(metadata_columns(name))
+        super().save(*args, **kwargs)
+
+        for name in stale:
+            field_file = getattr(self, name)
+            try:
+                changes.update(metadata_columns(
+                    name, read_metadata(field_file.storage, field_file.name)))
+            except FileNotFoundError:
+                # Not uploaded (yet): nothing to read, the metadata stays empty
+                continue
+            except Exception as exc:
+                # Undecodable files keep empty metadata
+                logger.warning('Image metadata failed for %s: %s', field_file.name, exc)
+        if changes:
+            for attname, value in changes.items():
+                setattr(self, attname, value)
+            # update() rather than a second save(): no recursion, no signals
+            type(self)._default_manager.filter(pk=self.pk).update(**changes)
@@ -0,0 +1,27 @@
+# core/utils/lazy.py
+"""
+Deferred imports for rarely used views.
+
+LazyView('package.views.name') is a view that imports the real one on its
+first request, so loading the urlconf (every process start, every
+`manage.py check`) does not import the module behind it.
+"""
+from functools import cached_property
+
+from django.utils.module_loading import import_string
+
+
+class LazyView:
+    def __init__(self, dotted_path):
+        self.dotted_path = dotted_path
+
+    @cached_property
+    def view(self):
+        return import_string(self.dotted_path)
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+    def __repr__(self):
+        return f'<LazyView {self.dotted_path}>'
+
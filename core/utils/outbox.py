@@ -0,0 +1,146 @@
+# core/utils/outbox.py
+"""
+Transactional email outbox.
+
+queue() stores a rendered message as an OutboundEmail row inside the
+caller's transaction, so an email exists exactly when the ContactMessage
+or Application that triggered it does, and no request waits on SMTP.
+
+deliver() (the deliver_outbox task queued after each commit, and the
+send_queued_email command for retries) claims due rows in batches,
+sends each batch over a single SMTP connection and reschedules failures
+with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS. Delivery is
+at-least-once: a worker killed between sending and recording a message
+sends it again once the lease expires.
+"""
+import logging
+import smtplib
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _model():
+    from core.models import OutboundEmail
+    return OutboundEmail
+
+
+def queue(message):
+    """Store an EmailMessage for the worker, returns the OutboundEmail"""
+    from core.tasks import deliver_outbox
+
+    html = ''
+    for content, mimetype in getattr(message, 'alternatives', []):
+        if mimetype == 'text/html':
+            html = content
+    # Savepoint: a failed insert must not take the caller's rows with it
+    with transaction.atomic():
+        deliver_outbox.enqueue()
+        return _model().objects.create(
+            subject=message.subject,
+            from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+            to=list(message.to),
+            reply_to=list(message.reply_to),
+            body=message.body,
+            html_body=html,
+        )
+
+
+def claim(batch_size):
+    """Lease up to `batch_size` due messages to the calling worker"""
+    OutboundEmail = _model()
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    due = OutboundEmail.objects.filter(status='pending', next_attempt_at__lte=now)
+    ids = list(due.order_by('next_attempt_at').values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return []
+    # The UPDATE re-checks `due`: rows another worker leased meanwhile are skipped
+    due.filter(pk__in=ids).update(
+        claimed_by=token,
+        next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE))
+    return list(OutboundEmail.objects.filter(claimed_by=token, status='pending'))
+
+
+def _message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject, body=email.body, from_email=email.from_email,
+        to=email.to, reply_to=email.reply_to, connection=connection)
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def is_permanent(exc):
+    """Whether an SMTP error will not go away on retry (5xx, refused recipients)"""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and 500 <= exc.smtp_code < 600
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def _record_failure(email, exc):
+    """Reschedule with backoff, or give up; returns 'retrying' or 'failed'"""
+    attempts = email.attempts + 1
+    if is_permanent(exc) or attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        changes = {'status': 'failed'}
+    else:
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+        changes = {'next_attempt_at': timezone.now() + timedelta(seconds=delay)}
+    _model().objects.filter(pk=email.pk).update(
+        attempts=attempts, claimed_by='', last_error=f'{type(exc).__name__}: {exc}', **changes)
+    logger.warning('Email %s to %s failed (attempt %d): %s', email.pk, email.to, attempts, exc)
+    return changes.get('status', 'retrying')
+
+
+def send_batch(emails):
+    """Send claimed messages over one connection, returns a Counter of outcomes"""
+    stats = Counter()
+    connection = get_connection(fail_silently=False)
+    try:
+        for position, email in enumerate(emails):
+            try:
+                # No-op while the session is up; reconnects after a failure closed it
+                connection.open()
+            except Exception as exc:
+                # Server unreachable: the rest of the batch would fail the same way
+                for pending in emails[position:]:
+                    stats[_record_failure(pending, exc)] += 1
+                break
+            try:
+                connection.send_messages([_message(email, connection)])
+            except Exception as exc:
+                stats[_record_failure(email, exc)] += 1
+                close_quietly(connection)
+                continue
+            _model().objects.filter(pk=email.pk).update(
+                status='sent', sent_at=timezone.now(), attempts=email.attempts + 1,
+                claimed_by='', last_error='')
+            stats['sent'] += 1
+    finally:
+        close_quietly(connection)
+    return stats
+
+
+def deliver(batch_size=None):
+    """Send every message that is due, batch by batch"""
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    stats = Counter()
+    while True:
+        emails = claim(batch_size)
+        if not emails:
+            return stats
+        stats.update(send_batch(emails))
@@ -0,0 +1,87 @@
+# core/utils/ratelimit.py
+"""
+Per-client rate limits for public endpoints.
+
+    @ratelimit('contact')
+    def api_contact(request): ...
+
+Each (scope, client IP) gets a fixed-window counter in the default cache,
+RATELIMITS[scope] requests per window (e.g. '5/10m'). Counting is a
+single atomic cache.incr(); only the first request of a window adds the
+key. Requests over the limit get a 429 with Retry-After set to the end of
+the window. If the cache is down the request is let through.
+"""
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.shortcuts import render
+
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'5/10m' -> (5, 600): requests allowed per window of seconds"""
+    match = re.fullmatch(r'(\d+)/(\d*)([smhd])', rate.strip())
+    if not match:
+        raise ValueError(f'Invalid rate {rate!r}, expected e.g. "5/m" or "20/10m"')
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * UNITS[unit]
+
+
+def client_ip(request):
+    """
+    The address the nearest RATELIMIT_PROXY_COUNT proxies saw. Entries
+    further left in X-Forwarded-For come from the client and can be forged.
+    """
+    proxies = settings.RATELIMIT_PROXY_COUNT
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',')]
+        return hops[max(len(hops) - proxies, 0)]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def hit(scope, ident, rate):
+    """Count a request; returns 0 if allowed, else seconds until the window resets"""
+    limit, period = parse_rate(rate)
+    now = time.time()
+    window = int(now // period)
+    key = f'ratelimit:{scope}:{ident}:{window}'
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # First request of the window. add() loses to a concurrent first
+        # request, whose key then exists for incr()
+        count = 1 if cache.add(key, 1, period + 1) else cache.incr(key)
+    if count is None or count <= limit:
+        # None: django-redis with IGNORE_EXCEPTIONS and Redis unreachable
+        return 0
+    return int((window + 1) * period - now) + 1
+
+
+def too_many_requests(request, retry_after):
+    message = 'Too many requests. Please try again later.'
+    if request.content_type == 'application/json':
+        response = JsonResponse({'error': message}, status=429)
+    else:
+        response = render(request, 'core/errors/429.html', status=429)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def ratelimit(scope, methods=('POST',)):
+    """Limit `methods` requests to the view by client IP, at RATELIMITS[scope]"""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATELIMIT_ENABLED and request.method in methods:
+                retry_after = hit(scope, client_ip(request), settings.RATELIMITS[scope])
+                if retry_after:
+                    return too_many_requests(request, retry_after)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
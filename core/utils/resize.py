@@ -0,0 +1,185 @@
+# core/utils/resize.py
+"""
+On-demand resizing of arbitrary media images (CKEditor uploads, post
+content images) behind signed URLs:
+
+    /img/<width>x<height>/<media path>?s=<signature>
+
+Only IMAGE_RESIZE_SIZES may be requested. A height of 0 scales to the
+width; both set crops to fill. The signature is an HMAC of size and path
+keyed on SECRET_KEY, so clients cannot fill the disk with variants.
+
+Renders are cached under MEDIA_ROOT/IMAGE_RESIZE_CACHE_DIR and never
+change for a given URL. Concurrent requests for the same variant wait on
+one file lock, so only the first renders it, across threads and worker
+processes alike.
+"""
+import os
+import posixpath
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import urlencode
+from PIL import Image, ImageOps
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+SIGNATURE_SALT = 'core.utils.resize'
+FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.webp': 'WEBP'}
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 82, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 80, 'method': 5},
+}
+
+# Striped in-process locks; fcntl adds the cross-process part
+_locks = [threading.Lock() for _ in range(64)]
+
+
+class InvalidResize(Exception):
+    pass
+
+
+def sign(size, path):
+    return salted_hmac(SIGNATURE_SALT, f'{size}/{path}').hexdigest()[:20]
+
+
+def resize_url(path, size):
+    """Signed URL for `path` (relative to MEDIA_ROOT) at an allowed `size`"""
+    if size not in settings.IMAGE_RESIZE_SIZES:
+        raise InvalidResize(f'{size} is not in IMAGE_RESIZE_SIZES')
+    width, height = size.split('x')
+    url = reverse('resize_image', args=[int(width), int(height), path])
+    return f"{url}?{urlencode({'s': sign(size, path)})}"
+
+
+def check(width, height, path, signature):
+    """Validate a request, returns the normalised media path"""
+    size = f'{width}x{height}'
+    if size not in settings.IMAGE_RESIZE_SIZES:
+        raise InvalidResize('size not allowed')
+    if not constant_time_compare(signature or '', sign(size, path)):
+        raise InvalidResize('bad signature')
+    normalised = posixpath.normpath(path)
+    if normalised != path or normalised.startswith(('/', '..')):
+        raise InvalidResize('bad path')
+    if posixpath.splitext(path)[1].lower() not in FORMATS:
+        raise InvalidResize('unsupported format')
+    return normalised
+
+
+def cache_path(width, height, path):
+    return os.path.join(settings.MEDIA_ROOT, settings.IMAGE_RESIZE_CACHE_DIR,
+                        f'{width}x{height}', *path.split('/'))
+
+
+def purge_cached(path):
+    """Drop every cached variant of a media path"""
+    root = os.path.join(settings.MEDIA_ROOT, settings.IMAGE_RESIZE_CACHE_DIR)
+    if not os.path.isdir(root):
+        return
+    for size in os.listdir(root):
+        try:
+            os.unlink(cache_path(*size.split('x'), path))
+        except (OSError, TypeError):
+            pass
+
+
+@contextmanager
+def _render_lock(target):
+    with _locks[hash(target) % len(_locks)]:
+        if fcntl is None:
+            yield
+            return
+        # The lock file stays: after an unlink, a process already waiting on
+        # the old file and a newcomer creating a new one would both get a lock
+        with open(f'{target}.lock', 'a') as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def render(source, width, height):
+    """Resized copy of the open image file `source`"""
+    image = ImageOps.exif_transpose(Image.open(source))
+    if height:
+        return ImageOps.fit(image, (width, height), Image.LANCZOS)
+    if image.width > width:
+        image = image.resize(
+            (width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+    return image
+
+
+def get_or_render(width, height, path):
+    """Filesystem path of the cached variant, rendering it at most once"""
+    target = cache_path(width, height, path)
+    if os.path.exists(target):
+        return target
+    if not default_storage.exists(path):
+        raise FileNotFoundError(path)
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with _render_lock(target):
+        # Whoever held the lock before us may have rendered it already
+        if os.path.exists(target):
+            return target
+        fmt = FORMATS[posixpath.splitext(path)[1].lower()]
+        with default_storage.open(path, 'rb') as source:
+            image = render(source, width, height)
+            if fmt == 'JPEG' and image.mode != 'RGB':
+                image = image.convert('RGB')
+            # Write aside and rename so readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.part')
+            try:
+                with os.fdopen(fd, 'wb') as out:
+                    image.save(out, fmt, **SAVE_OPTIONS[fmt])
+                os.replace(tmp, target)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+    return target
+
+
+MEDIA_IMG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+SRC_RE = re.compile(r'\ssrc=(["\'])(?P<src>[^"\']+)\1', re.IGNORECASE)
+
+
+def responsive_content(html, sizes='(max-width: 896px) 100vw, 896px'):
+    """
+    Add srcset/sizes/loading to <img> tags in rich text that point at
+    MEDIA_URL, using the width-only IMAGE_RESIZE_SIZES.
+    """
+    widths = sorted(int(size.split('x')[0]) for size in settings.IMAGE_RESIZE_SIZES
+                    if size.endswith('x0'))
+    media_url = settings.MEDIA_URL
+
+    def rewrite(match):
+        tag = match.group(0)
+        src = SRC_RE.search(tag)
+        if not src or 'srcset' in tag.lower():
+            return tag
+        url = src.group('src')
+        if not url.startswith(media_url):
+            return tag
+        path = unquote(url[len(media_url):])
+        if posixpath.splitext(path)[1].lower() not in FORMATS:
+            return tag
+        srcset = ', '.join(f'{resize_url(path, f"{w}x0")} {w}w' for w in widths)
+        extra = f' srcset="{srcset}" sizes="{sizes}"'
+        if 'loading=' not in tag.lower():
+            extra += ' loading="lazy"'
+        return tag[:src.end()] + extra + tag[src.end():]
+
+    return MEDIA_IMG_RE.sub(rewrite, html)
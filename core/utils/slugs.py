@@ -0,0 +1,159 @@
+# core/utils/slugs.py
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+_SUFFIX_RE = re.compile(r'-(\d+)$')
+
+# How many times save_with_unique_slug re-allocates after losing a race
+SLUG_SAVE_RETRIES = 5
+
+# Longest "-N" suffix allowed for when a long base has to be trimmed to fit
+SLUG_SUFFIX_ROOM = 11
+
+# Number of base slugs folded into a single startswith query by the batch API
+SLUG_QUERY_CHUNK = 100
+
+
+def _slug_field_length(model, field):
+    return model._meta.get_field(field).max_length
+
+
+def _with_suffix(base, number, max_length):
+    """Return base or base-N, trimming base so the result fits max_length"""
+    if number == 0:
+        return base[:max_length]
+    suffix = f"-{number}"
+    return f"{base[:max_length - len(suffix)].rstrip('-')}{suffix}"
+
+
+def _query_prefix(base, max_length):
+    """Prefix shared by base and every base-N, including those with a trimmed base"""
+    return base[:max_length - SLUG_SUFFIX_ROOM].rstrip('-') or base
+
+
+def _collect_taken(values, bases, max_length):
+    """Map every base to the set of suffix numbers already used (0 = bare base)"""
+    taken = {base: set() for base in bases}
+    for value in values:
+        match = _SUFFIX_RE.search(value)
+        number = int(match.group(1)) if match else None
+        for base in bases:
+            if value == base:
+                taken[base].add(0)
+            elif number is not None and value == _with_suffix(base, number, max_length):
+                taken[base].add(number)
+    return taken
+
+
+def _next_free(taken):
+    """Smallest free suffix, preferring the bare slug like the old loop did"""
+    number = 0
+    while number in taken:
+        number += 1
+    return number
+
+
+def unique_slug(model, value, field='slug', max_length=None, exclude_pk=None):
+    """
+    Return a slug for `value` that is not used by any `model` row.
+
+    All existing `slug` / `slug-N` variants are fetched with a single
+    startswith query and the lowest free suffix is picked in memory. The
+    query uses a shortened prefix, so variants whose base was trimmed to
+    make room for the suffix are counted too.
+    """
+    max_length = max_length or _slug_field_length(model, field)
+    base = slugify(value)[:max_length] or 'item'
+
+    queryset = model._default_manager.filter(
+        **{f'{field}__startswith': _query_prefix(base, max_length)})
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    values = queryset.values_list(field, flat=True)
+
+    taken = _collect_taken(values, [base], max_length)[base]
+    return _with_suffix(base, _next_free(taken), max_length)
+
+
+def save_with_unique_slug(instance, source, save, field='slug'):
+    """
+    Allocate a slug for `instance` from `source` and run `save()`.
+
+    The allocation is optimistic: if a concurrent writer grabs the same
+    slug between the lookup and the INSERT, the IntegrityError is caught
+    inside a savepoint and a fresh slug is allocated.
+    """
+    model = type(instance)
+    for attempt in range(SLUG_SAVE_RETRIES):
+        setattr(instance, field, unique_slug(
+            model, source, field=field, exclude_pk=instance.pk))
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            slug_taken = model._default_manager.filter(
+                **{field: getattr(instance, field)}
+            ).exclude(pk=instance.pk).exists()
+            if not slug_taken or attempt == SLUG_SAVE_RETRIES - 1:
+                raise
+
+
+def assign_unique_slugs(instances, source_attr='title', field='slug'):
+    """
+    Fill in slugs for unsaved `instances` in memory before bulk_create().
+
+    Instances that already carry a slug keep it and reserve it. Existing
+    rows are fetched with one startswith query per chunk of distinct base
+    slugs, so thousands of posts with common titles cost a handful of
+    queries instead of one per collision. Returns the instances.
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+
+    model = type(instances[0])
+    max_length = _slug_field_length(model, field)
+
+    pending = []
+    for instance in instances:
+        if not getattr(instance, field):
+            base = slugify(getattr(instance, source_attr))[:max_length] or 'item'
+            pending.append((instance, base))
+
+    bases = sorted({base for _, base in pending})
+    taken = {base: set() for base in bases}
+    for start in range(0, len(bases), SLUG_QUERY_CHUNK):
+        chunk = bases[start:start + SLUG_QUERY_CHUNK]
+        query = reduce(or_, (Q(**{f'{field}__startswith': prefix})
+                       for prefix in {_query_prefix(base, max_length) for base in chunk}))
+        values = model._default_manager.filter(
+            query).values_list(field, flat=True)
+        for base, numbers in _collect_taken(values, chunk, max_length).items():
+            taken[base] |= numbers
+
+    # Slugs preset on the batch itself must not be handed out again
+    preset = [getattr(instance, field)
+              for instance in instances if getattr(instance, field)]
+    for base, numbers in _collect_taken(preset, bases, max_length).items():
+        taken[base] |= numbers
+
+    used = set(preset)
+
+    for instance, base in pending:
+        numbers = taken[base]
+        while True:
+            number = _next_free(numbers)
+            numbers.add(number)
+            slug = _with_suffix(base, number, max_length)
+            # A trimmed base-N can in rare cases clash with another base's slug
+            if slug not in used:
+                break
+        used.add(slug)
+        setattr(instance, field, slug)
+
+    return instances
@@ -0,0 +1,108 @@
+# core/utils/streaming.py
+"""
+Streamed HTML pages (opt-in with HTML_STREAMING).
+
+A TemplateResponse renders the whole page before the first byte is sent.
+render_stream() renders the top-level nodes of the outermost template
+(base.html) one by one instead. The first chunk ends after </head>, so
+the browser starts fetching the stylesheets while {% block content %}
+is still evaluating its querysets. Later chunks are at least
+HTML_STREAM_CHUNK_SIZE characters.
+
+The body is rendered after the middleware has run, so stream_response()
+does up front what the middleware would otherwise do on the way out:
+- It issues the CSRF cookie.
+- It marks pending messages as shown.
+- It keeps the request's replica routing for the queries the body runs.
+An error in the body cannot become a 500 page once the head has been
+sent; the client gets a truncated page.
+"""
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.http import StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.template.base import TextNode
+from django.template.context import make_context
+from django.template.loader import select_template
+from django.template.loader_tags import (BLOCK_CONTEXT_KEY, BlockContext, BlockNode,
+                                         ExtendsNode)
+
+from core.routers import current_routing, end_request, start_request
+
+
+def _render_nodes(template, context):
+    """Output of `template`'s top-level nodes, following {% extends %} to the root"""
+    for node in template.nodelist:
+        if not isinstance(node, ExtendsNode):
+            yield node.render_annotated(context)
+            continue
+        # ExtendsNode.render(), with the parent's nodes rendered one at a time
+        parent = node.get_parent(context)
+        if BLOCK_CONTEXT_KEY not in context.render_context:
+            context.render_context[BLOCK_CONTEXT_KEY] = BlockContext()
+        block_context = context.render_context[BLOCK_CONTEXT_KEY]
+        block_context.add_blocks(node.blocks)
+        for parent_node in parent.nodelist:
+            if not isinstance(parent_node, TextNode):
+                if not isinstance(parent_node, ExtendsNode):
+                    block_context.add_blocks({
+                        block.name: block
+                        for block in parent.nodelist.get_nodes_by_type(BlockNode)})
+                break
+        with context.render_context.push_state(parent, isolated_context=False):
+            yield from _render_nodes(parent, context)
+
+
+def render_stream(template, context=None, request=None, chunk_size=None):
+    """Render a template from get_template() as a generator of str chunks"""
+    chunk_size = chunk_size or settings.HTML_STREAM_CHUNK_SIZE
+    context = make_context(context, request, autoescape=template.backend.engine.autoescape)
+    template = template.template
+    buffer, size, head_sent = [], 0, False
+    with context.render_context.push_state(template):
+        with context.bind_template(template):
+            context.template_name = template.name
+            for output in _render_nodes(template, context):
+                buffer.append(output)
+                size += len(output)
+                flush = size >= chunk_size
+                if not head_sent and '</head>' in output:
+                    head_sent = flush = True
+                if flush:
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_response(request, template_names, context=None, **response_kwargs):
+    """StreamingHttpResponse of the first of `template_names` that exists"""
+    if isinstance(template_names, str):
+        template_names = [template_names]
+    template = select_template(template_names)
+    get_token(request)
+    # Iterating marks them shown, so MessageMiddleware drops them from storage
+    list(get_messages(request))
+    use_replica = current_routing()
+
+    def body():
+        token = None if use_replica is None else start_request(use_replica)
+        try:
+            yield from render_stream(template, context, request)
+        finally:
+            if token is not None:
+                end_request(token)
+
+    return StreamingHttpResponse(body(), **response_kwargs)
+
+
+class StreamingTemplateResponseMixin:
+    """Streams the page of a sync template view when HTML_STREAMING is on"""
+
+    def render_to_response(self, context, **response_kwargs):
+        # Async variants evaluate everything before rendering: nothing to overlap
+        if not settings.HTML_STREAMING or self.view_is_async:
+            return super().render_to_response(context, **response_kwargs)
+        response_kwargs.setdefault('content_type', self.content_type)
+        return stream_response(self.request, self.get_template_names(), context,
+                               **response_kwargs)
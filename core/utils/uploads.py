@@ -0,0 +1,172 @@
+# core/utils/uploads.py
+"""
+Validate file uploads while they stream in instead of after Django has
+buffered them.
+
+ValidatingUploadHandler replaces the default upload handlers for one view.
+For every file field with an UploadRule it:
+
+* rejects the part as soon as it passes ``max_size`` (or up front when the
+  part declares a larger Content-Length);
+* sniffs the real type from the first bytes and rejects files whose
+  content does not match an allowed extension;
+* hashes the content on the fly (``uploaded_file.sha256``);
+* writes to UPLOAD_STAGING_DIR, which lives on the same filesystem as
+  MEDIA_ROOT so FileSystemStorage renames the file into place instead of
+  copying it.
+
+Rejections are collected in ``request.upload_errors`` for the form to show.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopUpload
+from django.template.defaultfilters import filesizeformat
+
+# Bytes collected before sniffing the type
+SNIFF_BYTES = 512
+
+SIGNATURES = [
+    ('pdf', b'%PDF-'),
+    ('doc', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'),  # OLE2 compound file
+    ('zip', b'PK\x03\x04'),
+    ('jpeg', b'\xff\xd8\xff'),
+    ('png', b'\x89PNG\r\n\x1a\n'),
+]
+EXTENSION_TYPES = {
+    '.pdf': 'pdf', '.doc': 'doc', '.docx': 'docx',
+    '.jpg': 'jpeg', '.jpeg': 'jpeg', '.png': 'png',
+}
+
+
+@dataclass(frozen=True)
+class UploadRule:
+    max_size: int
+    extensions: tuple
+
+    def describe(self):
+        return ', '.join(ext.lstrip('.').upper() for ext in self.extensions)
+
+
+def sniff_type(head):
+    """File type from its leading bytes, or None when unrecognised"""
+    for kind, magic in SIGNATURES:
+        if head.startswith(magic):
+            if kind == 'zip' and b'[Content_Types].xml' in head:
+                return 'docx'  # Office Open XML package
+            return kind
+    return None
+
+
+def check_upload(uploaded_file, rule):
+    """Error message for a file that breaks `rule`, or None"""
+    extension = os.path.splitext(uploaded_file.name)[1].lower()
+    if extension not in rule.extensions:
+        return f'Unsupported file format. Allowed: {rule.describe()}.'
+    if uploaded_file.size > rule.max_size:
+        return f'File size must be under {filesizeformat(rule.max_size)}.'
+
+    detected = getattr(uploaded_file, 'detected_type', None)
+    if detected is None:
+        # Not streamed through ValidatingUploadHandler: sniff now
+        uploaded_file.seek(0)
+        detected = sniff_type(uploaded_file.read(SNIFF_BYTES))
+        uploaded_file.seek(0)
+    if detected != EXTENSION_TYPES.get(extension):
+        return "The file's content does not match its extension."
+    return None
+
+
+class StagedUploadedFile(TemporaryUploadedFile):
+    """Temporary upload created in UPLOAD_STAGING_DIR"""
+
+    def __init__(self, name, content_type, size, charset, content_type_extra=None):
+        os.makedirs(settings.UPLOAD_STAGING_DIR, exist_ok=True)
+        _, ext = os.path.splitext(name)
+        file = tempfile.NamedTemporaryFile(
+            suffix='.upload' + ext, dir=settings.UPLOAD_STAGING_DIR)
+        UploadedFile.__init__(self, file, name, content_type, size, charset,
+                              content_type_extra)
+        self.sha256 = None
+        self.detected_type = None
+
+
+class _Discarded:
+    """Stands in for the file of a skipped part; the parser closes it"""
+
+    def close(self):
+        pass
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    def __init__(self, request, rules, overhead=1024 * 1024):
+        super().__init__(request)
+        self.rules = rules
+        # Whole request budget: every file at its limit plus the form fields
+        self.max_request_size = sum(rule.max_size for rule in rules.values()) + overhead
+        self.errors = {}
+        self.received = 0
+        request.upload_errors = self.errors
+
+    def new_file(self, field_name, file_name, content_type, content_length,
+                 charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length,
+                         charset, content_type_extra)
+        self.rule = self.rules.get(field_name)
+        # Never leave the previous, completed file here: skipping closes it
+        self.file = _Discarded()
+        if self.rule is None:
+            raise SkipFile()
+        if os.path.splitext(file_name)[1].lower() not in self.rule.extensions:
+            self.reject(f'Unsupported file format. Allowed: {self.rule.describe()}.')
+        if content_length and content_length > self.rule.max_size:
+            self.reject(f'File size must be under {filesizeformat(self.rule.max_size)}.')
+        self.file = StagedUploadedFile(file_name, content_type, 0, charset, content_type_extra)
+        self.digest = hashlib.sha256()
+        self.head = b''
+
+    def reject(self, message):
+        self.errors[self.field_name] = message
+        raise SkipFile()
+
+    def sniff(self):
+        """Error message when the leading bytes do not fit the rule"""
+        self.file.detected_type = sniff_type(self.head)
+        extension = os.path.splitext(self.file_name)[1].lower()
+        if self.file.detected_type != EXTENSION_TYPES.get(extension):
+            return "The file's content does not match its extension."
+        return None
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_request_size:
+            self.errors.setdefault(self.field_name, 'The upload is too large.')
+            raise StopUpload(connection_reset=True)
+        if start + len(raw_data) > self.rule.max_size:
+            self.reject(f'File size must be under {filesizeformat(self.rule.max_size)}.')
+
+        if self.file.detected_type is None and len(self.head) < SNIFF_BYTES:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                error = self.sniff()
+                if error:
+                    self.reject(error)
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.file.detected_type is None:
+            # Smaller than SNIFF_BYTES; too late for SkipFile here
+            error = self.sniff()
+            if error:
+                self.errors[self.field_name] = error
+                self.file.close()
+                return None
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.digest.hexdigest()
+        return self.file
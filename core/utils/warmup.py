@@ -0,0 +1,94 @@
+# core/utils/warmup.py
+"""
+Process warm-up for application servers.
+
+A fresh worker otherwise pays on its first requests for compiling the
+templates it renders, populating the URL resolver (which imports every
+view module) and opening its database connections. warm_up() does all of
+that up front; gunicorn.conf.py runs it once in the master before forking
+(without the database, so the compiled state is shared copy-on-write) and
+again in every worker after the fork.
+
+Templates are compiled through the engines' cached loaders, so the
+compiled objects are the ones later requests get back from get_template().
+"""
+import logging
+import os
+import time
+
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.urls import URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def template_names(backend):
+    """Every template name the backend's loaders can find, first directory wins"""
+    names = {}
+    for loader in backend.engine.template_loaders:
+        for directory in (loader.get_dirs() if hasattr(loader, 'get_dirs') else []):
+            directory = str(directory)
+            for root, _dirs, files in os.walk(directory):
+                for filename in files:
+                    if filename.endswith(TEMPLATE_EXTENSIONS):
+                        name = os.path.relpath(os.path.join(root, filename), directory)
+                        names.setdefault(name.replace(os.sep, '/'), directory)
+    return sorted(names)
+
+
+def compile_templates():
+    """Load every template into the cached loaders, returns the number compiled"""
+    compiled = 0
+    for backend in engines.all():
+        if not hasattr(backend, 'engine'):
+            continue
+        for name in template_names(backend):
+            try:
+                backend.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError) as exc:
+                # Fragments of other engines or broken third-party templates
+                logger.debug('Skipped template %s: %s', name, exc)
+                continue
+            compiled += 1
+    return compiled
+
+
+def _url_patterns(resolver):
+    for pattern in resolver.url_patterns:
+        yield pattern
+        if isinstance(pattern, URLResolver):
+            yield from _url_patterns(pattern)
+
+
+def resolve_urls():
+    """Import every urlconf and compile every pattern, returns the number of patterns"""
+    resolver = get_resolver()
+    # Builds the reverse() lookup tables for the active language
+    resolver.reverse_dict
+    count = 0
+    for pattern in _url_patterns(resolver):
+        # Compiled lazily and cached on the pattern
+        pattern.pattern.regex
+        count += 1
+    return count
+
+
+def connect_databases():
+    """Open this thread's connection to every database, returns how many"""
+    for connection in connections.all():
+        connection.ensure_connection()
+    return len(connections.all())
+
+
+def warm_up(database=True):
+    """Compile templates, resolve URLs and optionally connect; returns the counts"""
+    started = time.perf_counter()
+    counts = {'templates': compile_templates(), 'urls': resolve_urls()}
+    if database:
+        counts['databases'] = connect_databases()
+    logger.info('Warmed up in %.0f ms: %s', (time.perf_counter() - started) * 1000,
+                ', '.join(f'{count} {name}' for name, count in counts.items()))
+    return counts
@@ -1,5 +1,5 @@
 import os
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.conf import settings
 from django.shortcuts import render, get_object_or_404
 from django.core.cache import cache
@@ -18,40 +18,61 @@ from publications.models import Publication
 from vacancies.models import Vacancy
 from contacts.models import Subscriber
 from contacts.forms import SubscriptionForm
+from .metrics import collect as collect_metrics
+from .utils import resize
+from .utils.asyncviews import aevaluate
+from .utils.ratelimit import ratelimit
 
 from django.http import Http404
+from django.utils.crypto import constant_time_compare
 from django.utils import timezone
 
 
 class HomeView(TemplateView):
     template_name = 'core/home.html'
+    cache_key = 'home_page_data'
+    cache_timeout = 60 * 15  # Cache for 15 minutes
+
+    def get_home_data(self):
+        return {
+            'slider_images': SliderImage.objects.filter(is_active=True).order_by('order'),
+            'recent_news': Post.objects.filter(
+                post_type='news',
+                status='published',
+            ).order_by('-published_date')[:4],
+            'guiding_principles': GuidingPrinciple.objects.all()[:6],
+            'partners': Partner.objects.filter(is_active=True),
+            'featured_publications': Publication.objects.filter(
+                is_featured=True
+            )[:4],
+        }
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         # Get cached data or compute
-        cache_key = 'home_page_data'
-        data = cache.get(cache_key)
+        data = cache.get(self.cache_key)
 
         if not data:
-            data = {
-                'slider_images': SliderImage.objects.filter(is_active=True).order_by('order'),
-                'recent_news': Post.objects.filter(
-                    post_type='news',
-                    status='published',
-                ).order_by('-published_date')[:4],
-                'guiding_principles': GuidingPrinciple.objects.all()[:6],
-                'partners': Partner.objects.filter(is_active=True),
-                'featured_publications': Publication.objects.filter(
-                    is_featured=True
-                )[:4],
-            }
-            cache.set(cache_key, data, 60 * 15)  # Cache for 15 minutes
+            data = self.get_home_data()
+            cache.set(self.cache_key, data, self.cache_timeout)
 
         context.update(data)
         return context
 
 
+class AsyncHomeView(HomeView):
+    async def get(self, request, *args, **kwargs):
+        # HomeView.get_context_data() would use the blocking cache calls
+        context = super(HomeView, self).get_context_data(**kwargs)
+        data = await cache.aget(self.cache_key)
+        if not data:
+            data = await aevaluate(self.get_home_data())
+            await cache.aset(self.cache_key, data, self.cache_timeout)
+        context.update(data)
+        return self.render_to_response(context)
+
+
 class WhoWeAreView(TemplateView):
     template_name = 'core/about/who_we_are.html'
 
@@ -153,6 +174,7 @@ class WhatWeDoView(TemplateView):
 
 @csrf_exempt
 @require_POST
+@ratelimit('newsletter')
 def subscribe_newsletter(request):
     """API endpoint for newsletter subscription"""
     try:
@@ -189,6 +211,28 @@ def subscribe_newsletter(request):
     except Exception as e:
         return JsonResponse({'error': 'An error occurred. Please try again.'}, status=500)
 
+def metrics(request):
+    """Runtime metrics (DB pool size and wait times) for staff or a bearer token"""
+    token = settings.METRICS_TOKEN
+    authorized = request.user.is_staff or (token and constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}'))
+    if not authorized:
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    return JsonResponse(collect_metrics())
+
+
+def resize_image(request, width, height, path):
+    """Signed on-demand resize of a media image, cached on disk"""
+    try:
+        path = resize.check(width, height, path, request.GET.get('s'))
+        target = resize.get_or_render(width, height, path)
+    except (resize.InvalidResize, FileNotFoundError):
+        raise Http404('Image not found')
+    response = FileResponse(open(target, 'rb'))
+    # The URL is signed and its output never changes
+    response['Cache-Control'] = f'public, max-age={60 * 60 * 24 * 365}, immutable'
+    return response
+
 # Custom error handlers
 
 
@@ -273,6 +317,7 @@ class SearchView(ListView):
         publications = Publication.objects.filter(
             Q(title__icontains=query) |
             Q(description__icontains=query) |
+            Q(text_content__icontains=query) |
             Q(category__name__icontains=query)
         )
 
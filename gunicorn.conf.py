@@ -0,0 +1,58 @@
+"""
+Gunicorn configuration, picked up automatically from the project root:
+
+    gunicorn EIP.wsgi:application
+
+The application is imported once in the master (preload_app), then the
+master compiles templates and resolves URLs and freezes the garbage
+collector, so forked workers share those pages copy-on-write. Every worker
+repeats the warm-up after the fork, which also opens its database
+connection, before it accepts a request. Workers are recycled after
+GUNICORN_MAX_REQUESTS requests, plus jitter, so they do not all restart at
+once.
+"""
+import gc
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'EIP.settings')
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))  # 0 = never recycle
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+WARMUP = os.getenv('GUNICORN_WARMUP', 'True') == 'True'
+
+
+def when_ready(server):
+    # Master, after preloading and before the first fork
+    if preload_app and WARMUP:
+        from core.utils.warmup import warm_up
+        warm_up(database=False)
+    if preload_app:
+        # Keep the collector from touching (and so copying) the shared objects
+        gc.freeze()
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # A connection opened by import code must not be shared between processes
+        from django.db import connections
+        connections.close_all()
+
+
+def post_fork(server, worker):
+    if preload_app and WARMUP:
+        from core.utils.warmup import warm_up
+        warm_up()
+
+
+def post_worker_init(worker):
+    # Without preload_app the application is only imported at this point
+    if not preload_app and WARMUP:
+        from core.utils.warmup import warm_up
+        warm_up()
@@ -17,12 +17,12 @@ class PublicationCategoryAdmin(admin.ModelAdmin):
 @admin.register(Publication)
 class PublicationAdmin(admin.ModelAdmin):
     list_display = ('title', 'category', 'published_date',
-                    'download_count', 'is_featured', 'cover_preview')
+                    'view_count', 'download_count', 'is_featured', 'cover_preview')
     list_filter = ('category', 'is_featured', 'published_date')
     list_editable = ('is_featured',)
     search_fields = ('title', 'description')
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ('download_count', 'published_date')
+    readonly_fields = ('view_count', 'download_count', 'published_date', 'ingest_error')
     date_hierarchy = 'published_date'
 
     fieldsets = (
@@ -30,13 +30,13 @@ class PublicationAdmin(admin.ModelAdmin):
             'fields': ('title', 'slug', 'category', 'description')
         }),
         ('Files', {
-            'fields': ('cover_image', 'file')
+            'fields': ('cover_image', 'file', 'ingest_error')
         }),
         ('Publication', {
             'fields': ('is_featured', 'published_date')
         }),
         ('Statistics', {
-            'fields': ('download_count',)
+            'fields': ('view_count', 'download_count')
         }),
     )
 
@@ -0,0 +1,165 @@
+"""
+Post-save ingestion of publication PDFs: searchable text, a rendered
+cover when none was uploaded, and a fixed-size WebP thumbnail.
+
+PUBLICATION_INGEST_MODE picks where the work runs:
+
+* ``'background'`` (default): a local process pool, so a large PDF never
+  holds up the admin request that uploaded it.
+* ``'sync'``: inline after the transaction commits (tests, management
+  commands).
+* ``'off'``: disabled.
+"""
+import functools
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+
+from core.utils import images
+
+from . import pdf
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded web worker can deadlock the child
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PUBLICATION_INGEST_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+    return _pool
+
+
+def schedule(publication):
+    """Process `publication` once the current transaction has committed"""
+    mode = settings.PUBLICATION_INGEST_MODE
+    if mode == 'off' or not publication.file:
+        return
+    run = process if mode == 'sync' else submit
+    transaction.on_commit(functools.partial(run, publication.pk))
+
+
+def _local_copy(field_file, temps):
+    """Filesystem path for a stored file, downloading remote files first"""
+    try:
+        return field_file.path
+    except NotImplementedError:
+        suffix = os.path.splitext(field_file.name)[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            with field_file.storage.open(field_file.name, 'rb') as source:
+                shutil.copyfileobj(source, tmp)
+        temps.append(tmp.name)
+        return tmp.name
+
+
+def _inputs(pk):
+    from .models import Publication
+
+    publication = Publication.objects.filter(pk=pk).first()
+    if publication is None or not publication.file:
+        return None
+    temps = []
+    pdf_path = _local_copy(publication.file, temps)
+    cover_path = _local_copy(
+        publication.cover_image, temps) if publication.cover_image else None
+    return publication.file.name, pdf_path, cover_path, temps
+
+
+def _cleanup(temps):
+    for path in temps:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def process(pk):
+    """Run the pipeline for one publication in this process"""
+    inputs = _inputs(pk)
+    if inputs is None:
+        return
+    file_name, pdf_path, cover_path, temps = inputs
+    try:
+        save_result(pk, file_name, pdf.process_pdf(pdf_path, cover_path))
+    except Exception as exc:
+        logger.exception('Publication %s: ingestion failed', pk)
+        record_failure(pk, file_name, exc)
+    finally:
+        _cleanup(temps)
+
+
+def submit(pk):
+    """Hand the PDF work for one publication to the process pool"""
+    inputs = _inputs(pk)
+    if inputs is None:
+        return None
+    file_name, pdf_path, cover_path, temps = inputs
+    future = get_pool().submit(pdf.process_pdf, pdf_path, cover_path)
+    future.add_done_callback(
+        functools.partial(_on_done, pk, file_name, temps))
+    return future
+
+
+def _on_done(pk, file_name, temps, future):
+    # Runs on the pool's result thread, which has its own DB connection
+    try:
+        save_result(pk, file_name, future.result())
+    except Exception as exc:
+        logger.exception('Publication %s: ingestion failed', pk)
+        record_failure(pk, file_name, exc)
+    finally:
+        _cleanup(temps)
+        connection.close()
+
+
+def record_failure(pk, file_name, exc):
+    """Keep the error on the row, unless the file was replaced meanwhile"""
+    from .models import Publication
+
+    Publication.objects.filter(pk=pk, file=file_name).update(
+        ingest_error=f'{type(exc).__name__}: {exc}'[:1000])
+
+
+def save_result(pk, file_name, result):
+    from .models import Publication
+
+    publication = Publication.objects.filter(pk=pk).first()
+    if publication is None or publication.file.name != file_name:
+        # Deleted or replaced while we were working; the new file has its own job
+        return
+    storage = publication.file.storage
+    base = publication.slug or str(pk)
+    updates = {'text_content': result['text'], 'ingest_error': ''}
+
+    if result['cover'] and not publication.cover_image:
+        updates['cover_image'] = storage.save(
+            f'publication_covers/{base}.jpg', ContentFile(result['cover']))
+        updates['cover_generated'] = True
+        updates.update(images.metadata_columns(
+            'cover_image', images.read_metadata(storage, updates['cover_image'])))
+    if result['thumbnail']:
+        if publication.thumbnail:
+            storage.delete(publication.thumbnail.name)
+        updates['thumbnail'] = storage.save(
+            f'publication_thumbnails/{base}.webp', ContentFile(result['thumbnail']))
+
+    # update() rather than save(): no second ingestion round, no file cleanup
+    Publication.objects.filter(pk=pk).update(**updates)
+    if 'cover_image' in updates:
+        images.schedule(storage, updates['cover_image'],
+                        images.sizes_for(Publication, 'cover_image'))
@@ -0,0 +1,29 @@
+from concurrent.futures import wait
+
+from django.core.management.base import BaseCommand
+
+from publications import ingest
+from publications.models import Publication
+
+
+class Command(BaseCommand):
+    help = 'Extract text and build covers/thumbnails for publications on the local process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Reprocess every publication, not only those without a '
+                                 'thumbnail and without a recorded failure')
+
+    def handle(self, *args, **options):
+        queryset = Publication.objects.exclude(file='')
+        if not options['all']:
+            queryset = queryset.filter(thumbnail='', ingest_error='')
+
+        futures = [ingest.submit(pk) for pk in queryset.values_list('pk', flat=True)]
+        futures = [future for future in futures if future is not None]
+        wait(futures)
+        # Results are saved by done-callbacks; shutdown waits for them too
+        ingest.get_pool().shutdown(wait=True)
+        failed = sum(1 for future in futures if future.exception())
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {len(futures) - failed} publication(s), {failed} failed'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
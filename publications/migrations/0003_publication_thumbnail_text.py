@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publications', '0002_publication_view_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='text_content',
+            field=models.TextField(blank=True, editable=False, help_text='Text extracted from the PDF for search'),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='publication_thumbnails/'),
+        ),
+        migrations.AlterField(
+            model_name='publication',
+            name='cover_image',
+            field=models.ImageField(blank=True, help_text='Optional. Rendered from the first PDF page when left empty', upload_to='publication_covers/'),
+        ),
+    ]
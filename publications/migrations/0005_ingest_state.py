@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('publications', '0004_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='cover_generated',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='ingest_error',
+            field=models.TextField(blank=True, editable=False, help_text='Why processing the current PDF failed. Upload a new file or run `manage.py process_publications --all` to retry'),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
 from ckeditor.fields import RichTextField
 
+from core.utils.images import DerivativeImagesMixin, ImageMetadataMixin
+
+from . import ingest
+
 
 class PublicationCategory(models.Model):
     name = models.CharField(max_length=100)
@@ -10,16 +14,72 @@ class PublicationCategory(models.Model):
         return self.name
 
 
-class Publication(models.Model):
+class Publication(ImageMetadataMixin, DerivativeImagesMixin, models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     description = RichTextField()
     category = models.ForeignKey(PublicationCategory, on_delete=models.CASCADE)
     file = models.FileField(upload_to='publications/')
-    cover_image = models.ImageField(upload_to='publication_covers/')
+    cover_image = models.ImageField(
+        upload_to='publication_covers/', blank=True,
+        help_text="Optional. Rendered from the first PDF page when left empty")
+    cover_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    cover_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    cover_image_size = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    cover_image_color = models.CharField(max_length=7, blank=True, editable=False)
+    cover_image_placeholder = models.TextField(blank=True, editable=False)
+    # Rendered from the PDF rather than uploaded, so replacing the PDF replaces it
+    cover_generated = models.BooleanField(default=False, editable=False)
+    thumbnail = models.ImageField(
+        upload_to='publication_thumbnails/', blank=True, editable=False)
+    text_content = models.TextField(
+        blank=True, editable=False, help_text="Text extracted from the PDF for search")
+    ingest_error = models.TextField(
+        blank=True, editable=False,
+        help_text="Why processing the current PDF failed. Upload a new file or run "
+                  "`manage.py process_publications --all` to retry")
+    view_count = models.PositiveIntegerField(default=0)
     download_count = models.PositiveIntegerField(default=0)
     published_date = models.DateField(auto_now_add=True)
     is_featured = models.BooleanField(default=False)
 
     class Meta:
         ordering = ['-published_date']
+
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        previous = None
+        if self.pk:
+            previous = Publication.objects.filter(pk=self.pk).values(
+                'file', 'cover_image').first()
+        file_changed = previous is None or previous['file'] != self.file.name
+        cover_changed = previous is not None and previous['cover_image'] != self.cover_image.name
+        if cover_changed:
+            # Uploaded or cleared by an editor
+            self.cover_generated = False
+        elif file_changed and self.cover_generated:
+            # Rendered from the old PDF: ingestion renders the new one
+            self.cover_image = ''
+            self.cover_generated = False
+        if file_changed:
+            self.ingest_error = ''
+        super().save(*args, **kwargs)
+
+        # Extract text and (re)build cover/thumbnail when the files changed.
+        # A failed run is recorded in ingest_error rather than retried on
+        # every later save.
+        if file_changed or cover_changed:
+            ingest.schedule(self)
+
+    @classmethod
+    def after_bulk_create(cls, publications):
+        """
+        Apply the save() side effects (PDF ingestion) to publications that
+        were written with bulk_create()
+        """
+        for publication in publications:
+            # Rows imported with a thumbnail or a recorded failure were processed already
+            if not publication.thumbnail and not publication.ingest_error:
+                ingest.schedule(publication)
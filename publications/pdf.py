@@ -0,0 +1,82 @@
+"""
+PDF processing that runs inside the ingestion process pool.
+
+Nothing here touches Django: pool workers are spawned fresh and only
+import this module, so they start quickly and never share DB connections
+with the web process.
+"""
+import io
+
+# Card image on publications/list.html (w-full h-48), 2x for retina screens
+THUMBNAIL_SIZE = (640, 384)
+THUMBNAIL_QUALITY = 80
+COVER_WIDTH = 1200
+# Keep the stored search text bounded for very long reports
+MAX_TEXT_CHARS = 500_000
+
+
+def extract_text(pdf):
+    parts, length = [], 0
+    for index in range(len(pdf)):
+        page = pdf[index]
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        parts.append(text)
+        length += len(text)
+        if length >= MAX_TEXT_CHARS:
+            break
+    return ' '.join(' '.join(parts).split())[:MAX_TEXT_CHARS]
+
+
+def render_first_page(pdf):
+    page = pdf[0]
+    try:
+        scale = COVER_WIDTH / page.get_width()
+        bitmap = page.render(scale=scale)
+        return bitmap.to_pil().convert('RGB')
+    finally:
+        page.close()
+
+
+def encode(image, fmt, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def make_thumbnail(image):
+    from PIL import ImageOps
+
+    thumbnail = ImageOps.fit(image.convert('RGB'), THUMBNAIL_SIZE,
+                             centering=(0.5, 0.0))
+    return encode(thumbnail, 'WEBP', quality=THUMBNAIL_QUALITY, method=6)
+
+
+def process_pdf(pdf_path, cover_path=None):
+    """
+    Return the searchable text, a rendered JPEG cover (only when no
+    cover_path is given) and a WebP thumbnail of whichever cover is used.
+    """
+    import pypdfium2 as pdfium
+    from PIL import Image
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        text = extract_text(pdf)
+        cover = None
+        if cover_path:
+            with Image.open(cover_path) as image:
+                thumbnail = make_thumbnail(image)
+        elif len(pdf):
+            image = render_first_page(pdf)
+            cover = encode(image, 'JPEG', quality=85, optimize=True)
+            thumbnail = make_thumbnail(image)
+        else:
+            thumbnail = None
+    finally:
+        pdf.close()
+    return {'text': text, 'cover': cover, 'thumbnail': thumbnail}
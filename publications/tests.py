@@ -1,3 +1,252 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+from importlib.util import find_spec
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.utils.counters import counters
+from .models import Publication, PublicationCategory
+
+
+@override_settings(COUNTER_FLUSH_INTERVAL=3600, COUNTER_FLUSH_THRESHOLD=1000)
+class PublicationCounterTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.media = override_settings(MEDIA_ROOT=media_root)
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+        counters.flush()
+        category = PublicationCategory.objects.create(name='Reports', slug='reports')
+        self.publication = Publication.objects.create(
+            title='Annual Report', slug='annual-report', description='<p>d</p>',
+            category=category, file='publications/report.pdf',
+            cover_image='publication_covers/report.jpg')
+
+    def tearDown(self):
+        counters.flush()
+
+    def test_views_and_downloads_are_counted_separately(self):
+        self.client.get(reverse('publication_detail', args=['annual-report']))
+        self.client.get(reverse('publication_detail', args=['annual-report']))
+        self.assertEqual(counters.pending(Publication, self.publication.pk, 'view_count'), 2)
+        self.assertEqual(counters.pending(Publication, self.publication.pk, 'download_count'), 0)
+
+        counters.flush()
+        self.publication.refresh_from_db()
+        self.assertEqual(self.publication.view_count, 2)
+        self.assertEqual(self.publication.download_count, 0)
+
+    def test_detail_view_does_not_write(self):
+        with self.assertNumQueries(0):
+            counters.incr(Publication, self.publication.pk, 'view_count')
+        self.client.get(reverse('publication_detail', args=['annual-report']))
+        self.publication.refresh_from_db()
+        self.assertEqual(self.publication.view_count, 0)
+
+    def test_flush_batches_rows_with_equal_increments(self):
+        other = Publication.objects.create(
+            title='Brief', slug='brief', description='d',
+            category=self.publication.category, file='publications/brief.pdf',
+            cover_image='publication_covers/brief.jpg')
+        for pk in (self.publication.pk, other.pk):
+            counters.incr(Publication, pk, 'download_count', 3)
+
+        with self.assertNumQueries(3):  # SAVEPOINT, one UPDATE, RELEASE
+            self.assertEqual(counters.flush(), 1)
+        other.refresh_from_db()
+        self.assertEqual(other.download_count, 3)
+
+
+class PublicationDownloadTests(TestCase):
+    payload = bytes(range(256)) * 40  # 10 KiB
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.media = override_settings(MEDIA_ROOT=media_root)
+        self.media.enable()
+        self.addCleanup(self.media.disable)
+
+        category = PublicationCategory.objects.create(name='Reports', slug='reports')
+        self.publication = Publication(
+            title='Report', slug='report', description='d', category=category,
+            cover_image='publication_covers/report.jpg')
+        self.publication.file.save('report.pdf', ContentFile(self.payload))
+        self.url = reverse('download_publication', args=['report'])
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_download_advertises_ranges(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response['ETag'])
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="report.pdf"')
+        self.assertEqual(self.body(response), self.payload)
+
+    def test_range_returns_partial_content(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.payload)}')
+        self.assertEqual(self.body(response), self.payload[100:200])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(self.body(response), self.payload[-10:])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=999999-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.payload)}')
+
+    def test_if_range_with_stale_etag_sends_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_resumed_download_counts_once(self):
+        counters.flush()
+        self.client.get(self.url)
+        self.client.get(self.url, HTTP_RANGE='bytes=5000-')
+        self.assertEqual(
+            counters.pending(Publication, self.publication.pk, 'download_count'), 1)
+        counters.flush()
+
+    @override_settings(FILE_DOWNLOAD_MODE='x-accel', X_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_x_accel_redirect_resolves_to_the_stored_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, b'')
+        location = response['X-Accel-Redirect']
+        self.assertTrue(location.startswith('/protected-media/'))
+
+        # Stand-in for nginx: `location /protected-media/ { internal; alias MEDIA_ROOT/; }`
+        path = os.path.join(settings.MEDIA_ROOT, location[len('/protected-media/'):])
+        with open(path, 'rb') as fh:
+            self.assertEqual(fh.read(), self.payload)
+
+    @override_settings(FILE_DOWNLOAD_MODE='x-sendfile')
+    def test_x_sendfile_points_at_absolute_path(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Sendfile'], self.publication.file.path)
+
+
+def make_pdf(text):
+    """Smallest valid one-page PDF showing `text` in Helvetica"""
+    stream = f'BT /F1 24 Tf 72 720 Td ({text}) Tj ET'.encode()
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    out, offsets = bytearray(b'%PDF-1.4\n'), []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, xref)
+    return bytes(out)
+
+
+@skipUnless(find_spec('pypdfium2'), 'pypdfium2 is not installed')
+@override_settings(PUBLICATION_INGEST_MODE='sync', IMAGE_DERIVATIVES_MODE='sync')
+class PublicationIngestTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.category = PublicationCategory.objects.create(name='Reports', slug='reports')
+
+    def create(self, content=None, **kwargs):
+        publication = Publication(title='Land Report', slug='land-report',
+                                  description='d', category=self.category, **kwargs)
+        self.replace_file(publication, content or make_pdf('Pastoralist land tenure'))
+        return publication
+
+    def replace_file(self, publication, content):
+        publication.file.save('land.pdf', ContentFile(content), save=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            publication.save()
+        publication.refresh_from_db()
+
+    def read_cover(self, publication):
+        with publication.cover_image.open('rb') as cover:
+            return cover.read()
+
+    def test_text_cover_and_thumbnail_are_generated(self):
+        from PIL import Image
+
+        publication = self.create()
+        self.assertIn('Pastoralist land tenure', publication.text_content)
+        self.assertTrue(publication.cover_image.name.endswith('.jpg'))
+        self.assertIn('<picture>', self.client.get(
+            reverse('publication_detail', args=[publication.slug])).content.decode())
+        counters.flush()
+        with Image.open(publication.thumbnail.path) as thumbnail:
+            self.assertEqual(thumbnail.format, 'WEBP')
+            self.assertEqual(thumbnail.size, (640, 384))
+
+        response = self.client.get(reverse('publications_list'), {'q': 'pastoralist'})
+        self.assertContains(response, 'Land Report')
+
+    def test_uploaded_cover_is_kept(self):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (300, 400), 'red').save(buffer, 'JPEG')
+        cover = ContentFile(buffer.getvalue(), name='mine.jpg')
+        publication = self.create(cover_image=cover)
+        self.assertTrue(publication.cover_image.name.startswith('publication_covers/mine'))
+        self.assertTrue(publication.thumbnail)
+
+        self.replace_file(publication, make_pdf('Rangeland water points'))
+        self.assertTrue(publication.cover_image.name.startswith('publication_covers/mine'))
+        self.assertFalse(publication.cover_generated)
+
+    def test_new_pdf_replaces_the_rendered_cover(self):
+        publication = self.create()
+        self.assertTrue(publication.cover_generated)
+        old_cover = self.read_cover(publication)
+
+        self.replace_file(publication, make_pdf('Rangeland water points'))
+        self.assertIn('Rangeland water points', publication.text_content)
+        self.assertTrue(publication.cover_generated)
+        self.assertNotEqual(self.read_cover(publication), old_cover)
+
+    def test_failed_ingestion_is_recorded_and_not_retried(self):
+        with self.assertLogs('publications.ingest', 'ERROR'):
+            publication = self.create(content=b'%PDF-1.4 truncated')
+        self.assertTrue(publication.ingest_error)
+        self.assertFalse(publication.thumbnail)
+
+        with mock.patch('publications.models.ingest.schedule') as schedule:
+            publication.title = 'Land Tenure Report'
+            publication.save()
+        schedule.assert_not_called()
+
+        self.replace_file(publication, make_pdf('Pastoralist land tenure'))
+        self.assertEqual(publication.ingest_error, '')
+        self.assertTrue(publication.thumbnail)
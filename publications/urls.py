@@ -1,8 +1,10 @@
 from django.urls import path
+from core.utils.asyncviews import pick
 from . import views
 
 urlpatterns = [
-    path('', views.PublicationListView.as_view(), name='publications_list'),
+    path('', pick(views.PublicationListView, views.AsyncPublicationListView),
+         name='publications_list'),
     path('<slug:slug>/', views.PublicationDetailView.as_view(),
          name='publication_detail'),
     path('<slug:slug>/download/', views.download_publication,
@@ -1,12 +1,16 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import aget_object_or_404, render, get_object_or_404
 from django.http import JsonResponse
 from django.views.generic import ListView, DetailView
 from django.db.models import Q, Count
 from django.core.paginator import Paginator
+from core.utils.asyncviews import AsyncMultipleObjectMixin, aevaluate
+from core.utils.counters import increment
+from core.utils.downloads import serve_file, starts_download
+from core.utils.streaming import StreamingTemplateResponseMixin
 from .models import Publication, PublicationCategory
 
 
-class PublicationListView(ListView):
+class PublicationListView(StreamingTemplateResponseMixin, ListView):
     model = Publication
     template_name = 'publications/list.html'
     context_object_name = 'publications'
@@ -26,6 +30,7 @@ class PublicationListView(ListView):
             queryset = queryset.filter(
                 Q(title__icontains=search_query) |
                 Q(description__icontains=search_query) |
+                Q(text_content__icontains=search_query) |
                 Q(category__name__icontains=search_query)
             ).distinct()
 
@@ -33,11 +38,7 @@ class PublicationListView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-
-        # Get categories for filter
-        context['categories'] = PublicationCategory.objects.annotate(
-            publication_count=Count('publication')
-        ).order_by('name')
+        context.update(self.get_filter_context())
 
         # Get current category if any
         category_slug = self.request.GET.get('category')
@@ -45,9 +46,29 @@ class PublicationListView(ListView):
             context['current_category'] = get_object_or_404(
                 PublicationCategory, slug=category_slug)
 
-        # Get search query
-        context['search_query'] = self.request.GET.get('q', '')
-        context['page_title'] = 'Publications'
+        return context
+
+    def get_filter_context(self):
+        return {
+            # Get categories for filter
+            'categories': PublicationCategory.objects.annotate(
+                publication_count=Count('publication')
+            ).order_by('name'),
+            # Get search query
+            'search_query': self.request.GET.get('q', ''),
+            'page_title': 'Publications',
+        }
+
+
+class AsyncPublicationListView(AsyncMultipleObjectMixin, PublicationListView):
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context.update(await aevaluate(self.get_filter_context()))
+
+        category_slug = self.request.GET.get('category')
+        if category_slug:
+            context['current_category'] = await aget_object_or_404(
+                PublicationCategory, slug=category_slug)
 
         return context
 
@@ -63,10 +84,8 @@ class PublicationDetailView(DetailView):
         context = super().get_context_data(**kwargs)
         publication = self.object
 
-        # Increment download count on view (or we could increment on actual download)
-        # For now, we'll track views
-        publication.download_count += 1
-        publication.save(update_fields=['download_count'])
+        # Page views are buffered and written in batches
+        increment(Publication, publication.pk, 'view_count')
 
         # Get related publications
         related_publications = Publication.objects.filter(
@@ -84,13 +103,10 @@ def download_publication(request, slug):
     """View to handle file downloads and track counts"""
     publication = get_object_or_404(Publication, slug=slug)
 
-    # Increment download count
-    publication.download_count += 1
-    publication.save(update_fields=['download_count'])
-
-    # Create download response
-    from django.http import FileResponse
-    response = FileResponse(publication.file.open(), as_attachment=True)
-    response['Content-Disposition'] = f'attachment; filename="{publication.file.name}"'
+    # Increment download count (buffered, no write on this request);
+    # resumed downloads only count once
+    if starts_download(request):
+        increment(Publication, publication.pk, 'download_count')
 
-    return response
+    # The front proxy streams the file when FILE_DOWNLOAD_MODE allows it
+    return serve_file(request, publication.file)
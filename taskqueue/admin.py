@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    readonly_fields = ('name', 'args', 'kwargs', 'attempts', 'locked_until', 'locked_by',
+                       'last_error', 'created_at', 'finished_at')
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected tasks now')
+    def retry_now(self, request, queryset):
+        count = queryset.exclude(status__in=['running', 'done']).update(
+            status='queued', attempts=0, run_after=timezone.now(), locked_by='', locked_until=None)
+        self.message_user(request, f'{count} tasks queued for the next run_worker poll.')
@@ -0,0 +1,71 @@
+"""
+The @task decorator.
+
+    @task(max_attempts=3)
+    def reindex(post_id):
+        ...
+
+    reindex.enqueue(post.pk)   # a Task row once the transaction commits
+
+Arguments are stored as JSON, so pass ids rather than model instances.
+Calling the function directly still runs it inline.
+"""
+import functools
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+
+class TaskFunction:
+    def __init__(self, func, max_attempts=None, retry_delay=None, unique=False):
+        if '<locals>' in func.__qualname__:
+            raise ValueError(f'{func.__qualname__} must be a module-level function to be a task')
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = f'{func.__module__}.{func.__qualname__}'
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.unique = unique
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<task {self.name}>'
+
+    def get_retry_delay(self):
+        return settings.TASK_RETRY_DELAY if self.retry_delay is None else self.retry_delay
+
+    def enqueue(self, *args, **kwargs):
+        """
+        Queue a call for the worker once the current transaction commits, so
+        it never sees rows that were rolled back (right away in autocommit)
+        """
+        self.enqueue_at(None, *args, **kwargs)
+
+    def enqueue_at(self, run_after, *args, **kwargs):
+        """Like enqueue(), but not run before the `run_after` datetime"""
+        transaction.on_commit(functools.partial(self._create, list(args), kwargs, run_after))
+
+    def _create(self, args, kwargs, run_after=None):
+        from .models import Task
+
+        if self.unique:
+            # A queued run that has not started yet will do the same work
+            waiting = Task.objects.filter(name=self.name, status='queued').values_list('args', 'kwargs')
+            if (args, kwargs) in list(waiting):
+                return None
+        return Task.objects.create(
+            name=self.name, args=args, kwargs=kwargs, run_after=run_after or timezone.now(),
+            max_attempts=self.max_attempts or settings.TASK_MAX_ATTEMPTS)
+
+
+def task(func=None, *, max_attempts=None, retry_delay=None, unique=False):
+    """
+    Make `func` queueable with .enqueue(). `unique` skips enqueueing while an
+    identical call is still waiting; `retry_delay` (seconds) doubles per attempt.
+    """
+    def decorator(func):
+        return TaskFunction(func, max_attempts=max_attempts, retry_delay=retry_delay, unique=unique)
+    return decorator(func) if func is not None else decorator
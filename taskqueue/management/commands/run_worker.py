@@ -0,0 +1,30 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from taskqueue.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks (@task functions) in a thread pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int,
+                            help='Tasks run concurrently (default: TASK_WORKER_THREADS)')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once no task is due instead of polling')
+        parser.add_argument('--interval', type=float, default=1,
+                            help='Seconds between polls while idle (default: 1)')
+
+    def handle(self, *args, **options):
+        worker = Worker(threads=options['threads'], interval=options['interval'])
+        if not options['once']:
+            # Finish running tasks on SIGTERM/Ctrl-C instead of abandoning their leases
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: worker.stop())
+            self.stdout.write(f'Worker {worker.id} running {worker.threads} threads')
+
+        stats = worker.run(once=options['once'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Ran {sum(stats.values())} tasks ({stats.get('done', 0)} done, "
+            f"{stats.get('queued', 0)} to retry, {stats.get('dead', 0)} dead)"))
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .decorators import task
+from .models import Task
+from .worker import claim, execute
+
+calls = []
+
+
+@task
+def record(value):
+    calls.append(value)
+
+
+@task(max_attempts=2, retry_delay=60)
+def explode():
+    raise ValueError('boom')
+
+
+@task(unique=True)
+def refresh():
+    pass
+
+
+class EnqueueTests(TestCase):
+    def test_enqueued_on_commit_only(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.enqueue('kept')
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                record.enqueue('rolled back')
+                raise RuntimeError
+
+        stored = Task.objects.get()
+        self.assertEqual((stored.name, stored.args, stored.status),
+                         ('taskqueue.tests.record', ['kept'], 'queued'))
+
+    def test_unique_task_is_queued_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh.enqueue()
+            refresh.enqueue()
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_direct_call_runs_inline(self):
+        calls.clear()
+        record('now')
+        self.assertEqual(calls, ['now'])
+        self.assertFalse(Task.objects.exists())
+
+
+@override_settings(TASK_LEASE=60)
+class WorkerTests(TestCase):
+    def create(self, func, *args, **fields):
+        return Task.objects.create(name=func.name, args=list(args), **fields)
+
+    def test_claimed_task_is_not_claimed_twice(self):
+        self.create(record, 1)
+        self.assertEqual(len(claim(10, 'worker-a')), 1)
+        self.assertEqual(claim(10, 'worker-b'), [])
+
+    def test_expired_lease_is_claimed_again(self):
+        self.create(record, 1, status='running', attempts=1, locked_by='dead-worker',
+                    locked_until=timezone.now() - timedelta(seconds=1))
+        [stored] = claim(10, 'worker-b')
+        self.assertEqual((stored.locked_by, stored.attempts), ('worker-b', 2))
+
+    def test_failures_back_off_then_dead_letter(self):
+        self.create(explode, max_attempts=2)
+        [stored] = claim(1, 'worker')
+        with self.assertLogs('taskqueue.worker', 'WARNING'):
+            self.assertEqual(execute(stored), 'queued')
+        stored.refresh_from_db()
+        self.assertEqual((stored.status, stored.attempts), ('queued', 1))
+        self.assertIn('ValueError: boom', stored.last_error)
+        self.assertAlmostEqual(stored.run_after, timezone.now() + timedelta(seconds=60),
+                               delta=timedelta(seconds=5))
+        # Not due yet
+        self.assertEqual(claim(1, 'worker'), [])
+
+        Task.objects.update(run_after=timezone.now())
+        [stored] = claim(1, 'worker')
+        with self.assertLogs('taskqueue.worker', 'ERROR'):
+            self.assertEqual(execute(stored), 'dead')
+        stored.refresh_from_db()
+        self.assertEqual((stored.status, stored.attempts), ('dead', 2))
+        self.assertIsNotNone(stored.finished_at)
+
+    def test_unknown_task_fails(self):
+        Task.objects.create(name='taskqueue.tests.missing', max_attempts=1)
+        [stored] = claim(1, 'worker')
+        with self.assertLogs('taskqueue.worker', 'ERROR') as logs:
+            self.assertEqual(execute(stored), 'dead')
+        self.assertIn('does not define a "missing"', logs.output[0])
+
+
+class RunWorkerTests(TransactionTestCase):
+    def test_thread_pool_runs_every_task(self):
+        calls.clear()
+        for value in range(6):
+            record.enqueue(value)
+        out = StringIO()
+        call_command('run_worker', '--once', '--threads', '3', stdout=out)
+        self.assertIn('Ran 6 tasks (6 done, 0 to retry, 0 dead)', out.getvalue())
+        self.assertEqual(sorted(calls), list(range(6)))
+        self.assertFalse(Task.objects.exclude(status='done').exists())
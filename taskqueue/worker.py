@@ -0,0 +1,144 @@
+"""
+Task execution.
+
+claim() leases due tasks to one worker. On PostgreSQL the candidate rows
+are locked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers
+never wait on each other; elsewhere (SQLite) the UPDATE that takes the
+lease re-checks the row is still free and only the rows it changed are
+returned. Running tasks whose lease has expired (a killed worker) are
+claimed again.
+
+Failed tasks are retried with exponential backoff; after max_attempts they
+are marked 'dead' and stay in the table for inspection and the admin's
+retry action. Delivery is at-least-once, so tasks should be idempotent.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+
+def claim(limit, worker_id):
+    """Lease up to `limit` due tasks to `worker_id`, returns them"""
+    now = timezone.now()
+    lease = now + timedelta(seconds=settings.TASK_LEASE)
+    ready = Q(status='queued', run_after__lte=now) | Q(status='running', locked_until__lt=now)
+    changes = {'status': 'running', 'locked_until': lease, 'locked_by': worker_id,
+               'attempts': F('attempts') + 1}
+    db = router.db_for_write(Task)
+    due = Task.objects.using(db).filter(ready).order_by('run_after')
+
+    if connections[db].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=db):
+            ids = list(due.select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            Task.objects.using(db).filter(pk__in=ids).update(**changes)
+    else:
+        ids = list(due.values_list('pk', flat=True)[:limit])
+        # Writes are serialized; rows another worker leased meanwhile fail `ready`
+        Task.objects.using(db).filter(ready, pk__in=ids).update(**changes)
+    return list(Task.objects.using(db).filter(pk__in=ids, locked_by=worker_id, locked_until=lease))
+
+
+def _finish(task, **changes):
+    # Matching locked_by: a task whose lease expired belongs to its new owner
+    Task.objects.filter(pk=task.pk, status='running', locked_by=task.locked_by).update(
+        locked_by='', locked_until=None, **changes)
+
+
+def execute(task):
+    """Run one claimed task and record the outcome; returns the new status"""
+    retry_delay = settings.TASK_RETRY_DELAY
+    try:
+        if task.attempts > task.max_attempts:
+            # Only a worker dying mid-task gets here
+            raise RuntimeError('Lease expired on the last attempt')
+        func = import_string(task.name)
+        retry_delay = func.get_retry_delay()
+        func.func(*task.args, **task.kwargs)
+    except Exception as exc:
+        if task.attempts >= task.max_attempts:
+            status, changes = 'dead', {'finished_at': timezone.now()}
+            logger.error('Task %s (%s) is dead after %d attempts: %s',
+                         task.pk, task.name, task.attempts, exc)
+        else:
+            delay = retry_delay * 2 ** (task.attempts - 1)
+            status, changes = 'queued', {'run_after': timezone.now() + timedelta(seconds=delay)}
+            logger.warning('Task %s (%s) failed (attempt %d), retrying in %ss: %s',
+                           task.pk, task.name, task.attempts, delay, exc)
+        _finish(task, status=status, last_error=traceback.format_exc(), **changes)
+        return status
+    else:
+        _finish(task, status='done', finished_at=timezone.now(), last_error='')
+        return 'done'
+    finally:
+        close_old_connections()
+
+
+def purge(hours=None):
+    """Delete finished tasks older than TASK_RETENTION_HOURS, keeps dead ones"""
+    hours = settings.TASK_RETENTION_HOURS if hours is None else hours
+    cutoff = timezone.now() - timedelta(hours=hours)
+    return Task.objects.filter(status='done', finished_at__lt=cutoff).delete()[0]
+
+
+class Worker:
+    """Feeds claimed tasks to a thread pool until stop(), letting running ones finish"""
+
+    def __init__(self, threads=None, interval=1.0):
+        self.threads = threads or settings.TASK_WORKER_THREADS
+        self.interval = interval
+        self.id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._stop = threading.Event()
+        self._purged_at = None
+
+    def stop(self):
+        self._stop.set()
+
+    def _purge_hourly(self):
+        if self._purged_at is None or time.monotonic() - self._purged_at > 3600:
+            self._purged_at = time.monotonic()
+            purge()
+
+    def run(self, once=False):
+        """Process tasks; with `once`, return when nothing is due. Returns a count per status"""
+        stats = {}
+        running = set()
+
+        def record(future):
+            status = future.result()
+            stats[status] = stats.get(status, 0) + 1
+
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='task-worker') as executor:
+            while not self._stop.is_set():
+                free = self.threads - len(running)
+                tasks = claim(free, self.id) if free else []
+                for task in tasks:
+                    future = executor.submit(execute, task)
+                    future.add_done_callback(record)
+                    running.add(future)
+                if once and not tasks and not running:
+                    break
+                if running:
+                    # Wake up as soon as a thread is free again
+                    done, running = wait(running, timeout=self.interval, return_when=FIRST_COMPLETED)
+                    running = set(running)
+                else:
+                    self._purge_hourly()
+                    close_old_connections()
+                    self._stop.wait(self.interval)
+        return stats
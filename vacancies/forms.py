@@ -1,7 +1,20 @@
 from django import forms
-from .models import Application
+from django.conf import settings
 from django.core.exceptions import ValidationError
 
+from core.utils.uploads import UploadRule, check_upload
+from .models import Application
+
+
+def upload_rules():
+    """What ApplicationCreateView's upload handler accepts per file field"""
+    return {
+        'resume': UploadRule(settings.APPLICATION_RESUME_MAX_SIZE,
+                             ('.pdf', '.doc', '.docx')),
+        'additional_documents': UploadRule(settings.APPLICATION_DOCUMENT_MAX_SIZE,
+                                           ('.pdf', '.doc', '.docx', '.jpg', '.jpeg', '.png')),
+    }
+
 
 class ApplicationForm(forms.ModelForm):
     class Meta:
@@ -15,17 +28,30 @@ class ApplicationForm(forms.ModelForm):
             }),
         }
 
+    def __init__(self, *args, upload_errors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Files the streaming upload handler already rejected
+        self.upload_errors = upload_errors or {}
+
+    def _clean_upload(self, name):
+        uploaded = self.cleaned_data.get(name)
+        # Only fresh uploads; an unchanged FieldFile was checked when it came in
+        if uploaded and hasattr(uploaded, 'content_type'):
+            error = check_upload(uploaded, upload_rules()[name])
+            if error:
+                raise ValidationError(error)
+        return uploaded
+
     def clean_resume(self):
-        resume = self.cleaned_data.get('resume')
-        if resume:
-            # Check file size (5MB max)
-            if resume.size > 5 * 1024 * 1024:
-                raise ValidationError("Resume file size must be under 5MB.")
-
-            # Check file extension
-            valid_extensions = ['.pdf', '.doc', '.docx']
-            if not any(resume.name.lower().endswith(ext) for ext in valid_extensions):
-                raise ValidationError(
-                    "Unsupported file format. Please upload PDF or Word documents.")
-
-        return resume
+        return self._clean_upload('resume')
+
+    def clean_additional_documents(self):
+        return self._clean_upload('additional_documents')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name, message in self.upload_errors.items():
+            # A rejected file also shows up as "required"; keep the real reason
+            self.errors.pop(name, None)
+            self.add_error(name if name in self.fields else None, message)
+        return cleaned_data
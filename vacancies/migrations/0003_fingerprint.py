@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0002_application_resume_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(condition=models.Q(('fingerprint', ''), _negated=True), fields=('fingerprint',), name='application_unique_fingerprint'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_remove_admindigest_watermarks'),
+        ('vacancies', '0003_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='digest',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='core.admindigest'),
+        ),
+    ]
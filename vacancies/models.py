@@ -1,6 +1,9 @@
 from django.db import models
+from django.utils import timezone
 from ckeditor.fields import RichTextField
 
+from core.utils.dedupe import fingerprint
+
 
 class Vacancy(models.Model):
     JOB_TYPES = [
@@ -36,15 +39,36 @@ class Application(models.Model):
     phone = models.CharField(max_length=20)
     cover_letter = models.TextField()
     resume = models.FileField(upload_to='applications/resumes/')
+    resume_sha256 = models.CharField(max_length=64, blank=True, editable=False,
+                                     db_index=True)
     additional_documents = models.FileField(
         upload_to='applications/docs/', blank=True)
     applied_date = models.DateTimeField(auto_now_add=True)
     is_reviewed = models.BooleanField(default=False)
     ip_address = models.GenericIPAddressField(
         null=True, blank=True)  # ADD THIS LINE
+    # One application per email address, vacancy and day: repeats within the
+    # dedupe window are dropped, applying again later is not
+    fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+    # The admin digest that reported this application (ADMIN_NOTIFICATION_MODE = 'digest')
+    digest = models.ForeignKey('core.AdminDigest', null=True, blank=True, editable=False,
+                               on_delete=models.SET_NULL, related_name='applications')
 
     class Meta:
         ordering = ['-applied_date']
+        constraints = [
+            models.UniqueConstraint(fields=['fingerprint'], condition=~models.Q(fingerprint=''),
+                                    name='application_unique_fingerprint'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.vacancy.title}"
+
+    def compute_fingerprint(self):
+        day = (self.applied_date or timezone.now()).date().isoformat()
+        return fingerprint(self.email, self.vacancy_id, day)
+
+    def save(self, *args, **kwargs):
+        if not self.fingerprint:
+            self.fingerprint = self.compute_fingerprint()
+        super().save(*args, **kwargs)
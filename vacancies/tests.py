@@ -1,3 +1,109 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import OutboundEmail
+from .models import Application, Vacancy
+
+PDF = b'%PDF-1.4\n' + b'0' * 2000 + b'\n%%EOF\n'
+
+
+class ApplicationUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.staging = os.path.join(self.media_root, '.incoming')
+        media = override_settings(MEDIA_ROOT=self.media_root, UPLOAD_STAGING_DIR=self.staging)
+        media.enable()
+        self.addCleanup(media.disable)
+        # Duplicate filter entries
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.vacancy = Vacancy.objects.create(
+            title='Programme Officer', slug='programme-officer', description='d',
+            requirements='r', responsibilities='r', job_type='full-time',
+            location='Addis Ababa', deadline=timezone.now().date() + timedelta(days=7))
+        self.url = reverse('apply_vacancy', args=[self.vacancy.slug])
+
+    def apply(self, resume, **extra):
+        data = {'full_name': 'Abebe Kebede', 'email': 'abebe@example.org',
+                'phone': '+251911000000', 'cover_letter': 'Hello', 'resume': resume}
+        return self.client.post(self.url, data, **extra)
+
+    def test_valid_resume_is_moved_into_place_with_its_hash(self):
+        response = self.apply(SimpleUploadedFile('cv.pdf', PDF))
+        self.assertEqual(response.status_code, 302)
+
+        application = Application.objects.get()
+        self.assertEqual(len(application.resume_sha256), 64)
+        with application.resume.open('rb') as resume:
+            self.assertEqual(resume.read(), PDF)
+        self.assertEqual(os.listdir(self.staging), [])
+
+    @override_settings(APPLICATION_RESUME_MAX_SIZE=1024)
+    def test_oversized_resume_is_rejected(self):
+        response = self.apply(SimpleUploadedFile('cv.pdf', PDF))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'File size must be under 1.0')
+        self.assertFalse(Application.objects.exists())
+
+    def test_content_must_match_extension(self):
+        response = self.apply(SimpleUploadedFile('cv.pdf', b'MZ\x90\x00' + b'0' * 1000))
+        self.assertContains(response, 'does not match its extension')
+        response = self.apply(SimpleUploadedFile('cv.pdf', b'tiny'))
+        self.assertContains(response, 'does not match its extension')
+        self.assertFalse(Application.objects.exists())
+
+    def test_unsupported_extension_is_rejected(self):
+        response = self.apply(SimpleUploadedFile('cv.exe', PDF))
+        self.assertContains(response, 'Unsupported file format. Allowed: PDF, DOC, DOCX.')
+        self.assertFalse(Application.objects.exists())
+
+    def test_declared_length_over_budget_is_refused_unread(self):
+        response = self.apply(SimpleUploadedFile('cv.pdf', PDF), CONTENT_LENGTH=str(100 * 1024 * 1024))
+        self.assertEqual(response.status_code, 413)
+        self.assertContains(response, 'The upload is too large.', status_code=413)
+
+    def test_double_submission_is_stored_and_emailed_once(self):
+        for _ in range(2):
+            response = self.apply(SimpleUploadedFile('cv.pdf', PDF))
+            self.assertRedirects(response, reverse('vacancy_detail', args=[self.vacancy.slug]),
+                                 fetch_redirect_response=False)
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+    def test_reapplying_after_the_cache_expired_is_caught_by_the_table(self):
+        self.apply(SimpleUploadedFile('cv.pdf', PDF))
+        cache.clear()
+        response = self.apply(SimpleUploadedFile('cv.pdf', PDF), follow=True)
+        self.assertContains(response, 'We already have your application for Programme Officer.')
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, 'applications', 'resumes'))), 1)
+
+    def test_applying_again_on_a_later_day_is_accepted(self):
+        self.apply(SimpleUploadedFile('cv.pdf', PDF))
+        cache.clear()
+        tomorrow = timezone.now() + timedelta(days=1)
+        with mock.patch('vacancies.models.timezone.now', return_value=tomorrow):
+            self.apply(SimpleUploadedFile('cv.pdf', PDF))
+        self.assertEqual(Application.objects.count(), 2)
+
+    def test_losing_a_concurrent_submission_removes_its_files(self):
+        self.apply(SimpleUploadedFile('cv.pdf', PDF))
+        cache.clear()
+        # The other request saved between this one's check and its INSERT
+        with mock.patch.object(QuerySet, 'exists', return_value=False):
+            response = self.apply(SimpleUploadedFile('cv.pdf', PDF))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, 'applications', 'resumes'))), 1)
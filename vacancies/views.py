@@ -1,4 +1,5 @@
 from core.utils.email import send_application_notification, send_application_confirmation
+from django.http import HttpResponseRedirect
 from django.shortcuts import render, get_object_or_404
 from django.views.generic import ListView, DetailView, CreateView
 from django.urls import reverse_lazy
@@ -6,8 +7,17 @@ from django.contrib import messages
 from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
+from django.db import IntegrityError, transaction
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from core.utils import dedupe
+from core.utils.ratelimit import ratelimit
+from core.utils.uploads import ValidatingUploadHandler
 from .models import Vacancy, Application
-from .forms import ApplicationForm
+from .forms import ApplicationForm, upload_rules
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class VacancyListView(ListView):
@@ -51,11 +61,39 @@ class VacancyDetailView(DetailView):
         return context
 
 
+# CSRF is checked in dispatch(), after the upload handlers are swapped:
+# the middleware would otherwise parse the body with the default ones
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(ratelimit('application'), name='dispatch')
 class ApplicationCreateView(CreateView):
     model = Application
     form_class = ApplicationForm
     template_name = 'vacancies/apply.html'
 
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == 'POST':
+            handler = ValidatingUploadHandler(request, upload_rules())
+            try:
+                declared = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                declared = 0
+            if declared > handler.max_request_size:
+                # Answer before reading a byte of the body
+                self.object = None
+                self.request, self.args, self.kwargs = request, args, kwargs
+                messages.error(request, 'The upload is too large.')
+                response = self.render_to_response(
+                    self.get_context_data(form=self.get_form_class()()))
+                response.status_code = 413
+                return response
+            request.upload_handlers = [handler]
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['upload_errors'] = getattr(self.request, 'upload_errors', None)
+        return kwargs
+
     def get_success_url(self):
         return reverse_lazy('vacancy_detail', kwargs={'slug': self.kwargs['slug']})
 
@@ -63,6 +101,8 @@ class ApplicationCreateView(CreateView):
         context = super().get_context_data(**kwargs)
         context['vacancy'] = get_object_or_404(
             Vacancy, slug=self.kwargs['slug'])
+        context['today'] = timezone.now().date()
+        context['idempotency_key'] = dedupe.new_idempotency_key()
         return context
 
     def form_valid(self, form):
@@ -77,6 +117,8 @@ class ApplicationCreateView(CreateView):
         # Set vacancy for the application
         application = form.save(commit=False)
         application.vacancy = vacancy
+        # Computed by the upload handler while the file streamed in
+        application.resume_sha256 = getattr(form.cleaned_data['resume'], 'sha256', None) or ''
 
         # Get client IP address
         x_forwarded_for = self.request.META.get('HTTP_X_FORWARDED_FOR')
@@ -85,23 +127,45 @@ class ApplicationCreateView(CreateView):
         else:
             application.ip_address = self.request.META.get('REMOTE_ADDR')
 
-        application.save()
-
-        # Send email notifications
-        try:
-            # Send notification to admin
-            send_application_notification(application)
-
-            # Send confirmation to applicant
-            send_application_confirmation(application)
-
-        except Exception as e:
-            # Log error but don't crash the form submission
-            print(f"Email sending failed: {e}")
+        application.fingerprint = application.compute_fingerprint()
+        self.object = application
+        key = dedupe.idempotency_key(self.request)
+        if not dedupe.claim('application', application.fingerprint, key):
+            # Double-click or resubmission: answered like the first one
+            pass
+        elif Application.objects.filter(fingerprint=application.fingerprint).exists():
+            # Checked before saving so the files are not stored again
+            messages.info(self.request, f'We already have your application for {vacancy.title}.')
+            return HttpResponseRedirect(self.get_success_url())
+        else:
+            try:
+                # The application and its emails commit together; send_queued_email sends them
+                with transaction.atomic():
+                    application.save()
+                    try:
+                        # Notification to admin
+                        send_application_notification(application)
+
+                        # Confirmation to applicant
+                        send_application_confirmation(application)
+
+                    except Exception:
+                        # Log error but don't crash the form submission
+                        logger.exception('Email queueing failed for application %s',
+                                         application.pk)
+            except IntegrityError:
+                # A concurrent submission stored the same fingerprint first.
+                # pre_save already wrote this one's files to storage.
+                application.resume.delete(save=False)
+                if application.additional_documents:
+                    application.additional_documents.delete(save=False)
+            except Exception:
+                dedupe.release('application', application.fingerprint, key)
+                raise
 
         messages.success(
             self.request,
             f'Thank you for applying for {vacancy.title}! We have sent a confirmation email and will review your application.'
         )
 
-        return super().form_valid(form)
+        return HttpResponseRedirect(self.get_success_url())